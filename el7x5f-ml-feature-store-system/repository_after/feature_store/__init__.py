@@ -21,12 +21,13 @@ from .dsl import (
 )
 from .registry import FeatureRegistry, RegistrySettings
 from .serving import OnlineStore, RedisOnlineStore, RedisTimeSeriesOnlineStore
-from .pit_join import point_in_time_join_pandas, point_in_time_join_spark
+from .pit_join import point_in_time_join_pandas, point_in_time_join_partitioned, point_in_time_join_spark
 from .offline_store import OfflineStore, ParquetOfflineStore, ParquetOfflineStoreSettings
 from .alerts import AlertSink, NoopAlertSink, Thresholds
 from .feature_set import FeatureSet
 from .validation import FeatureValidator
-from .drift import population_stability_index, DriftResult
+from .drift import population_stability_index, DriftMonitor, DriftResult
+from .sketches import FeatureSketch, HyperLogLog, KLLSketch
 
 __all__ = [
     "Feature",
@@ -41,6 +42,7 @@ __all__ = [
     "RedisOnlineStore",
     "RedisTimeSeriesOnlineStore",
     "point_in_time_join_pandas",
+    "point_in_time_join_partitioned",
     "point_in_time_join_spark",
     "OfflineStore",
     "ParquetOfflineStore",
@@ -52,4 +54,8 @@ __all__ = [
     "FeatureValidator",
     "population_stability_index",
     "DriftResult",
+    "DriftMonitor",
+    "FeatureSketch",
+    "HyperLogLog",
+    "KLLSketch",
 ]
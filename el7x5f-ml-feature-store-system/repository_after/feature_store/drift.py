@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Mapping, Optional, Sequence
 
 import numpy as np
 
+from .sketches import FeatureSketch, _as_float_array
+
 
 @dataclass(frozen=True)
 class DriftResult:
@@ -23,8 +27,8 @@ def population_stability_index(
 ) -> float:
     """Compute PSI between expected (training) and actual (serving) distributions."""
 
-    expected = np.asarray(list(expected), dtype=float)
-    actual = np.asarray(list(actual), dtype=float)
+    expected = _as_float_array(expected)
+    actual = _as_float_array(actual)
 
     if expected.size == 0 or actual.size == 0:
         return float("nan")
@@ -37,6 +41,14 @@ def population_stability_index(
 
     exp_counts, _ = np.histogram(expected, bins=edges)
     act_counts, _ = np.histogram(actual, bins=edges)
+    return psi_from_counts(exp_counts, act_counts, eps=eps)
+
+
+def psi_from_counts(exp_counts: Sequence[float], act_counts: Sequence[float], *, eps: float = 1e-6) -> float:
+    """PSI from two histograms over the same bins."""
+
+    exp_counts = np.asarray(exp_counts, dtype=float)
+    act_counts = np.asarray(act_counts, dtype=float)
 
     exp_pct = exp_counts / max(exp_counts.sum(), 1)
     act_pct = act_counts / max(act_counts.sum(), 1)
@@ -46,3 +58,107 @@ def population_stability_index(
 
     psi = np.sum((act_pct - exp_pct) * np.log(act_pct / exp_pct))
     return float(psi)
+
+
+def reference_bin_edges(reference: FeatureSketch, *, bins: int = 10) -> np.ndarray:
+    """Quantile bin edges of a reference (training) sketch, as PSI uses them."""
+
+    if reference.numeric_count == 0:
+        return np.empty(0)
+    edges = reference.quantiles.quantiles(np.linspace(0, 1, bins + 1))
+    # The sketch keeps the exact extremes; pin them so the outer bins match.
+    edges[0], edges[-1] = reference.min, reference.max
+    return np.unique(edges)
+
+
+class DriftMonitor:
+    """Incremental PSI drift over serving traffic in constant memory.
+
+    Bin edges come from each feature's reference sketch (see
+    `reference_bin_edges`); serving values only update per-bin counts, so
+    memory is O(features x bins) however much traffic is observed. Monitors
+    built from the same references can be merged, e.g. across replicas.
+    Updates and PSI computation fan out across features on a thread pool
+    that the monitor creates on first use and keeps; `close()` shuts it down.
+    """
+
+    def __init__(
+        self,
+        references: Mapping[str, FeatureSketch],
+        *,
+        bins: int = 10,
+        max_workers: Optional[int] = None,
+    ):
+        self._edges: Dict[str, np.ndarray] = {}
+        self._expected: Dict[str, np.ndarray] = {}
+        self._actual: Dict[str, np.ndarray] = {}
+        for name, ref in references.items():
+            edges = reference_bin_edges(ref, bins=bins)
+            self._edges[name] = edges
+            # Expected counts per bin from the reference CDF at the edges; bins
+            # are left-closed like np.histogram, with the last one closed.
+            if edges.size >= 3:
+                cdf = ref.quantiles.cdf(edges[1:-1], strict=True)
+                self._expected[name] = np.diff(np.concatenate([[0.0], cdf, [1.0]])) * ref.numeric_count
+            self._actual[name] = np.zeros(max(edges.size - 1, 0))
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def features(self) -> Sequence[str]:
+        return list(self._edges)
+
+    def _map(self, fn, names: Sequence[str]) -> list:
+        if len(names) <= 1 or self._max_workers == 1:
+            return [fn(name) for name in names]
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._max_workers)
+            pool = self._pool
+        return list(pool.map(fn, names))
+
+    def close(self) -> None:
+        """Shut down the worker pool; a later update or `psi()` starts a new one."""
+
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "DriftMonitor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def update(self, batch: Mapping[str, Any]) -> None:
+        """Add a batch of serving values: a DataFrame or mapping of feature -> values."""
+
+        names = [name for name in self._edges if name in batch and self._edges[name].size >= 3]
+
+        def _count(name: str) -> np.ndarray:
+            values = _as_float_array(batch[name])
+            counts, _ = np.histogram(values[~np.isnan(values)], bins=self._edges[name])
+            return counts
+
+        for name, counts in zip(names, self._map(_count, names)):
+            with self._lock:
+                self._actual[name] += counts
+
+    def merge(self, other: "DriftMonitor") -> "DriftMonitor":
+        for name, counts in other._actual.items():
+            if name in self._actual and counts.shape == self._actual[name].shape:
+                self._actual[name] += counts
+        return self
+
+    def psi(self, *, eps: float = 1e-6) -> Dict[str, float]:
+        def _psi(name: str) -> float:
+            if name not in self._expected:
+                return 0.0  # degenerate reference distribution
+            if self._actual[name].sum() == 0:
+                return float("nan")
+            return psi_from_counts(self._expected[name], self._actual[name], eps=eps)
+
+        names = list(self._edges)
+        return dict(zip(names, self._map(_psi, names)))
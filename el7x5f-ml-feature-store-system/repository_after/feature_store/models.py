@@ -78,3 +78,16 @@ class FeatureProcessingStateModel(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+
+
+class RegistryRevisionModel(Base):
+    """Single-row counter bumped in every registry metadata write transaction.
+
+    Registry caches compare it with the revision they were filled at, so
+    writes made by any process invalidate them.
+    """
+
+    __tablename__ = "registry_revision"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
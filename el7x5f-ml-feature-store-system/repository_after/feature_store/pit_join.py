@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Sequence
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
 
 import pandas as pd
 
@@ -38,9 +43,18 @@ def point_in_time_join_pandas(
     left[label_time_col] = pd.to_datetime(left[label_time_col], utc=True)
     right[feature_time_col] = pd.to_datetime(right[feature_time_col], utc=True)
 
-    # Sort for merge_asof
-    left = left.sort_values(list(entity_keys) + [label_time_col])
-    right = right.sort_values(list(entity_keys) + [feature_time_col])
+    # merge_asof refuses numeric keys of different dtypes (e.g. int64 ids on one
+    # side, float64 on the other after a NaN upcast); they only need to compare equal.
+    for col in entity_keys:
+        if left[col].dtype != right[col].dtype and all(
+            pd.api.types.is_numeric_dtype(side[col]) for side in (left, right)
+        ):
+            left[col] = left[col].astype("float64")
+            right[col] = right[col].astype("float64")
+
+    # merge_asof needs the "on" column globally sorted; "by" handles the entity match.
+    left = left.sort_values(label_time_col, kind="stable")
+    right = right.sort_values(feature_time_col, kind="stable")
 
     joined = left
     # merge_asof supports a single "by" list for exact match on entity keys
@@ -58,6 +72,279 @@ def point_in_time_join_pandas(
     return joined.drop(columns=[feature_time_col])
 
 
+PitJoinSource = Union[pd.DataFrame, str, Path, Iterable[Any]]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("pyarrow is required for point_in_time_join_partitioned") from e
+    return pa, pq
+
+
+def _iter_frames(source: PitJoinSource, columns: Optional[Sequence[str]], batch_size: int) -> Iterator[pd.DataFrame]:
+    """Stream a source as DataFrame chunks without materializing it whole.
+
+    Accepts a DataFrame, a Parquet file/directory path, an Arrow Table/RecordBatch,
+    or an iterable of DataFrames / Arrow batches.
+    """
+
+    if isinstance(source, pd.DataFrame):
+        frame = source if columns is None else source[list(columns)]
+        for start in range(0, len(frame), batch_size):
+            yield frame.iloc[start:start + batch_size]
+        return
+
+    if isinstance(source, (str, Path)):
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(str(source), format="parquet")
+        for batch in dataset.to_batches(columns=None if columns is None else list(columns), batch_size=batch_size):
+            yield batch.to_pandas()
+        return
+
+    if hasattr(source, "to_batches"):
+        source = source.to_batches(max_chunksize=batch_size)
+    elif hasattr(source, "to_pandas"):
+        source = [source]
+
+    for chunk in source:
+        frame = chunk if isinstance(chunk, pd.DataFrame) else chunk.to_pandas()
+        yield frame if columns is None else frame[list(columns)]
+
+
+def _shard_hash(frame: pd.DataFrame, entity_keys: Sequence[str]):
+    """Hash entity keys so equal keys land in the same shard regardless of dtype.
+
+    Numeric keys are hashed as float64 (int64 1 and float64 1.0 join equal but
+    hash differently otherwise) and everything else as object. Precision lost
+    for huge integers only makes unrelated keys share a shard, which is harmless.
+    """
+
+    keys = {}
+    for col in entity_keys:
+        values = frame[col]
+        if pd.api.types.is_numeric_dtype(values):
+            # + 0.0 folds -0.0 into 0.0, which compare equal but hash apart.
+            keys[col] = values.astype("float64") + 0.0
+        else:
+            keys[col] = values.astype(object)
+    return pd.util.hash_pandas_object(pd.DataFrame(keys), index=False).to_numpy()
+
+
+def _partition_to_shards(
+    source: PitJoinSource,
+    *,
+    out_dir: Path,
+    entity_keys: Sequence[str],
+    time_col: str,
+    columns: Optional[Sequence[str]],
+    num_partitions: int,
+    batch_size: int,
+):
+    """Hash-partition `source` by entity key into one shard directory per partition.
+
+    Chunks are cast to the schema of the shard files being written. When a
+    chunk does not fit (e.g. an int column that turned float because the
+    chunk has NaN), the schema is widened and later chunks go to a new
+    generation of files; `_read_shard` concatenates the generations.
+
+    Returns the widest Arrow schema of the shards (None if the source was empty).
+    """
+
+    pa, pq = _require_pyarrow()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    writers: dict = {}
+    schema = None
+    generation = 0
+    try:
+        for frame in _iter_frames(source, columns, batch_size):
+            if frame.empty:
+                continue
+            for col in entity_keys:
+                if col not in frame.columns:
+                    raise KeyError(f"missing column: {col}")
+            frame = frame.assign(**{time_col: pd.to_datetime(frame[time_col], utc=True)})
+            part = _shard_hash(frame, entity_keys) % num_partitions
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if schema is None:
+                schema = table.schema
+            elif not table.schema.equals(schema):
+                try:
+                    table = table.cast(schema)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                    schema = pa.unify_schemas([schema, table.schema], promote_options="permissive")
+                    table = table.cast(schema)
+                    for writer in writers.values():
+                        writer.close()
+                    writers = {}
+                    generation += 1
+            order = part.argsort(kind="stable")
+            bounds = part[order].searchsorted(range(num_partitions + 1))
+            for p in range(num_partitions):
+                lo, hi = bounds[p], bounds[p + 1]
+                if lo == hi:
+                    continue
+                if p not in writers:
+                    shard = out_dir / f"part-{p:05d}"
+                    shard.mkdir(exist_ok=True)
+                    writers[p] = pq.ParquetWriter(str(shard / f"{generation:05d}.parquet"), schema)
+                writers[p].write_table(table.take(order[lo:hi]))
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return schema
+
+
+def _read_shard(path: str) -> pd.DataFrame:
+    pa, pq = _require_pyarrow()
+    tables = [pq.read_table(str(f)) for f in sorted(Path(path).glob("*.parquet"))]
+    return pa.concat_tables(tables, promote_options="permissive").to_pandas()
+
+
+def _join_partition(
+    label_path: str,
+    feature_path: Optional[str],
+    feature_schema: Any,
+    output_schema: Any,
+    out_path: str,
+    entity_keys: Sequence[str],
+    label_time_col: str,
+    feature_time_col: str,
+    feature_cols: Sequence[str],
+) -> str:
+    """Worker: in-memory point-in-time join of one label shard with its feature shard.
+
+    The result is cast to `output_schema` so every shard writes the same
+    schema, whatever pandas inferred for it (e.g. a null-typed feature
+    column when nothing matched, or keys realigned to float64).
+    """
+
+    pa, pq = _require_pyarrow()
+    labels = _read_shard(label_path)
+    if feature_path is not None:
+        features = _read_shard(feature_path)
+    else:
+        features = feature_schema.empty_table().to_pandas()
+
+    joined = point_in_time_join_pandas(
+        labels=labels,
+        features=features,
+        entity_keys=entity_keys,
+        label_time_col=label_time_col,
+        feature_time_col=feature_time_col,
+        feature_cols=feature_cols,
+    )
+    table = pa.Table.from_pandas(joined, preserve_index=False)
+    pq.write_table(table.select(output_schema.names).cast(output_schema), out_path)
+    return out_path
+
+
+def point_in_time_join_partitioned(
+    *,
+    labels: PitJoinSource,
+    features: PitJoinSource,
+    entity_keys: Sequence[str],
+    label_time_col: str,
+    feature_time_col: str,
+    feature_cols: Sequence[str],
+    num_partitions: int = 64,
+    max_workers: Optional[int] = None,
+    work_dir: Optional[str] = None,
+    batch_size: int = 1_000_000,
+) -> Iterator[Any]:
+    """Out-of-core point-in-time join yielding pyarrow RecordBatches.
+
+    Same semantics as `point_in_time_join_pandas`, for inputs larger than RAM:
+
+    1. Labels and features are streamed in `batch_size` chunks and
+       hash-partitioned by entity key into `num_partitions` Parquet shards
+       under `work_dir` (a temporary directory when not given).
+    2. Each label shard is joined with the matching feature shard by
+       `point_in_time_join_pandas` in a worker process; peak memory per
+       worker is roughly one shard pair.
+    3. Joined shards are streamed back as record batches as workers finish.
+
+    Output rows are grouped by partition and sorted by label time within
+    it, not in input order. Every batch has the same schema: the label
+    columns followed by `feature_cols`, typed as in the inputs. Shard files are removed once the
+    generator is exhausted or closed.
+    """
+
+    pa, pq = _require_pyarrow()
+    if num_partitions < 1:
+        raise ValueError("num_partitions must be >= 1")
+
+    owns_dir = work_dir is None
+    root = Path(tempfile.mkdtemp(prefix="pit_join_") if owns_dir else work_dir)
+    label_dir, feature_dir, out_dir = root / "labels", root / "features", root / "joined"
+    try:
+        label_schema = _partition_to_shards(
+            labels,
+            out_dir=label_dir,
+            entity_keys=entity_keys,
+            time_col=label_time_col,
+            columns=None,
+            num_partitions=num_partitions,
+            batch_size=batch_size,
+        )
+        if label_schema is None:
+            return
+        if label_time_col not in label_schema.names:
+            raise KeyError(f"labels missing column: {label_time_col}")
+
+        feature_schema = _partition_to_shards(
+            features,
+            out_dir=feature_dir,
+            entity_keys=entity_keys,
+            time_col=feature_time_col,
+            columns=list(entity_keys) + [feature_time_col] + list(feature_cols),
+            num_partitions=num_partitions,
+            batch_size=batch_size,
+        )
+        if feature_schema is None:
+            raise ValueError("features source is empty; cannot infer feature column types")
+        output_schema = pa.schema(
+            [*label_schema, *(feature_schema.field(c) for c in feature_cols if c not in label_schema.names)]
+        )
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+        try:
+            futures = []
+            for label_path in sorted(label_dir.glob("part-*")):
+                feature_path = feature_dir / label_path.name
+                futures.append(
+                    pool.submit(
+                        _join_partition,
+                        str(label_path),
+                        str(feature_path) if feature_path.exists() else None,
+                        feature_schema,
+                        output_schema,
+                        str(out_dir / f"{label_path.name}.parquet"),
+                        list(entity_keys),
+                        label_time_col,
+                        feature_time_col,
+                        list(feature_cols),
+                    )
+                )
+            for future in as_completed(futures):
+                out_path = future.result()
+                yield from pq.ParquetFile(out_path).iter_batches(batch_size=batch_size)
+                os.remove(out_path)
+        finally:
+            # Closing the generator early drops shards that have not started.
+            pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        if owns_dir:
+            shutil.rmtree(root, ignore_errors=True)
+        else:
+            for d in (label_dir, feature_dir, out_dir):
+                shutil.rmtree(d, ignore_errors=True)
+
+
 def point_in_time_join_spark(
     *,
     labels_df,
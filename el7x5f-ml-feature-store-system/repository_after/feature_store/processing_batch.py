@@ -16,6 +16,8 @@ from .registry import FeatureRegistry
 class SparkBatchSettings:
     watermark_delay: str = "1 day"
     watermark_state_key: str = "batch_watermark"
+    # Rows buffered per partition before each online bulk write.
+    online_bulk_rows: int = 50_000
 
 
 class SparkBatchProcessor:
@@ -265,25 +267,64 @@ class SparkBatchProcessor:
         entity_keys = list(feature.entity_keys)
         ts_col = feature.event_timestamp
         feat_col = feature.name
+        columns = [*entity_keys, ts_col, feat_col]
+        rows_per_frame = self._settings.online_bulk_rows
 
-        def write_partition(rows_iter):
-            from datetime import datetime, timezone
+        if not hasattr(online_store, "write_features_bulk"):
+            df.select(*columns).rdd.foreachPartition(
+                lambda rows_iter: _write_rows(rows_iter, online_store, feature_set, entity_keys, ts_col, feat_col)
+            )
+            return
 
+        def write_partition(rows_iter):
+            # Buffer rows into columnar frames and hand each one to the bulk
+            # path, which pipelines the writes with bounded in-flight batches.
+            buf: List[Any] = []
             for row in rows_iter:
-                ek = "|".join(str(row[k]) for k in entity_keys)
-                event_time = row[ts_col]
-                if isinstance(event_time, str):
-                    s = event_time.strip()
-                    if s.endswith("Z"):
-                        s = s[:-1] + "+00:00"
-                    event_time = datetime.fromisoformat(s)
-                if getattr(event_time, "tzinfo", None) is None:
-                    event_time = event_time.replace(tzinfo=timezone.utc)
-                online_store.write_features(
-                    feature_set=feature_set,
-                    entity_key=ek,
-                    values={feat_col: row[feat_col]},
-                    event_time=event_time,
-                )
-
-        df.select(*entity_keys, ts_col, feat_col).rdd.foreachPartition(write_partition)
+                buf.append(tuple(row))
+                if len(buf) >= rows_per_frame:
+                    _write_bulk(buf)
+                    buf = []
+            if buf:
+                _write_bulk(buf)
+
+        def _write_bulk(rows: List[Any]) -> None:
+            online_store.write_features_bulk(
+                feature_set=feature_set,
+                # dtype=object keeps the Python values Spark returned, so an
+                # int column with a null is not upcast to float
+                frame=pd.DataFrame(rows, columns=columns, dtype=object),
+                entity_keys=entity_keys,
+                event_time_col=ts_col,
+                feature_cols=[feat_col],
+            )
+
+        df.select(*columns).rdd.foreachPartition(write_partition)
+
+
+def _write_rows(
+    rows_iter: Iterable[Any],
+    online_store: OnlineStore,
+    feature_set: str,
+    entity_keys: Sequence[str],
+    ts_col: str,
+    feat_col: str,
+) -> None:
+    """Per-row fallback for online stores without `write_features_bulk`."""
+
+    for row in rows_iter:
+        ek = "|".join(str(row[k]) for k in entity_keys)
+        event_time = row[ts_col]
+        if isinstance(event_time, str):
+            s = event_time.strip()
+            if s.endswith("Z"):
+                s = s[:-1] + "+00:00"
+            event_time = datetime.fromisoformat(s)
+        if getattr(event_time, "tzinfo", None) is None:
+            event_time = event_time.replace(tzinfo=timezone.utc)
+        online_store.write_features(
+            feature_set=feature_set,
+            entity_key=ek,
+            values={feat_col: row[feat_col]},
+            event_time=event_time,
+        )
@@ -1,26 +1,43 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import networkx as nx
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
 from .db import DatabaseSettings, create_engine_and_session_factory
 from .dsl import Feature, FeatureMetadata, FeatureSource, PythonTransform, SQLTransform
-from .models import Base, FeatureDefinitionModel, FeatureLineageEdgeModel, FeatureProcessingStateModel, FeatureStatsModel
+from .models import (
+    Base,
+    FeatureDefinitionModel,
+    FeatureLineageEdgeModel,
+    FeatureProcessingStateModel,
+    FeatureStatsModel,
+    RegistryRevisionModel,
+)
 
 
 @dataclass(frozen=True)
 class RegistrySettings:
     database_url: str
+    # Read-through cache of features / listings / lineage for this process.
+    cache_enabled: bool = True
 
 
 class FeatureRegistry:
     """SQLAlchemy-backed registry.
 
     Stores feature definitions (schemas, metadata) + lineage edges.
+
+    Reads of feature definitions, listings and the lineage graph go through an
+    in-process cache keyed by `revision`, a counter stored in the database and
+    bumped in the same transaction as every metadata write (`register`,
+    `set_processing_state`), whichever process makes it. A cached read costs
+    one single-row SELECT of the revision instead of the full queries. Cached
+    `Feature` objects are shared; treat them as read-only.
     """
 
     def __init__(self, settings: RegistrySettings):
@@ -28,6 +45,69 @@ class FeatureRegistry:
         self._engine, self._SessionLocal = create_engine_and_session_factory(
             DatabaseSettings(database_url=settings.database_url)
         )
+        self._cache_lock = threading.Lock()
+        self._cache_revision: Optional[int] = None
+        self._feature_cache: Dict[Tuple[str, str], Feature] = {}
+        self._list_cache: Optional[List[Dict[str, Any]]] = None
+        self._lineage_cache: Optional[nx.DiGraph] = None
+
+    @property
+    def revision(self) -> int:
+        """Monotonically increasing revision of the registry metadata in the database."""
+
+        with self._session() as session:
+            return self._read_revision(session)
+
+    @staticmethod
+    def _read_revision(session: Session) -> int:
+        revision = session.execute(
+            select(RegistryRevisionModel.revision).where(RegistryRevisionModel.id == 1)
+        ).scalar_one_or_none()
+        return revision or 0
+
+    @staticmethod
+    def _bump_revision(session: Session) -> None:
+        """Bump the stored revision as part of the caller's write transaction."""
+
+        bumped = session.execute(
+            update(RegistryRevisionModel)
+            .where(RegistryRevisionModel.id == 1)
+            .values(revision=RegistryRevisionModel.revision + 1)
+        )
+        if bumped.rowcount == 0:
+            session.add(RegistryRevisionModel(id=1, revision=1))
+
+    def _clear_cache(self) -> None:
+        with self._cache_lock:
+            self._feature_cache = {}
+            self._list_cache = None
+            self._lineage_cache = None
+            self._cache_revision = None
+
+    def _cache_get(self, fn):
+        """Drop outdated cache entries, then return (fn(), current revision).
+
+        The revision is read before any data, and writes bump it in the same
+        transaction, so data loaded afterwards is at least that new.
+        """
+
+        revision = self.revision
+        with self._cache_lock:
+            if self._cache_revision is None or revision > self._cache_revision:
+                self._feature_cache = {}
+                self._list_cache = None
+                self._lineage_cache = None
+                self._cache_revision = revision
+            elif revision < self._cache_revision:
+                # Another thread already moved the cache to a newer revision.
+                return None, revision
+            return fn(), revision
+
+    def _cache_put(self, revision: int, fn) -> None:
+        with self._cache_lock:
+            # The cache moved on while we read the DB; don't cache an older result.
+            if revision == self._cache_revision:
+                fn()
 
     @property
     def engine(self):
@@ -35,9 +115,15 @@ class FeatureRegistry:
 
     def create_schema(self) -> None:
         Base.metadata.create_all(self._engine)
+        with self._session() as session:
+            if session.get(RegistryRevisionModel, 1) is None:
+                session.add(RegistryRevisionModel(id=1, revision=0))
+                session.commit()
+        self._clear_cache()
 
     def drop_schema(self) -> None:
         Base.metadata.drop_all(self._engine)
+        self._clear_cache()
 
     def _session(self) -> Session:
         return self._SessionLocal()
@@ -95,6 +181,7 @@ class FeatureRegistry:
             for upstream in feature.depends_on:
                 session.add(FeatureLineageEdgeModel(upstream=upstream, downstream=feature.name))
 
+            self._bump_revision(session)
             session.commit()
 
         if catalog_hook is not None:
@@ -121,6 +208,12 @@ class FeatureRegistry:
 
     def get(self, name: str, version: Optional[str] = None) -> Feature:
         version = version or "v1"
+        key = (name, version)
+        if self._settings.cache_enabled:
+            cached, revision = self._cache_get(lambda: self._feature_cache.get(key))
+            if cached is not None:
+                return cached
+
         with self._session() as session:
             row = session.execute(
                 select(FeatureDefinitionModel).where(
@@ -129,9 +222,24 @@ class FeatureRegistry:
                 )
             ).scalar_one()
 
-            return self._deserialize_feature(row)
+            feature = self._deserialize_feature(row)
+
+        if self._settings.cache_enabled:
+            self._cache_put(revision, lambda: self._feature_cache.__setitem__(key, feature))
+        return feature
 
     def list_features(self) -> List[Dict[str, Any]]:
+        if self._settings.cache_enabled:
+            cached, revision = self._cache_get(lambda: self._list_cache)
+            if cached is not None:
+                return [dict(item) for item in cached]
+
+        items = self._load_feature_list()
+        if self._settings.cache_enabled:
+            self._cache_put(revision, lambda: setattr(self, "_list_cache", items))
+        return [dict(item) for item in items]
+
+    def _load_feature_list(self) -> List[Dict[str, Any]]:
         with self._session() as session:
             rows = session.execute(select(FeatureDefinitionModel)).scalars().all()
             return [
@@ -181,6 +289,7 @@ class FeatureRegistry:
             else:
                 existing.state = state
 
+            self._bump_revision(session)
             session.commit()
 
     def get_processing_state(
@@ -201,11 +310,21 @@ class FeatureRegistry:
             return None if row is None else row.state
 
     def lineage_graph(self) -> nx.DiGraph:
+        """Lineage graph; a copy, so callers may mutate it freely."""
+
+        if self._settings.cache_enabled:
+            cached, revision = self._cache_get(lambda: self._lineage_cache)
+            if cached is not None:
+                return cached.copy()
+
         g = nx.DiGraph()
         with self._session() as session:
             edges = session.execute(select(FeatureLineageEdgeModel)).scalars().all()
             for e in edges:
                 g.add_edge(e.upstream, e.downstream)
+
+        if self._settings.cache_enabled:
+            self._cache_put(revision, lambda: setattr(self, "_lineage_cache", g.copy()))
         return g
 
     def record_stats(self, feature_name: str, feature_version: str, stats: Dict[str, Any]) -> None:
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from typing import Any, Mapping, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 from .serving import OnlineStore
@@ -22,14 +23,42 @@ class PandasFeatureFetcher:
         defaults: Optional[Mapping[str, Any]] = None,
         max_age_seconds: Optional[int] = None,
     ) -> pd.DataFrame:
-        rows: List[Dict[str, Any]] = []
-        for ek in entities[entity_key_col].astype(str).tolist():
-            feats = self.online_store.get_features(
-                feature_set=self.feature_set,
-                entity_key=ek,
-                feature_names=feature_names,
-                defaults=defaults,
-                max_age_seconds=max_age_seconds,
-            )
-            rows.append({entity_key_col: ek, **feats})
+        keys = entities[entity_key_col].astype(str).tolist()
+        feats = self.online_store.get_features_batch(
+            feature_set=self.feature_set,
+            entity_keys=list(dict.fromkeys(keys)),
+            feature_names=feature_names,
+            defaults=defaults,
+            max_age_seconds=max_age_seconds,
+        )
+        rows = [{entity_key_col: ek, **values} for ek, values in feats.items()]
         return entities.merge(pd.DataFrame(rows), on=entity_key_col, how="left")
+
+    def fetch_array(
+        self,
+        *,
+        entity_keys: Sequence[Any],
+        feature_names: Sequence[str],
+        defaults: Optional[Mapping[str, Any]] = None,
+        max_age_seconds: Optional[int] = None,
+        dtype: Any = np.float32,
+    ) -> np.ndarray:
+        """Fetch features for `entity_keys` in one batched call as a 2-D array.
+
+        Rows follow `entity_keys` order and columns follow `feature_names`.
+        Values that do not parse as numbers become NaN.
+        """
+
+        keys = [str(ek) for ek in entity_keys]
+        feats = self.online_store.get_features_batch(
+            feature_set=self.feature_set,
+            entity_keys=keys,
+            feature_names=feature_names,
+            defaults=defaults,
+            max_age_seconds=max_age_seconds,
+        )
+        out = np.empty((len(keys), len(feature_names)), dtype=dtype)
+        for j, name in enumerate(feature_names):
+            column = pd.Series([feats[ek][name] for ek in keys], dtype=object)
+            out[:, j] = pd.to_numeric(column, errors="coerce").to_numpy(dtype=dtype, na_value=np.nan)
+        return out
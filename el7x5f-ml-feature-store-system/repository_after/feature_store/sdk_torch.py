@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Mapping, Optional, Sequence
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Sequence
 
 try:
     import torch
-    from torch.utils.data import Dataset
+    from torch.utils.data import Dataset, IterableDataset
 except Exception:  # pragma: no cover
     torch = None
     Dataset = object
+    IterableDataset = object
 
+import numpy as np
 import pandas as pd
 
 from .sdk_pandas import PandasFeatureFetcher
@@ -42,3 +46,136 @@ class FeatureStoreDataset(Dataset):
         if torch is None:  # pragma: no cover
             return values
         return torch.tensor(values)
+
+    def __getitems__(self, indices: Sequence[int]):
+        """Batched fetch used by DataLoader's auto-batching (torch >= 2.0).
+
+        One online-store call for the whole mini-batch; rows are views into a
+        single tensor built from NumPy.
+        """
+
+        keys = self.entities[self.entity_key_col].to_numpy()[list(indices)]
+        values = self.fetcher.fetch_array(
+            entity_keys=keys,
+            feature_names=self.feature_names,
+            defaults=self.defaults,
+            max_age_seconds=self.max_age_seconds,
+        )
+        if torch is None:  # pragma: no cover
+            return list(values)
+        return list(torch.from_numpy(values))
+
+
+@dataclass
+class BatchedFeatureStoreDataset(IterableDataset):
+    """Iterable dataset that yields whole mini-batches of online features.
+
+    Each batch is fetched with a single `get_features_batch` call and returned
+    as a contiguous `(batch, n_features)` tensor built from a NumPy array.
+    The next `prefetch` batches are fetched on a background thread while the
+    current one is consumed.
+
+    Use with `DataLoader(dataset, batch_size=None)`. With several DataLoader
+    workers, batches are sharded round-robin so each worker fetches its own.
+    """
+
+    entities: pd.DataFrame
+    entity_key_col: str
+    feature_names: Sequence[str]
+    fetcher: PandasFeatureFetcher
+    defaults: Optional[Mapping[str, Any]] = None
+    max_age_seconds: Optional[int] = None
+    batch_size: int = 256
+    prefetch: int = 2
+    shuffle: bool = False
+    seed: int = 0
+    drop_last: bool = False
+    _epoch: int = field(default=0, init=False, repr=False)
+
+    def set_epoch(self, epoch: int) -> None:
+        """Reshuffle for a new epoch (same convention as DistributedSampler).
+
+        The shuffle order depends only on (seed, epoch) so DataLoader workers,
+        which each hold a copy of the dataset, agree on how to shard it.
+        """
+
+        self._epoch = epoch
+
+    def __len__(self) -> int:
+        n = len(self.entities)
+        return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
+
+    def _batch_keys(self) -> List[np.ndarray]:
+        keys = self.entities[self.entity_key_col].to_numpy()
+        if self.shuffle:
+            keys = keys[np.random.default_rng(self.seed + self._epoch).permutation(len(keys))]
+        batches = [keys[i:i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+
+        worker = torch.utils.data.get_worker_info() if torch is not None else None
+        if worker is not None:
+            batches = batches[worker.id::worker.num_workers]
+        return batches
+
+    def _fetch(self, keys: np.ndarray) -> np.ndarray:
+        return self.fetcher.fetch_array(
+            entity_keys=keys,
+            feature_names=self.feature_names,
+            defaults=self.defaults,
+            max_age_seconds=self.max_age_seconds,
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        batches = self._batch_keys()
+        for values in _prefetched(batches, self._fetch, self.prefetch):
+            yield values if torch is None else torch.from_numpy(values)
+
+
+_END = object()
+
+
+def _prefetched(items: Sequence[Any], fn: Callable[[Any], Any], depth: int) -> Iterator[Any]:
+    """Yield fn(item) for each item, computing up to `depth` results ahead on a thread."""
+
+    if depth <= 0:
+        for item in items:
+            yield fn(item)
+        return
+
+    out: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def _put(value: Any) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in items:
+                if not _put(fn(item)):
+                    return
+        except BaseException as e:
+            _put(e)
+            return
+        _put(_END)
+
+    thread = threading.Thread(target=_produce, name="feature-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            value = out.get()
+            if value is _END:
+                return
+            if isinstance(value, BaseException):
+                raise value
+            yield value
+    finally:
+        # Consumer stopped early (break / garbage collection): release the producer.
+        stop.set()
+        thread.join()
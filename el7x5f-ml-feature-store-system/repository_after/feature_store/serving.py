@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Mapping, Optional, Protocol, Sequence
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Protocol, Sequence, Tuple
 
 from .alerts import AlertSink, NoopAlertSink
 
@@ -40,12 +44,193 @@ class OnlineStore(Protocol):
     ) -> Dict[str, Dict[str, Any]]:
         ...
 
+    def write_features_bulk(
+        self,
+        *,
+        feature_set: str,
+        frame: Any,
+        entity_keys: Sequence[str],
+        event_time_col: str,
+        feature_cols: Sequence[str],
+    ) -> int:
+        ...
+
+
+def _bulk_frame(frame: Any, *, entity_keys: Sequence[str], event_time_col: str, feature_cols: Sequence[str]):
+    """Normalize a bulk write input to (entity keys, event time ms, feature columns).
+
+    Accepts a pandas DataFrame or anything with `to_pandas()` (pyarrow
+    RecordBatch/Table). Entity keys are joined with "|" and naive timestamps
+    are treated as UTC, matching the per-row write path.
+
+    Feature columns are lists of the values a per-row caller would pass to
+    `write_features`: `DataFrame.to_dict("records")` values for pandas (NaN
+    stays NaN, nullable-dtype NA becomes None) and `to_pylist()` values for
+    Arrow, so integer columns with nulls are not upcast to float. Entity keys
+    are built from the same values.
+    """
+
+    import pandas as pd
+
+    if isinstance(frame, pd.DataFrame):
+
+        def pylist(name: str) -> List[Any]:
+            return [None if v is pd.NA else v for v in frame[name].astype(object).tolist()]
+
+    else:
+        if not hasattr(frame, "to_pandas"):
+            raise TypeError(f"Unsupported bulk frame type: {type(frame)}")
+        arrow = frame
+
+        def pylist(name: str) -> List[Any]:
+            return arrow.column(name).to_pylist()
+
+        frame = frame.to_pandas()
+
+    columns = {name: pylist(name) for name in feature_cols}
+
+    # Keys are str() of each Python value, as in the per-row path; going
+    # through a pandas dtype would turn 1 into "1.0" or drop a time part.
+    keys = ["|".join(map(str, parts)) for parts in zip(*(pylist(k) for k in entity_keys))]
+
+    event_time = pd.to_datetime(frame[event_time_col], utc=True, format="ISO8601")
+    event_ms = (event_time - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+
+    return keys, event_ms.tolist(), columns
+
+
+def _hash_value(v: Any) -> str:
+    # Values are stored as strings by redis-py; None is stored as "".
+    return "" if v is None else str(v)
+
+
+def _ts_value(v: Any) -> Any:
+    # RedisTimeSeries samples are numeric; None is stored as NaN.
+    return "nan" if v is None else v
+
+
+def _row_chunks(n: int, size: int) -> Iterator[range]:
+    for start in range(0, n, max(1, size)):
+        yield range(start, min(n, start + max(1, size)))
+
+
+class _PipelineFlusher:
+    """Runs pipeline flushes on a thread pool with at most `max_in_flight` pending.
+
+    Building the next pipeline overlaps with the network round-trips of the
+    previous ones while memory stays bounded to `max_in_flight` chunks.
+    """
+
+    def __init__(self, max_in_flight: int):
+        self._max_in_flight = max(1, max_in_flight)
+        self._pool = ThreadPoolExecutor(max_workers=self._max_in_flight) if self._max_in_flight > 1 else None
+        self._pending: Deque[Future] = deque()
+
+    def submit(self, flush: Callable[[], Any]) -> None:
+        if self._pool is None:
+            flush()
+            return
+        while len(self._pending) >= self._max_in_flight:
+            self._pending.popleft().result()
+        self._pending.append(self._pool.submit(flush))
+
+    def close(self) -> None:
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+
+
+class NearCache:
+    """In-process TTL + LRU cache of raw online-store reads.
+
+    Entries hold what Redis returned (values plus their event time), not the
+    resolved response, so `max_age_seconds` staleness is still evaluated
+    against the wall clock on every read, exactly as for a Redis hit. The TTL
+    only bounds how long a read may lag writes made by other processes;
+    writes through the owning store invalidate the entity right away.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, meta, {feature_name: raw})
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str], feature_names: Sequence[str]) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Return (meta, raw values) if every requested feature is cached."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, meta, values = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            if any(name not in values for name in feature_names):
+                return None
+            self._entries.move_to_end(key)
+            return meta, values
+
+    def put(self, key: Tuple[str, str], meta: Any, values: Mapping[str, Any]) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            merged: Dict[str, Any] = {}
+            # Keep other cached features only if they describe the same write
+            if entry is not None and entry[0] > self._clock() and entry[1] == meta:
+                merged.update(entry[2])
+            merged.update(values)
+            self._entries[key] = (self._clock() + self._ttl, meta, merged)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _chunks(items: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    for start in range(0, len(items), max(1, size)):
+        yield items[start:start + max(1, size)]
+
+
+def _make_near_cache(ttl_seconds: Optional[float], max_entries: int) -> Optional[NearCache]:
+    if ttl_seconds is None or ttl_seconds <= 0:
+        return None
+    return NearCache(ttl_seconds, max_entries=max_entries)
+
 
 @dataclass(frozen=True)
 class RedisOnlineStoreSettings:
     redis_url: str
     key_prefix: str = "fs"
     alert_sink: Optional[AlertSink] = None
+    # Entities per pipelined round-trip in get_features_batch.
+    batch_chunk_size: int = 1000
+    # Enables the in-process near-cache when set.
+    near_cache_ttl_seconds: Optional[float] = None
+    near_cache_max_entries: int = 100_000
+    # Rows per pipeline and pipelines in flight for write_features_bulk.
+    bulk_chunk_size: int = 5000
+    bulk_max_in_flight: int = 4
 
 
 class RedisOnlineStore:
@@ -63,6 +248,7 @@ class RedisOnlineStore:
         self._settings = settings
         self._client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
         self._alert_sink = settings.alert_sink or NoopAlertSink()
+        self._near_cache = _make_near_cache(settings.near_cache_ttl_seconds, settings.near_cache_max_entries)
 
     def _entity_hash_key(self, feature_set: str, entity_key: str) -> str:
         return f"{self._settings.key_prefix}:{feature_set}:{entity_key}:values"
@@ -86,11 +272,61 @@ class RedisOnlineStore:
         mkey = self._entity_meta_key(feature_set, entity_key)
 
         pipe = self._client.pipeline()
-        # Values are stored as strings by redis-py; keep it simple.
-        pipe.hset(hkey, mapping={k: "" if v is None else str(v) for k, v in values.items()})
+        pipe.hset(hkey, mapping={k: _hash_value(v) for k, v in values.items()})
         pipe.hset(mkey, mapping={"event_time": str(ts)})
         pipe.execute()
 
+        if self._near_cache is not None:
+            self._near_cache.invalidate((feature_set, entity_key))
+
+    def write_features_bulk(
+        self,
+        *,
+        feature_set: str,
+        frame: Any,
+        entity_keys: Sequence[str],
+        event_time_col: str,
+        feature_cols: Sequence[str],
+    ) -> int:
+        """Write a DataFrame or Arrow batch of feature rows.
+
+        Rows are sent as non-transactional pipelines of `bulk_chunk_size`
+        rows with up to `bulk_max_in_flight` pipelines outstanding. When an
+        entity appears more than once the last row wins, as it would with
+        sequential `write_features` calls. Returns the number of rows written.
+        """
+
+        keys, event_ms, values = _bulk_frame(
+            frame, entity_keys=entity_keys, event_time_col=event_time_col, feature_cols=feature_cols
+        )
+        # Same strings as write_features stores for each row.
+        columns = [(name, [_hash_value(v) for v in values[name]]) for name in feature_cols]
+
+        # Last row per entity wins; drop earlier ones so chunks can run concurrently.
+        last = list({ek: i for i, ek in enumerate(keys)}.values())
+        if len(last) != len(keys):
+            last.sort()
+            keys = [keys[i] for i in last]
+            event_ms = [event_ms[i] for i in last]
+            columns = [(name, [col[i] for i in last]) for name, col in columns]
+
+        flusher = _PipelineFlusher(self._settings.bulk_max_in_flight)
+        try:
+            for rows in _row_chunks(len(keys), self._settings.bulk_chunk_size):
+                pipe = self._client.pipeline(transaction=False)
+                for i in rows:
+                    ek = keys[i]
+                    pipe.hset(self._entity_hash_key(feature_set, ek), mapping={n: col[i] for n, col in columns})
+                    pipe.hset(self._entity_meta_key(feature_set, ek), mapping={"event_time": str(event_ms[i] // 1000)})
+                flusher.submit(pipe.execute)
+        finally:
+            flusher.close()
+
+        if self._near_cache is not None:
+            for ek in keys:
+                self._near_cache.invalidate((feature_set, ek))
+        return len(keys)
+
     def get_features(
         self,
         *,
@@ -100,40 +336,33 @@ class RedisOnlineStore:
         defaults: Optional[Mapping[str, Any]] = None,
         max_age_seconds: Optional[int] = None,
     ) -> Dict[str, Any]:
-        defaults = defaults or {}
-
-        hkey = self._entity_hash_key(feature_set, entity_key)
-        mkey = self._entity_meta_key(feature_set, entity_key)
-
-        pipe = self._client.pipeline()
-        pipe.hmget(hkey, list(feature_names))
-        pipe.hget(mkey, "event_time")
-        values, event_time_s = pipe.execute()
-
-        now_ts = int(datetime.now(tz=timezone.utc).timestamp())
-        if max_age_seconds is not None and event_time_s is not None:
-            age = now_ts - int(event_time_s)
-            if age > max_age_seconds:
-                # staleness => return defaults
-                self._alert_sink.emit(
-                    alert_type="feature_stale",
-                    payload={
-                        "feature_set": feature_set,
-                        "entity_key": entity_key,
-                        "age_seconds": age,
-                        "max_age_seconds": max_age_seconds,
-                        "feature_names": list(feature_names),
-                    },
-                )
-                return {name: defaults.get(name) for name in feature_names}
-
-        out: Dict[str, Any] = {}
-        for name, raw in zip(feature_names, values):
-            if raw is None:
-                out[name] = defaults.get(name)
-            else:
-                out[name] = raw
-        return out
+        return self.get_features_batch(
+            feature_set=feature_set,
+            entity_keys=[entity_key],
+            feature_names=feature_names,
+            defaults=defaults,
+            max_age_seconds=max_age_seconds,
+        )[entity_key]
+
+    def _fetch(
+        self, feature_set: str, entity_keys: Sequence[str], feature_names: Sequence[str]
+    ) -> Dict[str, Tuple[Optional[str], Dict[str, Any]]]:
+        """HMGET + event time for every entity, one pipelined round-trip per chunk."""
+
+        names = list(feature_names)
+        raw: Dict[str, Tuple[Optional[str], Dict[str, Any]]] = {}
+        for chunk in _chunks(entity_keys, self._settings.batch_chunk_size):
+            pipe = self._client.pipeline()
+            for ek in chunk:
+                pipe.hmget(self._entity_hash_key(feature_set, ek), names)
+                pipe.hget(self._entity_meta_key(feature_set, ek), "event_time")
+            replies = pipe.execute()
+            for n, ek in enumerate(chunk):
+                values, event_time_s = replies[2 * n], replies[2 * n + 1]
+                raw[ek] = (event_time_s, dict(zip(names, values)))
+                if self._near_cache is not None:
+                    self._near_cache.put((feature_set, ek), event_time_s, raw[ek][1])
+        return raw
 
     def get_features_batch(
         self,
@@ -144,16 +373,51 @@ class RedisOnlineStore:
         defaults: Optional[Mapping[str, Any]] = None,
         max_age_seconds: Optional[int] = None,
     ) -> Dict[str, Dict[str, Any]]:
-        return {
-            ek: self.get_features(
-                feature_set=feature_set,
-                entity_key=ek,
-                feature_names=feature_names,
-                defaults=defaults,
-                max_age_seconds=max_age_seconds,
-            )
-            for ek in entity_keys
-        }
+        """Pipelined batch read.
+
+        Entities served by the near-cache skip Redis; the rest are read with
+        one pipelined round-trip per `batch_chunk_size` entities.
+        """
+
+        defaults = defaults or {}
+
+        raw: Dict[str, Tuple[Optional[str], Dict[str, Any]]] = {}
+        misses: List[str] = []
+        for ek in dict.fromkeys(entity_keys):
+            cached = self._near_cache.get((feature_set, ek), feature_names) if self._near_cache else None
+            if cached is None:
+                misses.append(ek)
+            else:
+                raw[ek] = cached
+        if misses:
+            raw.update(self._fetch(feature_set, misses, feature_names))
+
+        now_ts = int(datetime.now(tz=timezone.utc).timestamp())
+        out: Dict[str, Dict[str, Any]] = {}
+        for ek, (event_time_s, values) in raw.items():
+            if max_age_seconds is not None and event_time_s is not None:
+                age = now_ts - int(event_time_s)
+                if age > max_age_seconds:
+                    # staleness => return defaults
+                    self._alert_sink.emit(
+                        alert_type="feature_stale",
+                        payload={
+                            "feature_set": feature_set,
+                            "entity_key": ek,
+                            "age_seconds": age,
+                            "max_age_seconds": max_age_seconds,
+                            "feature_names": list(feature_names),
+                        },
+                    )
+                    out[ek] = {name: defaults.get(name) for name in feature_names}
+                    continue
+
+            resolved: Dict[str, Any] = {}
+            for name in feature_names:
+                raw_value = values.get(name)
+                resolved[name] = defaults.get(name) if raw_value is None else raw_value
+            out[ek] = resolved
+        return {ek: out[ek] for ek in entity_keys}
 
 
 @dataclass(frozen=True)
@@ -161,6 +425,14 @@ class RedisTimeSeriesOnlineStoreSettings:
     redis_url: str
     key_prefix: str = "fs"
     alert_sink: Optional[AlertSink] = None
+    # Entities per pipelined round-trip in get_features_batch.
+    batch_chunk_size: int = 1000
+    # Enables the in-process near-cache when set.
+    near_cache_ttl_seconds: Optional[float] = None
+    near_cache_max_entries: int = 100_000
+    # Rows per pipeline and pipelines in flight for write_features_bulk.
+    bulk_chunk_size: int = 5000
+    bulk_max_in_flight: int = 4
 
 
 class RedisTimeSeriesOnlineStore:
@@ -183,10 +455,28 @@ class RedisTimeSeriesOnlineStore:
         self._settings = settings
         self._client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
         self._alert_sink = settings.alert_sink or NoopAlertSink()
+        self._near_cache = _make_near_cache(settings.near_cache_ttl_seconds, settings.near_cache_max_entries)
 
     def _ts_key(self, feature_set: str, entity_key: str, feature_name: str) -> str:
         return f"{self._settings.key_prefix}:{feature_set}:{entity_key}:ts:{feature_name}"
 
+    def _add_sample(self, key: str, ts_ms: int, value: Any) -> None:
+        from redis.exceptions import ResponseError
+
+        try:
+            self._client.execute_command("TS.ADD", key, ts_ms, value)
+        except ResponseError as e:
+            msg = str(e)
+            if "TSDB: the key does not exist" in msg or "does not exist" in msg:
+                # Create then retry.
+                try:
+                    self._client.execute_command("TS.CREATE", key, "DUPLICATE_POLICY", "last")
+                except ResponseError:
+                    pass
+                self._client.execute_command("TS.ADD", key, ts_ms, value)
+            else:
+                raise
+
     def write_features(
         self,
         *,
@@ -199,23 +489,62 @@ class RedisTimeSeriesOnlineStore:
             event_time = event_time.replace(tzinfo=timezone.utc)
         ts_ms = int(event_time.timestamp() * 1000)
 
+        for fname, val in values.items():
+            self._add_sample(self._ts_key(feature_set, entity_key, fname), ts_ms, _ts_value(val))
+
+        if self._near_cache is not None:
+            self._near_cache.invalidate((feature_set, entity_key))
+
+    def write_features_bulk(
+        self,
+        *,
+        feature_set: str,
+        frame: Any,
+        entity_keys: Sequence[str],
+        event_time_col: str,
+        feature_cols: Sequence[str],
+    ) -> int:
+        """Write a DataFrame or Arrow batch as pipelined TS.ADD commands.
+
+        Chunks follow `RedisOnlineStore.write_features_bulk` (non-transactional
+        pipelines). Every row is appended as a sample, so duplicates need no
+        special handling. Commands that fail (e.g. a series missing where
+        TS.ADD does not auto-create) are retried one by one the way
+        `write_features` does, creating series on demand; samples that already
+        landed are not sent again.
+        """
+
         from redis.exceptions import ResponseError
 
-        for fname, val in values.items():
-            key = self._ts_key(feature_set, entity_key, fname)
-            try:
-                self._client.execute_command("TS.ADD", key, ts_ms, val if val is not None else "nan")
-            except ResponseError as e:
-                msg = str(e)
-                if "TSDB: the key does not exist" in msg or "does not exist" in msg:
-                    # Create then retry.
-                    try:
-                        self._client.execute_command("TS.CREATE", key, "DUPLICATE_POLICY", "last")
-                    except ResponseError:
-                        pass
-                    self._client.execute_command("TS.ADD", key, ts_ms, val if val is not None else "nan")
-                else:
-                    raise
+        keys, event_ms, values = _bulk_frame(
+            frame, entity_keys=entity_keys, event_time_col=event_time_col, feature_cols=feature_cols
+        )
+        columns = [(name, [_ts_value(v) for v in values[name]]) for name in feature_cols]
+
+        def _flush(rows: range) -> None:
+            pipe = self._client.pipeline(transaction=False)
+            samples = []
+            for i in rows:
+                for name, col in columns:
+                    sample = (self._ts_key(feature_set, keys[i], name), event_ms[i], col[i])
+                    pipe.execute_command("TS.ADD", *sample)
+                    samples.append(sample)
+            results = pipe.execute(raise_on_error=False)
+            for sample, result in zip(samples, results):
+                if isinstance(result, ResponseError):
+                    self._add_sample(*sample)
+
+        flusher = _PipelineFlusher(self._settings.bulk_max_in_flight)
+        try:
+            for rows in _row_chunks(len(keys), self._settings.bulk_chunk_size):
+                flusher.submit(lambda rows=rows: _flush(rows))
+        finally:
+            flusher.close()
+
+        if self._near_cache is not None:
+            for ek in set(keys):
+                self._near_cache.invalidate((feature_set, ek))
+        return len(keys)
 
     def get_features(
         self,
@@ -226,39 +555,31 @@ class RedisTimeSeriesOnlineStore:
         defaults: Optional[Mapping[str, Any]] = None,
         max_age_seconds: Optional[int] = None,
     ) -> Dict[str, Any]:
-        defaults = defaults or {}
-
-        now_ms = int(datetime.now(tz=timezone.utc).timestamp() * 1000)
-        out: Dict[str, Any] = {}
-
-        pipe = self._client.pipeline()
-        keys = [self._ts_key(feature_set, entity_key, n) for n in feature_names]
-        for k in keys:
-            pipe.execute_command("TS.GET", k)
-        results = pipe.execute()
-
-        for name, res in zip(feature_names, results):
-            if not res:
-                out[name] = defaults.get(name)
-                continue
-            ts_ms, value = res
-            if max_age_seconds is not None:
-                age_s = (now_ms - int(ts_ms)) / 1000.0
-                if age_s > max_age_seconds:
-                    self._alert_sink.emit(
-                        alert_type="feature_stale",
-                        payload={
-                            "feature_set": feature_set,
-                            "entity_key": entity_key,
-                            "age_seconds": age_s,
-                            "max_age_seconds": max_age_seconds,
-                            "feature_names": [name],
-                        },
-                    )
-                    out[name] = defaults.get(name)
-                    continue
-            out[name] = value
-        return out
+        return self.get_features_batch(
+            feature_set=feature_set,
+            entity_keys=[entity_key],
+            feature_names=feature_names,
+            defaults=defaults,
+            max_age_seconds=max_age_seconds,
+        )[entity_key]
+
+    def _fetch(
+        self, feature_set: str, entity_keys: Sequence[str], feature_names: Sequence[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """TS.GET for every (entity, feature), one pipelined round-trip per chunk."""
+
+        raw: Dict[str, Dict[str, Any]] = {}
+        for chunk in _chunks(entity_keys, self._settings.batch_chunk_size):
+            pipe = self._client.pipeline()
+            for ek in chunk:
+                for name in feature_names:
+                    pipe.execute_command("TS.GET", self._ts_key(feature_set, ek, name))
+            replies = iter(pipe.execute())
+            for ek in chunk:
+                raw[ek] = {name: next(replies) for name in feature_names}
+                if self._near_cache is not None:
+                    self._near_cache.put((feature_set, ek), None, raw[ek])
+        return raw
 
     def get_features_batch(
         self,
@@ -269,14 +590,46 @@ class RedisTimeSeriesOnlineStore:
         defaults: Optional[Mapping[str, Any]] = None,
         max_age_seconds: Optional[int] = None,
     ) -> Dict[str, Dict[str, Any]]:
-        return {
-            ek: self.get_features(
-                feature_set=feature_set,
-                entity_key=ek,
-                feature_names=feature_names,
-                defaults=defaults,
-                max_age_seconds=max_age_seconds,
-            )
-            for ek in entity_keys
-        }
+        """Pipelined batch read; see `RedisOnlineStore.get_features_batch`."""
 
+        defaults = defaults or {}
+
+        raw: Dict[str, Dict[str, Any]] = {}
+        misses: List[str] = []
+        for ek in dict.fromkeys(entity_keys):
+            cached = self._near_cache.get((feature_set, ek), feature_names) if self._near_cache else None
+            if cached is None:
+                misses.append(ek)
+            else:
+                raw[ek] = cached[1]
+        if misses:
+            raw.update(self._fetch(feature_set, misses, feature_names))
+
+        now_ms = int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+        out: Dict[str, Dict[str, Any]] = {}
+        for ek, results in raw.items():
+            resolved: Dict[str, Any] = {}
+            for name in feature_names:
+                res = results.get(name)
+                if not res:
+                    resolved[name] = defaults.get(name)
+                    continue
+                ts_ms, value = res
+                if max_age_seconds is not None:
+                    age_s = (now_ms - int(ts_ms)) / 1000.0
+                    if age_s > max_age_seconds:
+                        self._alert_sink.emit(
+                            alert_type="feature_stale",
+                            payload={
+                                "feature_set": feature_set,
+                                "entity_key": ek,
+                                "age_seconds": age_s,
+                                "max_age_seconds": max_age_seconds,
+                                "feature_names": [name],
+                            },
+                        )
+                        resolved[name] = defaults.get(name)
+                        continue
+                resolved[name] = value
+            out[ek] = resolved
+        return {ek: out[ek] for ek in entity_keys}
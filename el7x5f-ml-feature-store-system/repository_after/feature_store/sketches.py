@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import base64
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _as_float_array(values: Any) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        arr = values.astype(float, copy=False)
+    elif isinstance(values, (pd.Series, pd.Index)):
+        arr = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    elif hasattr(values, "__len__"):
+        arr = np.asarray(values, dtype=float)
+    else:
+        arr = np.fromiter(values, dtype=float)
+    return arr.ravel()
+
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch.
+
+    Keeps O(k log(n/k)) items with rank error around 1.7/k with high
+    probability. Level h holds items of weight 2**h; a full level is sorted
+    and every other item (random offset) is promoted to the next level.
+    """
+
+    def __init__(self, k: int = 200, *, seed: Optional[int] = None):
+        self.k = k
+        self.n = 0
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(8, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size >= self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # Odd leftover stays behind so total weight is preserved.
+                keep = items[:1] if items.size % 2 else items[:0]
+                items = items[keep.size:]
+                promoted = items[int(self._rng.integers(2))::2]
+                self._levels[level] = keep
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: Any) -> None:
+        arr = _as_float_array(values)
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return
+        self.n += int(arr.size)
+        self._levels[0] = np.concatenate([self._levels[0], arr])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted(self):
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(items.size, 2.0 ** h) for h, items in enumerate(self._levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Approximate quantiles, interpolated like numpy's "linear" method.
+
+        While nothing has been compacted the result equals `np.quantile`.
+        """
+
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        values, cum = self._weighted()
+        ranks = np.asarray(qs, dtype=float) * (cum[-1] - 1)
+        lo = np.floor(ranks)
+        v_lo = values[np.minimum(np.searchsorted(cum, lo + 1), values.size - 1)]
+        v_hi = values[np.minimum(np.searchsorted(cum, lo + 2), values.size - 1)]
+        return v_lo + (ranks - lo) * (v_hi - v_lo)
+
+    def cdf(self, points: Sequence[float], *, strict: bool = False) -> np.ndarray:
+        """Approximate fraction of items <= each point (< when `strict`)."""
+
+        if self.n == 0:
+            return np.full(len(points), np.nan)
+        values, cum = self._weighted()
+        idx = np.searchsorted(values, np.asarray(points, dtype=float), side="left" if strict else "right")
+        return np.where(idx > 0, cum[np.maximum(idx - 1, 0)], 0.0) / cum[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "n": self.n, "levels": [items.tolist() for items in self._levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KLLSketch":
+        sketch = cls(k=int(data["k"]))
+        sketch.n = int(data["n"])
+        sketch._levels = [np.asarray(items, dtype=float) for items in data["levels"]] or [np.empty(0)]
+        return sketch
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter (2**p one-byte registers, ~1.04/sqrt(2**p) error)."""
+
+    def __init__(self, p: int = 12):
+        if not 4 <= p <= 18:
+            raise ValueError("p must be between 4 and 18")
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values: Any) -> None:
+        series = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values))
+        series = series.dropna()
+        if series.empty:
+            return
+        # Hash numbers by value, not dtype: 1 (int64) and 1.0 (float64) must
+        # land in the same register or merged sketches double-count. Integers
+        # beyond 2**53 may collide, which only undercounts by those values.
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.infer_dtype(series, skipna=True) in (
+            "integer",
+            "floating",
+            "mixed-integer-float",
+        ):
+            series = series.astype(np.float64) + 0.0  # + 0.0 folds -0.0 into 0.0
+        # Stable 64-bit hashes (same across processes, unlike hash()).
+        h = pd.util.hash_pandas_object(series, index=False).to_numpy(dtype=np.uint64)
+        idx = (h >> np.uint64(64 - self.p)).astype(np.int64)
+        rest_bits = 64 - self.p
+        w = (h & np.uint64((1 << rest_bits) - 1)).astype(float)
+        # rho = position of the leftmost 1-bit in the remaining bits
+        _, exp = np.frexp(w)
+        rho = np.where(w == 0, rest_bits + 1, rest_bits - exp + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rho)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLog sketches with different p")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = float(self.registers.size)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.exp2(-self.registers.astype(float))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(p=int(data["p"]))
+        sketch.registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return sketch
+
+
+class FeatureSketch:
+    """Constant-memory, mergeable profile of one feature column.
+
+    Tracks counts, nulls, min/max/mean/std (via sums), KLL quantiles for
+    numeric values and HyperLogLog distinct counts. Serializes to a JSON-able
+    dict suitable for `FeatureRegistry.record_stats`.
+    """
+
+    def __init__(self, *, k: int = 200, hll_p: int = 12, seed: Optional[int] = None):
+        self.count = 0
+        self.null_count = 0
+        self.numeric_count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.quantiles = KLLSketch(k=k, seed=seed)
+        self.distinct = HyperLogLog(p=hll_p)
+
+    def update(self, values: Any) -> "FeatureSketch":
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        self.count += int(series.size)
+        nulls = series.isna()
+        self.null_count += int(nulls.sum())
+        series = series[~nulls]
+        self.distinct.update(series)
+
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            arr = series.to_numpy(dtype=float)
+            if arr.size:
+                self.numeric_count += int(arr.size)
+                self.total += float(arr.sum())
+                self.total_sq += float(np.dot(arr, arr))
+                self.min = min(self.min, float(arr.min()))
+                self.max = max(self.max, float(arr.max()))
+                self.quantiles.update(arr)
+        return self
+
+    def merge(self, other: "FeatureSketch") -> "FeatureSketch":
+        self.count += other.count
+        self.null_count += other.null_count
+        self.numeric_count += other.numeric_count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.quantiles.merge(other.quantiles)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """Profile in the shape of `FeatureValidator.profile` plus sketch estimates."""
+
+        out: Dict[str, Any] = {
+            "count": self.count,
+            "null_fraction": self.null_count / self.count if self.count else 0.0,
+            "approx_distinct": round(self.distinct.estimate()),
+        }
+        if self.numeric_count:
+            mean = self.total / self.numeric_count
+            var = max(self.total_sq / self.numeric_count - mean * mean, 0.0)
+            q = self.quantiles.quantiles([0.01, 0.25, 0.5, 0.75, 0.99])
+            out.update(
+                {
+                    "min": self.min,
+                    "max": self.max,
+                    "mean": mean,
+                    "std": math.sqrt(var),
+                    "quantiles": dict(zip(["p01", "p25", "p50", "p75", "p99"], map(float, q))),
+                }
+            )
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "null_count": self.null_count,
+            "numeric_count": self.numeric_count,
+            "sum": self.total,
+            "sum_sq": self.total_sq,
+            "min": None if self.numeric_count == 0 else self.min,
+            "max": None if self.numeric_count == 0 else self.max,
+            "kll": self.quantiles.to_dict(),
+            "hll": self.distinct.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeatureSketch":
+        sketch = cls()
+        sketch.count = int(data["count"])
+        sketch.null_count = int(data["null_count"])
+        sketch.numeric_count = int(data["numeric_count"])
+        sketch.total = float(data["sum"])
+        sketch.total_sq = float(data["sum_sq"])
+        sketch.min = math.inf if data["min"] is None else float(data["min"])
+        sketch.max = -math.inf if data["max"] is None else float(data["max"])
+        sketch.quantiles = KLLSketch.from_dict(data["kll"])
+        sketch.distinct = HyperLogLog.from_dict(data["hll"])
+        return sketch
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Mapping, Optional, Sequence
 
 import pandas as pd
 
 from .alerts import AlertSink, NoopAlertSink
-from .drift import DriftResult, population_stability_index
+from .drift import DriftMonitor, DriftResult, population_stability_index
+from .sketches import FeatureSketch
 
 
 @dataclass(frozen=True)
@@ -23,6 +24,8 @@ class FeatureValidator:
     - automatic profiling (simple stats)
     - schema enforcement (required columns + non-null)
     - drift detection via PSI + alert sink
+    - mergeable sketch profiles stored per feature version in the registry,
+      and incremental drift over serving traffic against them
 
     If you want full Great Expectations, integrate it as an optional layer on
     top of this interface.
@@ -77,3 +80,71 @@ class FeatureValidator:
                 payload={"feature": feature_name, "metric": "psi", "value": value, "threshold": threshold},
             )
         return result
+
+    def sketch(self, values: pd.Series, *, base: Optional[FeatureSketch] = None) -> FeatureSketch:
+        """Fold `values` into `base` (or a new sketch)."""
+
+        return (base or FeatureSketch()).update(values)
+
+    def record_sketch(
+        self,
+        *,
+        registry,
+        feature_name: str,
+        feature_version: str,
+        values: pd.Series,
+        merge_with_latest: bool = False,
+    ) -> FeatureSketch:
+        """Sketch `values` and store it via `FeatureRegistry.record_stats`.
+
+        With `merge_with_latest`, the stored sketch for this version is loaded
+        and extended, so profiles can be built incrementally batch by batch.
+        """
+
+        base = None
+        if merge_with_latest:
+            base = self.load_sketch(registry=registry, feature_name=feature_name, feature_version=feature_version)
+        sketch = self.sketch(values, base=base)
+        registry.record_stats(feature_name, feature_version, {"profile": sketch.summary(), "sketch": sketch.to_dict()})
+        return sketch
+
+    def load_sketch(self, *, registry, feature_name: str, feature_version: str) -> Optional[FeatureSketch]:
+        stats = registry.latest_stats(feature_name, feature_version)
+        if not stats or "sketch" not in stats:
+            return None
+        return FeatureSketch.from_dict(stats["sketch"])
+
+    def drift_monitor(
+        self,
+        *,
+        registry,
+        features: Mapping[str, str],
+        bins: int = 10,
+        max_workers: Optional[int] = None,
+    ) -> DriftMonitor:
+        """Build a `DriftMonitor` against stored reference sketches.
+
+        `features` maps feature name -> version. Features without a stored
+        sketch are skipped.
+        """
+
+        references: Dict[str, FeatureSketch] = {}
+        for name, version in features.items():
+            sketch = self.load_sketch(registry=registry, feature_name=name, feature_version=version)
+            if sketch is not None:
+                references[name] = sketch
+        return DriftMonitor(references, bins=bins, max_workers=max_workers)
+
+    def detect_drift_monitor(self, *, monitor: DriftMonitor, threshold: float) -> Dict[str, DriftResult]:
+        """PSI for every monitored feature; alerts like `detect_drift_psi`."""
+
+        results: Dict[str, DriftResult] = {}
+        for name, value in monitor.psi().items():
+            violated = (not pd.isna(value)) and value > threshold
+            results[name] = DriftResult(metric="psi", value=value, threshold=threshold, violated=violated)
+            if violated:
+                self._alert_sink.emit(
+                    alert_type="feature_drift",
+                    payload={"feature": name, "metric": "psi", "value": value, "threshold": threshold},
+                )
+        return results
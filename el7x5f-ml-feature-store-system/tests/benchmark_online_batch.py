@@ -0,0 +1,86 @@
+"""Compare online batch reads: per-entity loop vs pipelined batch vs near-cache.
+
+Uses fakeredis with a simulated network round-trip added to every pipeline
+execute, so the numbers reflect round-trip counts rather than fakeredis speed.
+
+Usage:
+    PYTHONPATH=. python tests/benchmark_online_batch.py --entities 5000 --rtt-ms 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+import fakeredis
+import redis as redis_mod
+
+from repository_after.feature_store.serving import RedisOnlineStore, RedisOnlineStoreSettings
+
+
+def _slow_client(rtt_s: float) -> fakeredis.FakeRedis:
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    real_pipeline = fake.pipeline
+
+    def _pipeline(*args, **kwargs):
+        pipe = real_pipeline(*args, **kwargs)
+        real_execute = pipe.execute
+
+        def _execute(*a, **kw):
+            time.sleep(rtt_s)
+            return real_execute(*a, **kw)
+
+        pipe.execute = _execute
+        return pipe
+
+    fake.pipeline = _pipeline
+    return fake
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--features", type=int, default=8)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--chunk", type=int, default=1000)
+    args = parser.parse_args()
+
+    fake = _slow_client(args.rtt_ms / 1000.0)
+    redis_mod.Redis.from_url = staticmethod(lambda url, decode_responses=True: fake)
+
+    names = [f"f{i}" for i in range(args.features)]
+    keys = [f"user_{i}" for i in range(args.entities)]
+    settings = dict(redis_url="redis://bench/0", batch_chunk_size=args.chunk)
+    store = RedisOnlineStore(RedisOnlineStoreSettings(**settings))
+    cached = RedisOnlineStore(RedisOnlineStoreSettings(**settings, near_cache_ttl_seconds=60))
+
+    now = datetime.now(tz=timezone.utc)
+    for k in keys:
+        store.write_features(feature_set="fs", entity_key=k, values={n: 1.0 for n in names}, event_time=now)
+
+    kwargs = dict(feature_set="fs", feature_names=names, max_age_seconds=3600)
+
+    t0 = time.perf_counter()
+    loop = {k: store.get_features(entity_key=k, **kwargs) for k in keys}
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = store.get_features_batch(entity_keys=keys, **kwargs)
+    t_batch = time.perf_counter() - t0
+    assert batch == loop
+
+    cached.get_features_batch(entity_keys=keys, **kwargs)
+    t0 = time.perf_counter()
+    warm = cached.get_features_batch(entity_keys=keys, **kwargs)
+    t_warm = time.perf_counter() - t0
+    assert warm == loop
+
+    print(f"entities={args.entities} features={args.features} rtt={args.rtt_ms}ms chunk={args.chunk}")
+    print(f"per-entity loop : {t_loop * 1000:9.1f} ms")
+    print(f"pipelined batch : {t_batch * 1000:9.1f} ms  ({t_loop / t_batch:.1f}x)")
+    print(f"warm near-cache : {t_warm * 1000:9.1f} ms  ({t_loop / t_warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Measure online materialization throughput (rows/s).
+
+Compares per-row `write_features` (what `_materialize_online` used to do)
+against `write_features_bulk` with one and several pipelines in flight.
+fakeredis stands in for Redis; every pipeline execute sleeps for a simulated
+round-trip so in-flight overlap is visible without a server.
+
+Usage:
+    PYTHONPATH=. python tests/benchmark_online_bulk_write.py --rows 200000 --rtt-ms 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import timezone
+
+import fakeredis
+import numpy as np
+import pandas as pd
+import redis as redis_mod
+
+from repository_after.feature_store.serving import RedisOnlineStore, RedisOnlineStoreSettings
+
+
+def _slow_client(rtt_s: float) -> fakeredis.FakeRedis:
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    real_pipeline = fake.pipeline
+
+    def _pipeline(*args, **kwargs):
+        pipe = real_pipeline(*args, **kwargs)
+        real_execute = pipe.execute
+
+        def _execute(*a, **kw):
+            time.sleep(rtt_s)
+            return real_execute(*a, **kw)
+
+        pipe.execute = _execute
+        return pipe
+
+    fake.pipeline = _pipeline
+    return fake
+
+
+def _store(rtt_s: float, **settings) -> RedisOnlineStore:
+    fake = _slow_client(rtt_s)
+    redis_mod.Redis.from_url = staticmethod(lambda url, decode_responses=True: fake)
+    return RedisOnlineStore(RedisOnlineStoreSettings(redis_url="redis://bench/0", **settings))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--loop-rows", type=int, default=5_000, help="rows for the (slow) per-row baseline")
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--chunk", type=int, default=5000)
+    parser.add_argument("--in-flight", type=int, default=4)
+    parser.add_argument("--arrow", action="store_true", help="feed a pyarrow.RecordBatch instead of a DataFrame")
+    args = parser.parse_args()
+
+    rtt_s = args.rtt_ms / 1000.0
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(
+        {
+            "user_id": np.arange(args.rows),
+            "event_time": pd.Timestamp("2026-01-01", tz="UTC") + pd.to_timedelta(rng.integers(0, 86400, args.rows), "s"),
+            "score": rng.random(args.rows),
+        }
+    )
+    if args.arrow:
+        import pyarrow as pa
+
+        frame = pa.RecordBatch.from_pandas(frame)
+
+    store = _store(rtt_s)
+    sample = frame.slice(0, args.loop_rows).to_pandas() if args.arrow else frame.iloc[: args.loop_rows]
+    t0 = time.perf_counter()
+    for row in sample.itertuples(index=False):
+        store.write_features(
+            feature_set="fs",
+            entity_key=str(row.user_id),
+            values={"score": row.score},
+            event_time=row.event_time.to_pydatetime().astimezone(timezone.utc),
+        )
+    loop_rate = len(sample) / (time.perf_counter() - t0)
+    print(f"rows={args.rows} rtt={args.rtt_ms}ms chunk={args.chunk}")
+    print(f"per-row write_features     : {loop_rate:12,.0f} rows/s")
+
+    for in_flight in sorted({1, args.in_flight}):
+        store = _store(rtt_s, bulk_chunk_size=args.chunk, bulk_max_in_flight=in_flight)
+        t0 = time.perf_counter()
+        n = store.write_features_bulk(
+            feature_set="fs", frame=frame, entity_keys=["user_id"], event_time_col="event_time", feature_cols=["score"]
+        )
+        rate = n / (time.perf_counter() - t0)
+        print(f"bulk, {in_flight} in flight{'':8}: {rate:12,.0f} rows/s  ({rate / loop_rate:.1f}x)")
+
+    check = store.get_features(feature_set="fs", entity_key="7", feature_names=["score"])
+    assert check["score"] is not None
+
+
+if __name__ == "__main__":
+    main()
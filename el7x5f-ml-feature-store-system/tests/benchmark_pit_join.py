@@ -0,0 +1,115 @@
+"""Benchmark the out-of-core partitioned point-in-time join.
+
+Generates labels and features directly to Parquet in chunks (so the input
+never has to fit in RAM), then streams `point_in_time_join_partitioned`
+over them and reports throughput and peak RSS of the driver and workers.
+The default size is the 100M-label target; use --labels for a quicker run.
+
+Usage:
+    PYTHONPATH=. python tests/benchmark_pit_join.py --labels 100000000 --partitions 512 --workers 8
+    PYTHONPATH=. python tests/benchmark_pit_join.py --labels 2000000 --compare-in-memory
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from repository_after.feature_store.pit_join import point_in_time_join_pandas, point_in_time_join_partitioned
+
+_BASE = pd.Timestamp("2026-01-01", tz="UTC")
+
+
+def _write(path: Path, rows: int, entities: int, chunk: int, seed: int, kind: str) -> None:
+    rng = np.random.default_rng(seed)
+    writer = None
+    try:
+        for start in range(0, rows, chunk):
+            n = min(chunk, rows - start)
+            frame = pd.DataFrame(
+                {
+                    "user_id": rng.integers(0, entities, n),
+                    f"{kind}_time": _BASE + pd.to_timedelta(rng.integers(0, 30 * 86400, n), "s"),
+                    ("y" if kind == "label" else "f"): rng.random(n),
+                }
+            )
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            writer = writer or pq.ParquetWriter(str(path), table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _peak_rss_mb() -> tuple[float, float]:
+    self_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return self_kb / 1024, child_kb / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--labels", type=int, default=100_000_000)
+    parser.add_argument("--features", type=int, default=None, help="defaults to --labels")
+    parser.add_argument("--entities", type=int, default=1_000_000)
+    parser.add_argument("--partitions", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=1_000_000)
+    parser.add_argument("--work-dir", default=None, help="shard directory (needs ~2x input size free)")
+    parser.add_argument("--compare-in-memory", action="store_true")
+    args = parser.parse_args()
+
+    n_features = args.features or args.labels
+    with tempfile.TemporaryDirectory(prefix="pit_bench_", dir=args.work_dir) as tmp:
+        tmp_path = Path(tmp)
+        t0 = time.perf_counter()
+        _write(tmp_path / "labels.parquet", args.labels, args.entities, args.batch_size, 1, "label")
+        _write(tmp_path / "features.parquet", n_features, args.entities, args.batch_size, 2, "feature")
+        print(f"generated labels={args.labels:,} features={n_features:,} in {time.perf_counter() - t0:.1f}s")
+
+        kwargs = dict(
+            entity_keys=["user_id"], label_time_col="label_time", feature_time_col="feature_time", feature_cols=["f"]
+        )
+        t0 = time.perf_counter()
+        rows = matched = 0
+        for batch in point_in_time_join_partitioned(
+            labels=tmp_path / "labels.parquet",
+            features=tmp_path / "features.parquet",
+            num_partitions=args.partitions,
+            max_workers=args.workers,
+            work_dir=str(tmp_path / "work"),
+            batch_size=args.batch_size,
+            **kwargs,
+        ):
+            rows += batch.num_rows
+            matched += batch.num_rows - batch.column("f").null_count
+        elapsed = time.perf_counter() - t0
+        driver_mb, worker_mb = _peak_rss_mb()
+        print(
+            f"partitioned: {rows:,} rows ({matched:,} matched) in {elapsed:.1f}s "
+            f"= {rows / elapsed:,.0f} rows/s; peak RSS driver {driver_mb:,.0f} MB, worker {worker_mb:,.0f} MB"
+        )
+
+        if args.compare_in_memory:
+            t0 = time.perf_counter()
+            out = point_in_time_join_pandas(
+                labels=pd.read_parquet(tmp_path / "labels.parquet"),
+                features=pd.read_parquet(tmp_path / "features.parquet"),
+                **kwargs,
+            )
+            elapsed = time.perf_counter() - t0
+            driver_mb, _ = _peak_rss_mb()
+            print(f"in-memory  : {len(out):,} rows in {elapsed:.1f}s = {len(out) / elapsed:,.0f} rows/s; peak RSS {driver_mb:,.0f} MB")
+            assert len(out) == rows and int(out["f"].notna().sum()) == matched
+
+
+if __name__ == "__main__":
+    main()
@@ -96,3 +96,164 @@ def test_online_store_batch(monkeypatch):
     assert out["u1"]["f1"] == "1"
     assert out["u2"]["f1"] == "2"
     assert out["u3"]["f1"] == 0
+
+
+def test_online_store_batch_pipelines_per_chunk(monkeypatch):
+    import redis as redis_mod
+
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    executes = []
+    real_pipeline = fake.pipeline
+
+    def _pipeline(*args, **kwargs):
+        pipe = real_pipeline(*args, **kwargs)
+        real_execute = pipe.execute
+
+        def _execute(*a, **kw):
+            executes.append(len(pipe.command_stack))
+            return real_execute(*a, **kw)
+
+        pipe.execute = _execute
+        return pipe
+
+    fake.pipeline = _pipeline
+
+    def _from_url(url, decode_responses=True):
+        return fake
+
+    monkeypatch.setattr(redis_mod.Redis, "from_url", staticmethod(_from_url))
+
+    store = RedisOnlineStore(RedisOnlineStoreSettings(redis_url="redis://does-not-matter/0", batch_chunk_size=4))
+    now = datetime.now(tz=timezone.utc)
+    for i in range(10):
+        store.write_features(feature_set="fs", entity_key=f"u{i}", values={"f1": i}, event_time=now)
+    executes.clear()
+
+    keys = [f"u{i}" for i in range(10)] + ["missing"]
+    out = store.get_features_batch(
+        feature_set="fs",
+        entity_keys=keys,
+        feature_names=["f1", "f2"],
+        defaults={"f1": -1, "f2": "na"},
+        max_age_seconds=60,
+    )
+
+    assert list(out) == keys
+    assert out["u3"] == {"f1": "3", "f2": "na"}
+    assert out["missing"] == {"f1": -1, "f2": "na"}
+    # 11 entities in chunks of 4 => 3 round-trips, 2 commands per entity
+    assert executes == [8, 8, 6]
+
+
+def test_online_store_near_cache_staleness_and_invalidation(monkeypatch):
+    import redis as redis_mod
+
+    fake = fakeredis.FakeRedis(decode_responses=True)
+
+    def _from_url(url, decode_responses=True):
+        return fake
+
+    monkeypatch.setattr(redis_mod.Redis, "from_url", staticmethod(_from_url))
+
+    sink = _Sink()
+    store = RedisOnlineStore(
+        RedisOnlineStoreSettings(redis_url="redis://does-not-matter/0", alert_sink=sink, near_cache_ttl_seconds=60)
+    )
+    now = datetime.now(tz=timezone.utc)
+    store.write_features(feature_set="fs", entity_key="u1", values={"f1": 1}, event_time=now - timedelta(seconds=30))
+
+    kwargs = dict(feature_set="fs", entity_key="u1", feature_names=["f1"], defaults={"f1": 0})
+    assert store.get_features(**kwargs, max_age_seconds=60) == {"f1": "1"}
+
+    # Served from the near-cache: a write behind the store's back is not seen
+    fake.hset("fs:fs:u1:values", mapping={"f1": "999"})
+    assert store.get_features(**kwargs, max_age_seconds=60) == {"f1": "1"}
+
+    # Staleness is still judged against the cached event time
+    assert store.get_features(**kwargs, max_age_seconds=10) == {"f1": 0}
+    assert sink.events and sink.events[-1][0] == "feature_stale"
+
+    # Writes through the store invalidate the cached entry
+    store.write_features(feature_set="fs", entity_key="u1", values={"f1": 2}, event_time=now)
+    assert store.get_features(**kwargs, max_age_seconds=10) == {"f1": "2"}
+
+
+def test_online_store_bulk_write_matches_per_row(monkeypatch):
+    import pandas as pd
+    import redis as redis_mod
+
+    fake = fakeredis.FakeRedis(decode_responses=True)
+
+    def _from_url(url, decode_responses=True):
+        return fake
+
+    monkeypatch.setattr(redis_mod.Redis, "from_url", staticmethod(_from_url))
+
+    store = RedisOnlineStore(
+        RedisOnlineStoreSettings(redis_url="redis://does-not-matter/0", bulk_chunk_size=3, bulk_max_in_flight=2)
+    )
+    frame = pd.DataFrame(
+        {
+            "user_id": [1, 2, 3, 1, 4, 5, 6],
+            "region": ["eu", "eu", "us", "eu", "us", "us", "eu"],
+            "ts": pd.to_datetime(["2026-01-01T00:00:00"] * 3 + ["2026-01-02T00:00:00"] * 4),
+            "f1": [1.5, 2.0, None, 9.5, 4.0, 5.0, 6.0],
+        }
+    )
+
+    written = store.write_features_bulk(
+        feature_set="fs", frame=frame, entity_keys=["user_id", "region"], event_time_col="ts", feature_cols=["f1"]
+    )
+
+    assert written == 6
+    out = store.get_features_batch(
+        feature_set="fs", entity_keys=["1|eu", "3|us", "6|eu"], feature_names=["f1"], defaults={"f1": -1}
+    )
+    # Later duplicate wins; NaN is stored as str(nan) like write_features(nan)
+    assert out == {"1|eu": {"f1": "9.5"}, "3|us": {"f1": "nan"}, "6|eu": {"f1": "6.0"}}
+    expected_ts = int(datetime(2026, 1, 2, tzinfo=timezone.utc).timestamp())
+    assert fake.hget("fs:fs:1|eu:meta", "event_time") == str(expected_ts)
+
+
+def test_online_store_bulk_write_stores_same_strings_as_per_row(monkeypatch):
+    import pandas as pd
+    import pyarrow as pa
+    import redis as redis_mod
+
+    fake = fakeredis.FakeRedis(decode_responses=True)
+
+    def _from_url(url, decode_responses=True):
+        return fake
+
+    monkeypatch.setattr(redis_mod.Redis, "from_url", staticmethod(_from_url))
+
+    store = RedisOnlineStore(RedisOnlineStoreSettings(redis_url="redis://does-not-matter/0", bulk_chunk_size=2))
+    frame = pd.DataFrame(
+        {
+            "user_id": ["u1", "u2", "u3"],
+            "ts": pd.to_datetime(["2026-01-01T00:00:00"] * 3),
+            "f_float": [1.5, float("nan"), 3.0],
+            "f_int": pd.array([1, None, 3], dtype="Int64"),
+            "f_obj": ["a", None, "c"],
+        }
+    )
+    cols = ["f_float", "f_int", "f_obj"]
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    for rec in frame.to_dict("records"):
+        store.write_features(
+            feature_set="row", entity_key=rec["user_id"], values={c: rec[c] for c in cols}, event_time=now
+        )
+    bulk = dict(entity_keys=["user_id"], event_time_col="ts", feature_cols=cols)
+    store.write_features_bulk(feature_set="pd", frame=frame, **bulk)
+    # Arrow keeps integers with nulls as integers instead of upcasting to float
+    arrow = pa.Table.from_pandas(frame)
+    store.write_features_bulk(feature_set="pa", frame=arrow, **bulk)
+
+    for ek in ["u1", "u2", "u3"]:
+        per_row = fake.hgetall(f"fs:row:{ek}:values")
+        assert fake.hgetall(f"fs:pd:{ek}:values") == per_row
+    assert fake.hgetall("fs:row:u1:values") == {"f_float": "1.5", "f_int": "1", "f_obj": "a"}
+    assert fake.hgetall("fs:row:u2:values") == {"f_float": "nan", "f_int": "", "f_obj": ""}
+    assert fake.hgetall("fs:pa:u1:values") == {"f_float": "1.5", "f_int": "1", "f_obj": "a"}
+    assert fake.hgetall("fs:pa:u2:values")["f_int"] == ""
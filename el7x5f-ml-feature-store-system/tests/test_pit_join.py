@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pandas as pd
+import pytest
 
 from feature_store.pit_join import point_in_time_join_pandas
 
@@ -50,3 +51,118 @@ def test_point_in_time_join_prevents_leakage_future_feature_is_not_used():
     )
 
     assert pd.isna(out.loc[0, "f"])
+
+
+def test_partitioned_join_matches_in_memory_join(tmp_path):
+    pytest.importorskip("pyarrow")
+    import numpy as np
+
+    from feature_store.pit_join import point_in_time_join_partitioned
+
+    rng = np.random.default_rng(0)
+    base = pd.Timestamp("2026-01-01", tz="UTC")
+    labels = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 50, 2000),
+            "region": rng.choice(["eu", "us"], 2000),
+            "label_time": base + pd.to_timedelta(rng.integers(0, 10_000, 2000), "s"),
+            "y": rng.integers(0, 2, 2000),
+        }
+    )
+    features = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 60, 3000),
+            "region": rng.choice(["eu", "us"], 3000),
+            "feature_time": base + pd.to_timedelta(rng.permutation(10_000)[:3000], "s"),
+            "f": rng.random(3000),
+        }
+    )
+    kwargs = dict(
+        entity_keys=["user_id", "region"], label_time_col="label_time", feature_time_col="feature_time", feature_cols=["f"]
+    )
+
+    batches = list(
+        point_in_time_join_partitioned(
+            labels=labels,
+            features=[features.iloc[:1000], features.iloc[1000:]],
+            num_partitions=4,
+            max_workers=2,
+            work_dir=str(tmp_path),
+            batch_size=700,
+            **kwargs,
+        )
+    )
+    got = pd.concat([b.to_pandas() for b in batches]).sort_values(["user_id", "region", "label_time", "y"])
+    expected = point_in_time_join_pandas(labels=labels, features=features, **kwargs).sort_values(
+        ["user_id", "region", "label_time", "y"]
+    )
+
+    pd.testing.assert_frame_equal(got.reset_index(drop=True), expected.reset_index(drop=True))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_partitioned_join_handles_dtype_drift_between_chunks(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    from feature_store.pit_join import point_in_time_join_partitioned
+
+    base = pd.Timestamp("2026-01-01", tz="UTC")
+    labels = pd.DataFrame(
+        {
+            "user_id": list(range(20)),
+            "label_time": [base + pd.Timedelta(hours=1)] * 20,
+        }
+    )
+    # The second chunk has a NaN, so its ids and counts arrive as float64
+    first = pd.DataFrame({"user_id": list(range(10)), "feature_time": [base] * 10, "f": list(range(10))})
+    second = pd.DataFrame(
+        {
+            "user_id": [float(i) for i in range(10, 20)],
+            "feature_time": [base] * 10,
+            "f": [None] + [float(i) for i in range(11, 20)],
+        }
+    )
+    kwargs = dict(
+        entity_keys=["user_id"], label_time_col="label_time", feature_time_col="feature_time", feature_cols=["f"]
+    )
+
+    batches = list(
+        point_in_time_join_partitioned(
+            labels=labels, features=[first, second], num_partitions=4, max_workers=1, work_dir=str(tmp_path), **kwargs
+        )
+    )
+    got = pd.concat([b.to_pandas() for b in batches]).sort_values("user_id").reset_index(drop=True)
+    expected = point_in_time_join_pandas(labels=labels, features=pd.concat([first, second]), **kwargs)
+
+    # The in-memory join realigns int ids to float64; the partitioned one keeps the label dtype
+    pd.testing.assert_frame_equal(got, expected.sort_values("user_id").reset_index(drop=True), check_dtype=False)
+    assert got["f"].notna().sum() == 19
+
+
+def test_partitioned_join_batches_share_one_schema(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+
+    from feature_store.pit_join import point_in_time_join_partitioned
+
+    base = pd.Timestamp("2026-01-01", tz="UTC")
+    labels = pd.DataFrame({"user_id": list(range(40)), "label_time": [base + pd.Timedelta(hours=1)] * 40})
+    # Only some shards get features, and those arrive with float64 ids
+    features = pd.DataFrame({"user_id": [0.0, 1.0], "feature_time": [base] * 2, "f": [1, 2], "g": ["a", "b"]})
+    kwargs = dict(
+        entity_keys=["user_id"], label_time_col="label_time", feature_time_col="feature_time", feature_cols=["f", "g"]
+    )
+
+    batches = list(
+        point_in_time_join_partitioned(
+            labels=labels, features=features, num_partitions=8, max_workers=1, work_dir=str(tmp_path), **kwargs
+        )
+    )
+    assert len(batches) > 1
+    table = pa.Table.from_batches(batches)
+    assert table.schema.names == ["user_id", "label_time", "f", "g"]
+    assert table.schema.field("user_id").type == pa.int64()
+    assert table.schema.field("f").type == pa.int64()
+    assert table.schema.field("g").type == pa.string()
+    got = table.to_pandas().sort_values("user_id").reset_index(drop=True)
+    assert got["user_id"].tolist() == list(range(40))
+    assert got["f"].tolist()[:2] == [1, 2] and got["f"].isna().sum() == 38
@@ -90,3 +90,108 @@ def test_stream_build_app_requires_faust(monkeypatch):
 
     with pytest.raises(RuntimeError, match="Faust is required"):
         proc.build_app(broker="kafka://localhost:9092", specs=specs, online_store=_DummyOnline())
+
+
+def test_materialize_online_uses_bulk_frames():
+    from datetime import datetime
+
+    import pandas as pd
+
+    f1 = feature(
+        name="f1",
+        entity_keys=["user_id"],
+        event_timestamp="ts",
+        source=FeatureSource(name="events", kind="sql", identifier="events"),
+        transform=SQLTransform(sql="select 1 as f1"),
+        description="f1",
+        owner="team",
+    )
+
+    class _Row(dict):
+        def __iter__(self):
+            return iter(self.values())
+
+    rows = [_Row(user_id=i, ts=datetime(2026, 1, 1), f1=float(i)) for i in range(5)]
+
+    class _RDD:
+        def foreachPartition(self, fn):
+            fn(iter(rows[:3]))
+            fn(iter(rows[3:]))
+
+    class _DF:
+        rdd = _RDD()
+
+        def select(self, *cols):
+            assert list(cols) == ["user_id", "ts", "f1"]
+            return self
+
+    class _Store:
+        def __init__(self):
+            self.frames = []
+
+        def write_features_bulk(self, *, feature_set, frame, entity_keys, event_time_col, feature_cols):
+            self.frames.append(frame)
+            return len(frame)
+
+    store = _Store()
+    proc = SparkBatchProcessor(SparkBatchSettings(online_bulk_rows=2))
+    proc._materialize_online(df=_DF(), feature=f1, online_store=store, feature_set="fs")
+
+    assert [len(f) for f in store.frames] == [2, 1, 2]
+    assert pd.concat(store.frames)["f1"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_materialize_online_bulk_reads_back_like_per_row(monkeypatch):
+    from datetime import datetime
+
+    import fakeredis
+    import redis as redis_mod
+
+    from repository_after.feature_store.serving import RedisOnlineStore, RedisOnlineStoreSettings
+
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_mod.Redis, "from_url", staticmethod(lambda url, decode_responses=True: fake))
+
+    f1 = feature(
+        name="f1",
+        entity_keys=["user_id", "day"],
+        event_timestamp="ts",
+        source=FeatureSource(name="events", kind="sql", identifier="events"),
+        transform=SQLTransform(sql="select 1 as f1"),
+        description="f1",
+        owner="team",
+    )
+
+    class _Row(dict):
+        def __iter__(self):
+            return iter(self.values())
+
+    ts = datetime(2026, 1, 1)
+    day = datetime(2024, 1, 1, 12, 30)
+    # Nulls in an int key and an int feature must not upcast the rest to float
+    rows = [
+        _Row(user_id=1, day=day, ts=ts, f1=7),
+        _Row(user_id=2, day=day, ts=ts, f1=None),
+        _Row(user_id=None, day=day, ts=ts, f1=3),
+    ]
+
+    class _DF:
+        class rdd:
+            @staticmethod
+            def foreachPartition(fn):
+                fn(iter(rows))
+
+        def select(self, *cols):
+            return self
+
+    store = RedisOnlineStore(RedisOnlineStoreSettings(redis_url="redis://does-not-matter/0"))
+    SparkBatchProcessor(SparkBatchSettings())._materialize_online(
+        df=_DF(), feature=f1, online_store=store, feature_set="fs"
+    )
+
+    def read(user_id):
+        return store.get_features(feature_set="fs", entity_key=f"{user_id}|{day}", feature_names=["f1"])
+
+    assert read(1) == {"f1": "7"}
+    assert read(2) == {"f1": ""}
+    assert read(None) == {"f1": "3"}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from datetime import datetime, timezone
 
 from repository_after.feature_store.serving import (
@@ -69,3 +70,142 @@ def test_redis_timeseries_write_and_get(monkeypatch):
         max_age_seconds=None,
     )
     assert out["f1"] == 123 or out["f1"] == "123"
+
+
+def test_redis_timeseries_batch_single_round_trip(monkeypatch):
+    import redis as redis_mod
+
+    ts_state: dict[str, tuple[int, object]] = {}
+    executes = []
+
+    class FakePipeline:
+        def __init__(self, client):
+            self._client = client
+            self._ops = []
+
+        def execute_command(self, cmd, *args):
+            self._ops.append((cmd, args))
+            return self
+
+        def execute(self):
+            executes.append(len(self._ops))
+            out = [self._client.execute_command(cmd, *args) for cmd, args in self._ops]
+            self._ops.clear()
+            return out
+
+    class FakeRedis:
+        def pipeline(self):
+            return FakePipeline(self)
+
+        def execute_command(self, cmd, *args):
+            cmd_u = str(cmd).upper()
+            if cmd_u == "TS.ADD":
+                ts_state[str(args[0])] = (int(args[1]), args[2])
+                return args[1]
+            if cmd_u == "TS.GET":
+                return ts_state.get(str(args[0]))
+            raise NotImplementedError(cmd_u)
+
+    fake = FakeRedis()
+
+    def _from_url(url, decode_responses=True):
+        return fake
+
+    monkeypatch.setattr(redis_mod.Redis, "from_url", staticmethod(_from_url))
+
+    store = RedisTimeSeriesOnlineStore(
+        RedisTimeSeriesOnlineStoreSettings(redis_url="redis://x/0", near_cache_ttl_seconds=60)
+    )
+    now = datetime.now(tz=timezone.utc)
+    for i in range(3):
+        store.write_features(feature_set="fs", entity_key=f"u{i}", values={"f1": i, "f2": -i}, event_time=now)
+
+    keys = ["u0", "u1", "u2", "u9"]
+    out = store.get_features_batch(
+        feature_set="fs", entity_keys=keys, feature_names=["f1", "f2"], defaults={"f1": 0, "f2": 0}
+    )
+    assert out["u2"] == {"f1": 2, "f2": -2}
+    assert out["u9"] == {"f1": 0, "f2": 0}
+    assert executes == [8]
+
+    # The second read of the cached entities never reaches Redis
+    store.get_features_batch(feature_set="fs", entity_keys=keys[:3], feature_names=["f1", "f2"])
+    assert executes == [8]
+
+
+def test_redis_timeseries_bulk_write_retries_only_failed_samples(monkeypatch):
+    import pandas as pd
+    import redis as redis_mod
+    from redis.exceptions import ResponseError
+
+    # Series must be created first, and re-adding an existing sample fails
+    # (DUPLICATE_POLICY block), so replaying samples that landed would raise.
+    series: dict[str, dict[int, object]] = {"fs:fs:u1:ts:f1": {}}
+    pipelines = []
+
+    class FakePipeline:
+        def __init__(self, client, transaction):
+            self._client = client
+            self._ops = []
+            pipelines.append(transaction)
+
+        def execute_command(self, cmd, *args):
+            self._ops.append((cmd, args))
+            return self
+
+        def execute(self, raise_on_error=True):
+            out = []
+            for cmd, args in self._ops:
+                try:
+                    out.append(self._client.execute_command(cmd, *args))
+                except ResponseError as e:
+                    if raise_on_error:
+                        raise
+                    out.append(e)
+            self._ops.clear()
+            return out
+
+    class FakeRedis:
+        def pipeline(self, transaction=True):
+            return FakePipeline(self, transaction)
+
+        def execute_command(self, cmd, *args):
+            cmd_u = str(cmd).upper()
+            if cmd_u == "TS.CREATE":
+                series.setdefault(str(args[0]), {})
+                return "OK"
+            if cmd_u == "TS.ADD":
+                key, ts_ms = str(args[0]), int(args[1])
+                if key not in series:
+                    raise ResponseError("ERR TSDB: the key does not exist")
+                if ts_ms in series[key]:
+                    raise ResponseError("ERR TSDB: Error at upsert, update is not supported in BLOCK mode")
+                series[key][ts_ms] = args[2]
+                return ts_ms
+            raise NotImplementedError(cmd_u)
+
+    fake = FakeRedis()
+
+    def _from_url(url, decode_responses=True):
+        return fake
+
+    monkeypatch.setattr(redis_mod.Redis, "from_url", staticmethod(_from_url))
+
+    store = RedisTimeSeriesOnlineStore(RedisTimeSeriesOnlineStoreSettings(redis_url="redis://x/0", bulk_chunk_size=10))
+    frame = pd.DataFrame(
+        {
+            "user_id": ["u1", "u2"],
+            "ts": pd.to_datetime(["2026-01-01T00:00:00", "2026-01-01T00:00:01"]),
+            "f1": [1.0, None],
+        }
+    )
+
+    written = store.write_features_bulk(
+        feature_set="fs", frame=frame, entity_keys=["user_id"], event_time_col="ts", feature_cols=["f1"]
+    )
+    assert written == 2
+    assert pipelines == [False]
+    assert series["fs:fs:u1:ts:f1"] == {1767225600000: 1.0}
+    # The missing series was created and only its sample retried
+    (value,) = series["fs:fs:u2:ts:f1"].values()
+    assert math.isnan(float(value))
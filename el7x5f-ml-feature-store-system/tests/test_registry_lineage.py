@@ -97,3 +97,93 @@ def test_registry_upsert_replaces_lineage(tmp_path):
 
     g = reg.lineage_graph()
     assert not g.has_edge("a", "b")
+
+
+def test_registry_cache_serves_reads_until_revision_changes(tmp_path):
+    from sqlalchemy import event
+
+    db_path = tmp_path / "registry.db"
+    reg = FeatureRegistry(RegistrySettings(database_url=f"sqlite+pysqlite:///{db_path}"))
+    reg.create_schema()
+
+    src = FeatureSource(name="events", kind="sql", identifier="events")
+
+    def make(name, depends_on=(), description="d"):
+        return feature(
+            name=name,
+            entity_keys=["user_id"],
+            event_timestamp="event_time",
+            source=src,
+            transform=SQLTransform(sql="select 1"),
+            description=description,
+            owner="team",
+            version="v1",
+            depends_on=list(depends_on),
+        )
+
+    reg.register(make("a"))
+    reg.register(make("b", depends_on=["a"]))
+
+    statements = []
+    event.listen(reg.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert reg.get("b").depends_on == ("a",)
+    assert len(reg.list_features()) == 2
+    assert reg.lineage_graph().has_edge("a", "b")
+    warm = len(statements)
+    assert warm > 0
+
+    # Hot path: nothing changed, so each read only checks the stored revision
+    for _ in range(3):
+        reg.get("b")
+        reg.list_features()
+        reg.lineage_graph().add_edge("x", "y")  # callers get a private copy
+    assert len(statements) == warm + 9
+    assert all("registry_revision" in sql for sql in statements[warm:])
+    assert not reg.lineage_graph().has_edge("x", "y")
+
+    revision = reg.revision
+    reg.register(make("b", description="b2"))
+    assert reg.revision > revision
+    assert reg.get("b").metadata.description == "b2"
+    assert not reg.lineage_graph().has_edge("a", "b")
+
+    revision = reg.revision
+    reg.set_processing_state(feature_name="b", feature_version="v1", state_key="wm", state={"w": 1})
+    assert reg.revision > revision
+
+
+def test_registry_cache_sees_writes_from_another_instance(tmp_path):
+    db_url = f"sqlite+pysqlite:///{tmp_path / 'registry.db'}"
+    api = FeatureRegistry(RegistrySettings(database_url=db_url))
+    api.create_schema()
+    # A second registry on the same DB, e.g. a Spark job or the CLI
+    job = FeatureRegistry(RegistrySettings(database_url=db_url))
+
+    src = FeatureSource(name="events", kind="sql", identifier="events")
+
+    def make(name, depends_on=(), description="d"):
+        return feature(
+            name=name,
+            entity_keys=["user_id"],
+            event_timestamp="event_time",
+            source=src,
+            transform=SQLTransform(sql="select 1"),
+            description=description,
+            owner="team",
+            version="v1",
+            depends_on=list(depends_on),
+        )
+
+    api.register(make("a"))
+    assert [f["name"] for f in api.list_features()] == ["a"]
+    assert api.get("a").metadata.description == "d"
+    assert api.lineage_graph().number_of_edges() == 0
+
+    job.register(make("b", depends_on=["a"]))
+    job.register(make("a", description="a2"))
+
+    assert sorted(f["name"] for f in api.list_features()) == ["a", "b"]
+    assert api.get("a").metadata.description == "a2"
+    assert api.lineage_graph().has_edge("a", "b")
+    assert api.revision == job.revision
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import fakeredis
+import numpy as np
+import pandas as pd
+import pytest
+
+from repository_after.feature_store.sdk_pandas import PandasFeatureFetcher
+from repository_after.feature_store.serving import RedisOnlineStore, RedisOnlineStoreSettings
+
+
+@pytest.fixture()
+def fetcher(monkeypatch):
+    import redis as redis_mod
+
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_mod.Redis, "from_url", staticmethod(lambda url, decode_responses=True: fake))
+
+    store = RedisOnlineStore(RedisOnlineStoreSettings(redis_url="redis://x/0"))
+    now = datetime.now(tz=timezone.utc)
+    for i in range(10):
+        store.write_features(feature_set="fs", entity_key=f"u{i}", values={"a": i, "b": i * 0.5}, event_time=now)
+
+    calls = []
+    real_batch = store.get_features_batch
+
+    def _batch(**kwargs):
+        calls.append(len(kwargs["entity_keys"]))
+        return real_batch(**kwargs)
+
+    store.get_features_batch = _batch
+    return PandasFeatureFetcher(online_store=store, feature_set="fs"), calls
+
+
+def test_fetch_array_one_call_in_entity_order(fetcher):
+    fetcher, calls = fetcher
+    out = fetcher.fetch_array(entity_keys=["u3", "missing", "u1"], feature_names=["a", "b"], defaults={"a": 0})
+
+    assert calls == [3]
+    assert out.dtype == np.float32 and out.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(out[0], [3.0, 1.5])
+    assert out[1, 0] == 0 and np.isnan(out[1, 1])
+    np.testing.assert_array_equal(out[2], [1.0, 0.5])
+
+
+def test_batched_dataset_yields_prefetched_contiguous_batches(fetcher):
+    fetcher, calls = fetcher
+    torch = pytest.importorskip("torch")
+    from torch.utils.data import DataLoader
+
+    from repository_after.feature_store.sdk_torch import BatchedFeatureStoreDataset, FeatureStoreDataset
+
+    entities = pd.DataFrame({"user_id": [f"u{i}" for i in range(10)]})
+    ds = BatchedFeatureStoreDataset(
+        entities=entities, entity_key_col="user_id", feature_names=["a", "b"], fetcher=fetcher, batch_size=4
+    )
+
+    batches = list(DataLoader(ds, batch_size=None))
+    assert len(ds) == 3 and [b.shape for b in batches] == [(4, 2), (4, 2), (2, 2)]
+    assert all(b.dtype == torch.float32 and b.is_contiguous() for b in batches)
+    assert torch.cat(batches)[:, 0].tolist() == list(range(10))
+    assert calls == [4, 4, 2]
+
+    # Map-style dataset: DataLoader auto-batching fetches each mini-batch once
+    calls.clear()
+    ds_map = FeatureStoreDataset(entities=entities, entity_key_col="user_id", feature_names=["a", "b"], fetcher=fetcher)
+    loaded = list(DataLoader(ds_map, batch_size=5))
+    assert calls == [5, 5]
+    assert loaded[1][:, 1].tolist() == [2.5, 3.0, 3.5, 4.0, 4.5]
@@ -40,3 +40,88 @@ def test_drift_psi_alert():
     assert res.metric == "psi"
     assert res.violated is True
     assert len(alerts.alerts) == 1
+
+
+def test_feature_sketch_merges_and_roundtrips():
+    import json
+
+    import numpy as np
+
+    from repository_after.feature_store.sketches import FeatureSketch
+
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.normal(size=50_000))
+    values[::100] = None
+
+    left = FeatureSketch(seed=1).update(values[:25_000])
+    right = FeatureSketch(seed=2).update(values[25_000:])
+    merged = FeatureSketch.from_dict(json.loads(json.dumps(left.merge(right).to_dict())))
+
+    summary = merged.summary()
+    assert summary["count"] == 50_000
+    assert summary["null_fraction"] == 0.01
+    assert abs(summary["mean"] - values.mean()) < 1e-9
+    assert abs(summary["approx_distinct"] - 49_500) / 49_500 < 0.05
+    qs = [0.1, 0.5, 0.9]
+    assert np.abs(merged.quantiles.quantiles(qs) - values.dropna().quantile(qs).to_numpy()).max() < 0.05
+
+
+def test_hyperloglog_hashes_numbers_by_value():
+    import numpy as np
+
+    from repository_after.feature_store.sketches import HyperLogLog
+
+    ints = HyperLogLog()
+    ints.update(pd.Series(np.arange(5_000, dtype=np.int64)))
+    # Same ids after a NaN upcast them to float in another batch
+    floats = HyperLogLog()
+    floats.update(pd.Series(np.append(np.arange(5_000, dtype=np.float64), np.nan)))
+    mixed = HyperLogLog()
+    mixed.update(pd.Series([0, 1.0, 2], dtype=object))
+
+    assert np.array_equal(ints.registers, floats.registers)
+    assert abs(ints.merge(floats).estimate() - 5_000) / 5_000 < 0.05
+    assert round(mixed.estimate()) == 3
+
+
+def test_incremental_drift_against_registry_sketches(tmp_path):
+    import numpy as np
+
+    from repository_after.feature_store.drift import population_stability_index
+    from repository_after.feature_store.registry import FeatureRegistry, RegistrySettings
+
+    reg = FeatureRegistry(RegistrySettings(database_url=f"sqlite+pysqlite:///{tmp_path / 'registry.db'}"))
+    reg.create_schema()
+    alerts = RecordingAlertSink()
+    v = FeatureValidator(alert_sink=alerts)
+
+    # Binary feature: small enough that the sketch is exact
+    training = pd.Series([0] * 100 + [1] * 100)
+    loads = []
+    latest_stats = reg.latest_stats
+    reg.latest_stats = lambda *args: loads.append(args) or latest_stats(*args)
+    v.record_sketch(registry=reg, feature_name="f", feature_version="v1", values=training[:120])
+    assert loads == []  # the stored sketch is only read when merging
+    v.record_sketch(registry=reg, feature_name="f", feature_version="v1", values=training[120:], merge_with_latest=True)
+    rng = np.random.default_rng(0)
+    stable = pd.Series(rng.normal(size=20_000))
+    v.record_sketch(registry=reg, feature_name="g", feature_version="v1", values=stable)
+
+    monitor = v.drift_monitor(registry=reg, features={"f": "v1", "g": "v1", "unknown": "v1"}, max_workers=2)
+    assert sorted(monitor.features) == ["f", "g"]
+
+    serving_f = pd.Series([0] * 10 + [1] * 190)
+    serving_g = pd.Series(rng.normal(size=20_000))
+    monitor.update({"f": serving_f[:50], "g": serving_g[:10_000]})
+    monitor.update(pd.DataFrame({"f": serving_f[50:].to_numpy(), "g": serving_g[10_000:10_150].to_numpy()}))
+    pool = monitor._pool
+    monitor.update({"g": serving_g[10_150:]})
+    assert pool is not None and monitor._pool is pool
+
+    results = v.detect_drift_monitor(monitor=monitor, threshold=0.05)
+    exact = population_stability_index(expected=training, actual=serving_f)
+    assert abs(results["f"].value - exact) < 1e-9
+    assert results["f"].violated is True and results["g"].violated is False
+    assert [a[1]["feature"] for a in alerts.alerts] == ["f"]
+    monitor.close()
+    assert monitor._pool is None
@@ -1,8 +1,21 @@
 import re
+import os
+import json
+import random
+import hashlib
+import mmap
 import time
 import math
 import heapq
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict, Counter
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 class Document:
     def __init__(self, doc_id, title, content, tags=None):
@@ -13,6 +26,716 @@ class Document:
         self.word_count = 0
         self.indexed_at = None
 
+def _encode_varint(value, out):
+    # LEB128: 7 bits per byte, high bit set on every byte except the last
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varints(buf, start=0, end=None):
+    # Decode every varint in buf[start:end] into a list of ints
+    values = []
+    value = 0
+    shift = 0
+    for byte in memoryview(buf)[start:end]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = 0
+            shift = 0
+    return values
+
+
+# Packed PostingList header: postings, last doc, doc bytes, position bytes,
+# skip blocks, max weight
+_POSTING_HEADER = struct.Struct('<QQQQQd')
+
+
+class PostingList:
+    # Compact, append-only posting list for a single term.
+    # Doc numbers are dense internal ints kept in increasing order and stored
+    # as delta + varint bytes. Every BLOCK_SIZE postings the doc number is
+    # written absolute and recorded in a skip table, so readers can seek
+    # without decoding from the start. Term frequencies live in a parallel
+    # array and positions are delta + varint encoded in a separate buffer.
+    # Indexing a PostingList returns the legacy {'doc_id', 'tf', 'pos'} dict,
+    # built on demand from the shared doc-number -> doc_id table.
+    # For top-k pruning each list tracks the largest tf/doc_len weight overall
+    # and per block (block-max), using the shared doc-number -> length table.
+    BLOCK_SIZE = 128
+
+    __slots__ = ("_id_table", "_doc_lens", "_docs", "_tfs", "_positions", "_pos_offsets",
+                 "_skip_docs", "_skip_offsets", "_block_max", "_max_weight", "_last", "_len")
+
+    def __init__(self, id_table, doc_lens=None):
+        self._id_table = id_table
+        self._doc_lens = doc_lens
+        self._docs = bytearray()
+        self._tfs = array('I')
+        self._positions = bytearray()
+        self._pos_offsets = array('I')
+        self._skip_docs = array('I')
+        self._skip_offsets = array('I')
+        self._block_max = array('d')
+        self._max_weight = 0.0
+        self._last = 0
+        self._len = 0
+
+    def append(self, doc_num, tf, positions):
+        if self._len and doc_num <= self._last:
+            raise ValueError("postings must be appended in increasing doc order")
+
+        doc_len = self._doc_lens[doc_num] if self._doc_lens is not None else 1
+        weight = tf / doc_len if doc_len else 0.0
+        if weight > self._max_weight:
+            self._max_weight = weight
+
+        if self._len % self.BLOCK_SIZE == 0:
+            self._skip_docs.append(doc_num)
+            self._skip_offsets.append(len(self._docs))
+            self._block_max.append(weight)
+            _encode_varint(doc_num, self._docs)
+        else:
+            if weight > self._block_max[-1]:
+                self._block_max[-1] = weight
+            _encode_varint(doc_num - self._last, self._docs)
+        self._last = doc_num
+        self._len += 1
+
+        self._tfs.append(tf)
+        self._pos_offsets.append(len(self._positions))
+        prev = 0
+        for pos in positions:
+            _encode_varint(pos - prev, self._positions)
+            prev = pos
+
+    def __len__(self):
+        return self._len
+
+    def doc_nums(self):
+        # All doc numbers in increasing order
+        values = _decode_varints(self._docs)
+        block = self.BLOCK_SIZE
+        for i in range(1, len(values)):
+            if i % block:
+                values[i] += values[i - 1]
+        return values
+
+    @property
+    def max_weight(self):
+        # Upper bound of tf/doc_len over every posting in the list
+        return self._max_weight
+
+    def block_count(self):
+        return len(self._skip_docs)
+
+    def block_doc_nums(self, block):
+        # Decoded doc numbers of one skip block
+        start = self._skip_offsets[block]
+        end = self._skip_offsets[block + 1] if block + 1 < len(self._skip_offsets) else None
+        values = _decode_varints(self._docs, start, end)
+        for i in range(1, len(values)):
+            values[i] += values[i - 1]
+        return values
+
+    def pairs(self):
+        # (doc_num, tf) pairs in doc order; the fast path used by scoring
+        return zip(self.doc_nums(), self._tfs)
+
+    def __iter__(self):
+        # Legacy posting dicts, decoded on demand
+        id_table = self._id_table
+        for i, doc_num in enumerate(self.doc_nums()):
+            yield {'doc_id': id_table[doc_num], 'tf': self._tfs[i], 'pos': self.positions(i)}
+
+    def tfs(self):
+        return self._tfs
+
+    def positions(self, i):
+        # Decoded positions of the i-th posting
+        start = self._pos_offsets[i]
+        end = self._pos_offsets[i + 1] if i + 1 < self._len else len(self._positions)
+        values = _decode_varints(self._positions, start, end)
+        for j in range(1, len(values)):
+            values[j] += values[j - 1]
+        return values
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("posting index out of range")
+
+        block, offset = divmod(i, self.BLOCK_SIZE)
+        start = self._skip_offsets[block]
+        end = self._skip_offsets[block + 1] if block + 1 < len(self._skip_offsets) else None
+        deltas = _decode_varints(self._docs, start, end)
+        doc_num = sum(deltas[:offset + 1])
+        return {
+            'doc_id': self._id_table[doc_num],
+            'tf': self._tfs[i],
+            'pos': self.positions(i),
+        }
+
+    def remove(self, doc_num):
+        # Drop the posting for doc_num by re-encoding the list
+        doc_nums = self.doc_nums()
+        try:
+            idx = doc_nums.index(doc_num)
+        except ValueError:
+            return False
+
+        entries = [(d, self._tfs[i], self.positions(i))
+                   for i, d in enumerate(doc_nums) if i != idx]
+        self.__init__(self._id_table, self._doc_lens)
+        for d, tf, positions in entries:
+            self.append(d, tf, positions)
+        return True
+
+    def nbytes(self):
+        # Bytes held by the encoded buffers and arrays
+        return (len(self._docs) + len(self._positions)
+                + self._tfs.itemsize * len(self._tfs)
+                + self._pos_offsets.itemsize * len(self._pos_offsets)
+                + self._skip_docs.itemsize * len(self._skip_docs)
+                + self._skip_offsets.itemsize * len(self._skip_offsets)
+                + self._block_max.itemsize * len(self._block_max))
+
+    def cursor(self):
+        return _PostingCursor(self)
+
+    def _pack(self):
+        # On-disk form used by segments. Every section is padded to 8 bytes so
+        # a mapped copy can be cast in place by _from_buffer.
+        out = bytearray(_POSTING_HEADER.pack(self._len, self._last, len(self._docs),
+                                             len(self._positions), len(self._skip_docs),
+                                             self._max_weight))
+        for section in (self._docs, self._positions, self._tfs, self._pos_offsets,
+                        self._skip_docs, self._skip_offsets, self._block_max):
+            out += bytes(section)
+            out += bytes(-len(out) % 8)
+        return out
+
+    @classmethod
+    def _from_buffer(cls, view, offset, id_table, doc_lens=None):
+        # Read-only PostingList over a packed copy inside `view` (a mapped
+        # segment file). Nothing is decoded or copied until it is read.
+        length, last, doc_bytes, pos_bytes, blocks, max_weight = \
+            _POSTING_HEADER.unpack_from(view, offset)
+        sections = []
+        pos = offset + _POSTING_HEADER.size
+        for size in (doc_bytes, pos_bytes, 4 * length, 4 * length, 4 * blocks, 4 * blocks, 8 * blocks):
+            sections.append(view[pos:pos + size])
+            pos += size + (-size % 8)
+
+        self = cls.__new__(cls)
+        self._id_table = id_table
+        self._doc_lens = doc_lens
+        self._docs = sections[0]
+        self._positions = sections[1]
+        self._tfs = sections[2].cast('I')
+        self._pos_offsets = sections[3].cast('I')
+        self._skip_docs = sections[4].cast('I')
+        self._skip_offsets = sections[5].cast('I')
+        self._block_max = sections[6].cast('d')
+        self._max_weight = max_weight
+        self._last = last
+        self._len = length
+        return self
+
+
+_END = sys.maxsize
+
+
+class _PostingCursor:
+    # Forward-only cursor over a PostingList. Blocks are entered lazily: the
+    # first doc, block-max and block end all come from the skip table, and
+    # the varint bytes are only decoded once a posting inside is needed.
+    __slots__ = ("postings", "block", "docs", "base", "i", "doc")
+
+    def __init__(self, postings):
+        self.postings = postings
+        self._enter(0)
+
+    def _enter(self, block):
+        postings = self.postings
+        self.block = block
+        self.docs = None
+        self.i = 0
+        if block >= postings.block_count():
+            self.doc = _END
+            return
+        self.base = block * PostingList.BLOCK_SIZE
+        self.doc = postings._skip_docs[block]
+
+    def _decode(self):
+        if self.docs is None:
+            self.docs = self.postings.block_doc_nums(self.block)
+
+    def next(self):
+        self._decode()
+        self.i += 1
+        if self.i < len(self.docs):
+            self.doc = self.docs[self.i]
+        else:
+            self._enter(self.block + 1)
+
+    def seek(self, target):
+        # Move to the first posting with doc number >= target
+        if self.doc >= target:
+            return
+        block = bisect_right(self.postings._skip_docs, target) - 1
+        if block > self.block:
+            self._enter(block)
+            if self.doc >= target:
+                return
+        self._decode()
+        i = bisect_left(self.docs, target, self.i)
+        if i < len(self.docs):
+            self.i = i
+            self.doc = self.docs[i]
+        else:
+            self._enter(self.block + 1)
+
+    @property
+    def tf(self):
+        return self.postings._tfs[self.base + self.i]
+
+    @property
+    def positions(self):
+        return self.postings.positions(self.base + self.i)
+
+    @property
+    def block_max(self):
+        return self.postings._block_max[self.block]
+
+    @property
+    def block_last(self):
+        # Largest doc number the current block can contain
+        skip_docs = self.postings._skip_docs
+        if self.block + 1 < len(skip_docs):
+            return skip_docs[self.block + 1] - 1
+        return self.postings._last
+
+
+class _ChainedPostings:
+    # Read view over one term's PostingLists from consecutive segments. The
+    # parts cover increasing, disjoint doc number ranges, so chaining them
+    # keeps doc order and the PostingList reading API.
+    __slots__ = ("parts",)
+
+    def __init__(self, parts):
+        self.parts = parts
+
+    def __len__(self):
+        return sum(len(p) for p in self.parts)
+
+    def doc_nums(self):
+        values = []
+        for part in self.parts:
+            values.extend(part.doc_nums())
+        return values
+
+    def pairs(self):
+        return chain.from_iterable(p.pairs() for p in self.parts)
+
+    def __iter__(self):
+        return chain.from_iterable(self.parts)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        for part in self.parts:
+            if 0 <= i < len(part):
+                return part[i]
+            i -= len(part)
+        raise IndexError("posting index out of range")
+
+    @property
+    def max_weight(self):
+        return max(p.max_weight for p in self.parts)
+
+    def cursor(self):
+        return _ChainCursor([p.cursor() for p in self.parts])
+
+    def nbytes(self):
+        return sum(p.nbytes() for p in self.parts)
+
+
+class _ChainCursor:
+    # _PostingCursor interface over a _ChainedPostings: delegates to the
+    # cursor of the part holding the current doc
+    __slots__ = ("cursors", "k", "cur", "doc")
+
+    def __init__(self, cursors):
+        self.cursors = cursors
+        self.k = 0
+        self._settle()
+
+    def _settle(self):
+        cursors = self.cursors
+        while self.k < len(cursors) - 1 and cursors[self.k].doc == _END:
+            self.k += 1
+        self.cur = cursors[self.k]
+        self.doc = self.cur.doc
+
+    def next(self):
+        self.cur.next()
+        self._settle()
+
+    def seek(self, target):
+        if self.doc >= target:
+            return
+        cursors = self.cursors
+        while self.k < len(cursors) - 1 and cursors[self.k].postings._last < target:
+            self.k += 1
+        cursors[self.k].seek(target)
+        self._settle()
+
+    @property
+    def tf(self):
+        return self.cur.tf
+
+    @property
+    def positions(self):
+        return self.cur.positions
+
+    @property
+    def block_max(self):
+        return self.cur.block_max
+
+    @property
+    def block_last(self):
+        return self.cur.block_last
+
+
+def _phrase_spans(position_lists, slop):
+    # Yields (start, end) token positions of each ordered match: one position
+    # per phrase term, increasing, with at most `slop` extra tokens in the
+    # whole span (summed over all gaps, not per gap). Greedily taking the next
+    # occurrence gives the tightest span per start.
+    first, rest = position_lists[0], position_lists[1:]
+    for start in first:
+        pos = start
+        for offset, plist in enumerate(rest, 1):
+            i = bisect_right(plist, pos)
+            if i == len(plist):
+                # Later starts can only push every term further right
+                return
+            pos = plist[i]
+            if pos - start - offset > slop:
+                break
+        else:
+            yield start, pos
+
+
+_SEGMENT_VERSION = 1
+_SEGMENT_FILES = (".tdx", ".pst", ".dst", ".del")
+_MANIFEST = "segments.json"
+# Term dictionary header: magic, version, term count
+_TERMS_HEADER = struct.Struct('<4sIQ')
+# Doc store header: magic, version, base doc number, doc count, and the
+# start of each section (lengths, title ends, content ends, magnitudes,
+# record offsets, doc ids, records) plus the end of the last one
+_DOCSTORE_HEADER = struct.Struct('<4sIQQ8Q')
+
+
+def _map_file(path):
+    # Read-only memoryview over a mapped file (empty files cannot be mapped)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _write_file(path, data):
+    # Durable replace: write a temp file, fsync, then rename over the target
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _range_bits(bitmap, base, count):
+    # Bits [base, base + count) of a bitmap, re-based to bit 0
+    value = int.from_bytes(bitmap[base >> 3:((base + count) >> 3) + 1], "little") >> (base & 7)
+    value &= (1 << count) - 1
+    return value.to_bytes((count + 7) // 8, "little")
+
+
+def _set_bits(bitmap):
+    for i, byte in enumerate(bitmap):
+        if byte:
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield i * 8 + bit
+
+
+class _MemorySegment:
+    # Mutable in-memory segment: term -> PostingList for doc numbers from
+    # `base` on. Sealing sets `end`; its postings are never appended to again.
+    __slots__ = ("base", "end", "terms")
+
+    def __init__(self, base):
+        self.base = base
+        self.end = None
+        self.terms = {}
+
+    def postings(self, term):
+        return self.terms.get(term)
+
+    def posting_count(self):
+        return sum(len(p) for p in self.terms.values())
+
+    def nbytes(self):
+        return sum(p.nbytes() for p in self.terms.values())
+
+
+class _DiskSegment:
+    # Immutable segment covering doc numbers [base, end), stored as:
+    #   <name>.tdx  term dictionary: terms, postings offsets, doc freqs
+    #   <name>.pst  packed PostingLists, mapped and read in place
+    #   <name>.dst  doc store: per-doc lengths, field ends, magnitudes, doc ids
+    #               and a JSON record [title, content, tags, indexed_at, vector]
+    #               per doc; docs deleted before the write have no record
+    #   <name>.del  tombstone bitmap, rewritten on every commit
+    def __init__(self, directory, name, id_table, doc_lens):
+        self.name = name
+        self._id_table = id_table
+        self._doc_lens = doc_lens
+        path = os.path.join(directory, name)
+
+        with open(path + ".tdx", "rb") as f:
+            data = f.read()
+        magic, version, count = _TERMS_HEADER.unpack_from(data)
+        if magic != b"KTDX" or version != _SEGMENT_VERSION:
+            raise ValueError(f"{name}.tdx is not a version {_SEGMENT_VERSION} term dictionary")
+        pos = _TERMS_HEADER.size
+        self.offsets = array('Q')
+        self.offsets.frombytes(data[pos:pos + 8 * count])
+        pos += 8 * count
+        self.dfs = array('I')
+        self.dfs.frombytes(data[pos:pos + 4 * count])
+        pos += 4 * count
+        self.term_list = data[pos:].decode("utf-8").split("\n") if count else []
+        self.terms = dict(zip(self.term_list, range(count)))
+
+        self._postings_view = _map_file(path + ".pst")
+        self._docs_view = _map_file(path + ".dst")
+        magic, version, self.base, count, *self._sections = \
+            _DOCSTORE_HEADER.unpack_from(self._docs_view)
+        if magic != b"KDST" or version != _SEGMENT_VERSION:
+            raise ValueError(f"{name}.dst is not a version {_SEGMENT_VERSION} doc store")
+        self.end = self.base + count
+        self._record_offsets = self._section(4, 8 * (count + 1)).cast('Q')
+
+        try:
+            with open(path + ".del", "rb") as f:
+                self.tombstones = f.read()
+        except FileNotFoundError:
+            self.tombstones = b""
+
+        self._cache = {}
+
+    def _section(self, i, size=None):
+        # Sections are padded to 8 bytes; `size` trims to the exact payload
+        start = self._sections[i]
+        end = self._sections[i + 1] if size is None else start + size
+        return self._docs_view[start:end]
+
+    def postings(self, term):
+        postings = self._cache.get(term)
+        if postings is None:
+            idx = self.terms.get(term)
+            if idx is None:
+                return None
+            postings = PostingList._from_buffer(self._postings_view, self.offsets[idx],
+                                                self._id_table, self._doc_lens)
+            self._cache[term] = postings
+        return postings
+
+    def posting_count(self):
+        return sum(self.dfs)
+
+    def nbytes(self):
+        # Mapped postings bytes
+        return len(self._postings_view)
+
+    def doc_arrays(self):
+        # Raw bytes of the doc lengths, title ends, content ends and magnitudes
+        count = self.end - self.base
+        return [self._section(0, 4 * count), self._section(1, 4 * count),
+                self._section(2, 4 * count), self._section(3, 8 * count)]
+
+    def doc_ids(self):
+        return json.loads(bytes(self._section(5)).rstrip(b"\0"))
+
+    def raw_record(self, doc_num):
+        i = doc_num - self.base
+        start = self._sections[6] + self._record_offsets[i]
+        end = self._sections[6] + self._record_offsets[i + 1]
+        return bytes(self._docs_view[start:end]) if end > start else None
+
+    def record(self, doc_num):
+        raw = self.raw_record(doc_num)
+        return json.loads(raw) if raw is not None else None
+
+
+class _TermIndex(Mapping):
+    # term -> postings of live documents across all segments. A term is
+    # present while some live document contains it. Stored postings of
+    # tombstoned docs linger until their segment is merged or compacted; a
+    # term whose stored postings include them gets a filtered copy.
+    def __init__(self, engine):
+        self._engine = engine
+
+    def __getitem__(self, term):
+        engine = self._engine
+        df = engine.doc_freqs.get(term)
+        if not df:
+            raise KeyError(term)
+        postings = engine._postings(term)
+        if len(postings) == df:
+            return postings
+
+        deleted = engine._deleted
+        live = PostingList(engine._doc_id_table, engine._doc_lens)
+        cursor = postings.cursor()
+        while cursor.doc != _END:
+            doc_num = cursor.doc
+            if not deleted[doc_num >> 3] >> (doc_num & 7) & 1:
+                live.append(doc_num, cursor.tf, cursor.positions)
+            cursor.next()
+        return live
+
+    def __contains__(self, term):
+        return term in self._engine.doc_freqs
+
+    def __iter__(self):
+        return iter(self._engine.doc_freqs)
+
+    def __len__(self):
+        return len(self._engine.doc_freqs)
+
+
+class _DocView(Mapping):
+    # Read-only doc_id -> value view; `load` takes the current doc number,
+    # so documents stored in segments are only read when accessed
+    def __init__(self, doc_nums, load):
+        self._doc_nums = doc_nums
+        self._load = load
+
+    def __getitem__(self, doc_id):
+        return self._load(self._doc_nums[doc_id])
+
+    def __contains__(self, doc_id):
+        return doc_id in self._doc_nums
+
+    def __iter__(self):
+        return iter(self._doc_nums)
+
+    def __len__(self):
+        return len(self._doc_nums)
+
+
+def _term_hash64(term):
+    # Stable across processes, unlike hash() on str
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class _LSHIndex:
+    # Banded locality-sensitive hash index over doc vectors: each doc is
+    # filed under one key per band, and docs sharing any key are candidates
+    def __init__(self, bands):
+        self.bands = bands
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    def add(self, doc_num, vector):
+        if vector:
+            for bucket, key in zip(self._buckets, self._keys(vector)):
+                bucket[key].append(doc_num)
+
+    def candidates(self, vector):
+        found = set()
+        if vector:
+            for bucket, key in zip(self._buckets, self._keys(vector)):
+                found.update(bucket.get(key, ()))
+        return found
+
+
+class _MinHashLSH(_LSHIndex):
+    # MinHash signatures of the term set. Two docs with Jaccard similarity J
+    # share a band with probability 1 - (1 - J**rows)**bands.
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, num_perm=64, bands=16, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        super().__init__(bands)
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(self._PRIME))
+                       for _ in range(num_perm)]
+        self.rows = num_perm // bands
+        self._term_hashes = {}  # term -> array of num_perm hash values
+
+    def _hashes(self, term):
+        hashes = self._term_hashes.get(term)
+        if hashes is None:
+            x = _term_hash64(term)
+            prime = self._PRIME
+            hashes = array('Q', [(a * x + b) % prime for a, b in self._perms])
+            self._term_hashes[term] = hashes
+        return hashes
+
+    def _keys(self, vector):
+        signature = list(map(min, zip(*(self._hashes(term) for term in vector))))
+        rows = self.rows
+        return [hash(tuple(signature[i:i + rows])) for i in range(0, len(signature), rows)]
+
+
+class _SimHashLSH(_LSHIndex):
+    # 64-bit SimHash of the term-count vector, split into `bands` chunks.
+    # Fingerprints within Hamming distance < bands agree on some chunk.
+    BITS = 64
+
+    def __init__(self, bands=4):
+        if self.BITS % bands:
+            raise ValueError(f"bands must divide {self.BITS}")
+        super().__init__(bands)
+        self._term_signs = {}  # term -> +1/-1 per fingerprint bit
+
+    def _signs(self, term):
+        signs = self._term_signs.get(term)
+        if signs is None:
+            x = _term_hash64(term)
+            signs = self._term_signs[term] = array('b', [1 if x >> i & 1 else -1 for i in range(self.BITS)])
+        return signs
+
+    def _keys(self, vector):
+        # Sum the sign vectors per distinct count, then weight, so the
+        # per-bit work stays in zip/sum rather than a loop per term
+        by_count = defaultdict(list)
+        for term, count in vector.items():
+            by_count[count].append(self._signs(term))
+        totals = [0] * self.BITS
+        for count, signs in by_count.items():
+            for i, total in enumerate(map(sum, zip(*signs))):
+                totals[i] += count * total
+        fingerprint = 0
+        for i, total in enumerate(totals):
+            if total > 0:
+                fingerprint |= 1 << i
+        width = self.BITS // self.bands
+        mask = (1 << width) - 1
+        return [fingerprint >> (i * width) & mask for i in range(self.bands)]
+
+
 class OptimizedSearchEngine:
     # Stopwords as frozenset for O(1) membership testing
     STOPWORDS = frozenset([
@@ -32,18 +755,51 @@ class OptimizedSearchEngine:
 
     # Pre-compiled regex for O(n) tokenization
     TOKEN_PATTERN = re.compile(r'\w+')
-
-    def __init__(self):
-        # Dictionary for O(1) document lookup
-        self.documents = {}
-
-        # Inverted Index mapping stemmed terms to postings
-        # Posting: {'doc_id': int, 'tf': int, 'pos': List[int]}
-        self.index = defaultdict(list)
-
-        # Pre-computed Sparse Vectors and Magnitudes for Similarity
-        self.doc_vectors = {}      # doc_id -> {term: count}
-        self.doc_magnitudes = {}   # doc_id -> float
+    # "a b"~3 -> phrase "a b" with up to 3 extra tokens between the terms
+    PHRASE_PATTERN = re.compile(r'^\s*"([^"]*)"\s*(?:~\s*(\d+))?\s*$')
+
+    # In-memory mode renumbers the live docs once tombstones outnumber them
+    # (and there are at least this many), so updates cannot grow it forever
+    COMPACT_MIN_TOMBSTONES = 1000
+
+    def __init__(self, directory=None, flush_docs=50000, merge_factor=8):
+        # Postings reference dense internal doc numbers that are never reused.
+        # Per-doc tables are indexed by doc number; _doc_table holds the
+        # Document (None until a stored doc is loaded, or once it is removed).
+        self._doc_table = []
+        self._doc_id_table = []
+        self._doc_lens = array('I')  # doc number -> word_count
+        self._title_ends = array('I')  # doc number -> first content position
+        self._content_ends = array('I')  # doc number -> first tag position
+        self._vector_table = []  # doc number -> {term: count}
+        self._magnitudes = array('d')  # doc number -> vector norm
+        self._deleted = bytearray()  # tombstone bitmap over doc numbers
+        self._doc_nums = {}  # doc_id -> current doc number
+
+        # The inverted index is split into segments ordered by doc number:
+        # immutable on-disk segments (mapped, when a directory is given) and
+        # a live in-memory segment that new documents are appended to. Once
+        # it holds flush_docs documents it is written out in the background,
+        # and every merge_factor on-disk segments are merged into one.
+        self._directory = directory
+        self.flush_docs = flush_docs
+        self.merge_factor = merge_factor
+        self._segments = (_MemorySegment(0),)
+        self._next_segment = 1
+        self._lock = threading.Lock()  # guards _segments swaps and commits
+        self._writer = None
+        self._pending = []
+
+        # O(1) lookup views keyed by doc_id: Documents, pre-computed sparse
+        # vectors and magnitudes for similarity, and term -> postings
+        self.documents = _DocView(self._doc_nums, self._document)
+        self.doc_vectors = _DocView(self._doc_nums, self._vector)
+        self.doc_magnitudes = _DocView(self._doc_nums, lambda doc_num: self._magnitudes[doc_num])
+        self.index = _TermIndex(self)
+
+        # Optional LSH index for approximate similar-document lookup
+        self._lsh = None
+        self._lsh_params = None
 
         # Stats for TF-IDF
         self.doc_freqs = defaultdict(int) # term -> num_docs_containing_term
@@ -58,6 +814,9 @@ class OptimizedSearchEngine:
         self.search_history = []
         self.stem_cache = {}
 
+        if directory is not None:
+            self._open()
+
     def _tokenize(self, text):
         # Use regex findall and built-in lower() for O(n) performance
         if not text:
@@ -95,7 +854,7 @@ class OptimizedSearchEngine:
 
     def add_document(self, doc):
         # If doc_id already exists, treat this as an update (N unchanged).
-        is_update = doc.doc_id in self.documents
+        is_update = doc.doc_id in self._doc_nums
         if is_update:
             self._remove_document(doc.doc_id, adjust_doc_count=False)
 
@@ -110,10 +869,16 @@ class OptimizedSearchEngine:
         else:
             new_n = self._doc_count
 
-        # Store in dictionary
-        self.documents[doc.doc_id] = doc
         doc.indexed_at = time.time()
 
+        # Assign the next dense doc number so postings stay sorted on append
+        doc_num = len(self._doc_table)
+        self._doc_table.append(doc)
+        self._doc_id_table.append(doc.doc_id)
+        self._doc_nums[doc.doc_id] = doc_num
+        if doc_num & 7 == 0:
+            self._deleted.append(0)
+
         # Tokenize fields (including tags to ensure they are searchable)
         title_tokens = self._tokenize(doc.title)
         content_tokens = self._tokenize(doc.content)
@@ -127,6 +892,14 @@ class OptimizedSearchEngine:
         filtered_tokens = [t for t in all_tokens if t not in self.STOPWORDS]
         stemmed_tokens = [self._stem_word(t) for t in filtered_tokens]
         doc.word_count = len(stemmed_tokens)
+        self._doc_lens.append(doc.word_count)
+
+        # Positions run over title, content, then tags; keep the field
+        # boundaries so phrase matches can be attributed without the text
+        title_end = sum(1 for t in title_tokens if t not in self.STOPWORDS)
+        content_end = title_end + sum(1 for t in content_tokens if t not in self.STOPWORDS)
+        self._title_ends.append(title_end)
+        self._content_ends.append(content_end)
 
         # Build Inverted Index and Pre-compute Counts
         term_counts = Counter(stemmed_tokens)
@@ -140,12 +913,12 @@ class OptimizedSearchEngine:
         doc_vector = {}
         sq_sum = 0.0
 
+        index = self._segments[-1].terms
         for term, count in term_counts.items():
-            self.index[term].append({
-                'doc_id': doc.doc_id,
-                'tf': count,
-                'pos': term_positions[term]
-            })
+            postings = index.get(term)
+            if postings is None:
+                postings = index[term] = PostingList(self._doc_id_table, self._doc_lens)
+            postings.append(doc_num, count, term_positions[term])
             self.doc_freqs[term] += 1
 
             # Cache IDF for this term, adjusted by the global offset.
@@ -157,24 +930,30 @@ class OptimizedSearchEngine:
             doc_vector[term] = count
             sq_sum += count * count
 
-        self.doc_vectors[doc.doc_id] = doc_vector
-        self.doc_magnitudes[doc.doc_id] = math.sqrt(sq_sum)
+        self._vector_table.append(doc_vector)
+        self._magnitudes.append(math.sqrt(sq_sum))
+        if self._lsh is not None:
+            self._lsh.add(doc_num, doc_vector)
+
+        if self._directory is not None and doc_num + 1 - self._segments[-1].base >= self.flush_docs:
+            self._seal()
+        elif is_update:
+            self._maybe_compact()
 
     def _remove_document(self, doc_id, *, adjust_doc_count=True):
-        doc = self.documents.get(doc_id)
-        if not doc:
+        doc_num = self._doc_nums.get(doc_id)
+        if doc_num is None:
             return
 
-        old_vector = self.doc_vectors.get(doc_id, {})
+        old_vector = self._vector(doc_num)
+        del self._doc_nums[doc_id]
 
-        # Remove postings and update DF/IDF for affected terms.
-        for term in list(old_vector.keys()):
-            postings = self.index.get(term)
-            if postings is not None:
-                self.index[term] = [p for p in postings if p.get('doc_id') != doc_id]
-                if not self.index[term]:
-                    del self.index[term]
+        # Tombstone the doc number; its postings stay in place until the
+        # segment holding them is merged, and readers skip it until then
+        self._deleted[doc_num >> 3] |= 1 << (doc_num & 7)
 
+        # Update DF/IDF for affected terms.
+        for term in old_vector:
             if term in self.doc_freqs:
                 self.doc_freqs[term] -= 1
                 if self.doc_freqs[term] <= 0:
@@ -184,10 +963,12 @@ class OptimizedSearchEngine:
                     # Recompute cached value for this term (N may be adjusted below).
                     pass
 
-        # Remove per-doc data.
-        self.doc_vectors.pop(doc_id, None)
-        self.doc_magnitudes.pop(doc_id, None)
-        self.documents.pop(doc_id, None)
+        # Drop per-doc data, unless a sealed segment that is still being
+        # written needs it for its doc store
+        segment = self._segment_for(doc_num)
+        if not (isinstance(segment, _MemorySegment) and segment.end is not None):
+            self._doc_table[doc_num] = None
+            self._vector_table[doc_num] = None
 
         # Adjust N/offset if requested.
         if adjust_doc_count:
@@ -212,8 +993,9 @@ class OptimizedSearchEngine:
 
     def remove_document(self, doc_id):
         self._remove_document(doc_id, adjust_doc_count=True)
+        self._maybe_compact()
 
-    def search(self, query):
+    def search(self, query, k=None):
         # Append to list instead of string concatenation
         self.search_history.append(query)
 
@@ -224,80 +1006,255 @@ class OptimizedSearchEngine:
         if not stemmed_query:
             return []
 
+        # Top-k requests skip most postings with block-max MaxScore pruning
+        if k is not None:
+            return self._search_top_k(stemmed_query, k)
+
         # Use Inverted Index and Pre-computed Stats
         scores = defaultdict(float)
+        doc_table = self._doc_table
+        doc_lens = self._doc_lens
         for term in stemmed_query:
-            if term not in self.index:
+            postings = self._postings(term)
+            if postings is None:
                 continue
 
             idf = self.idf_cache.get(term, 0.0) + self._idf_offset
 
-            # Retrieve postings (O(1))
-            postings = self.index[term]
-
-            for posting in postings:
-                doc_id = posting['doc_id']
-                tf_raw = posting['tf']
-                doc_len = self.documents[doc_id].word_count
+            for doc_num, tf_raw in postings.pairs():
+                doc_len = doc_lens[doc_num]
 
                 if doc_len > 0:
                     tf = tf_raw / doc_len
-                    scores[doc_id] += (tf * idf * 100)
+                    scores[doc_num] += (tf * idf * 100)
 
         results = []
-        for doc_id, score in scores.items():
-            results.append({"document": self.documents[doc_id], "score": score})
+        deleted = self._deleted
+        for doc_num, score in scores.items():
+            # Tombstoned docs keep their postings until a merge drops them
+            if deleted[doc_num >> 3] >> (doc_num & 7) & 1:
+                continue
+            doc = doc_table[doc_num]
+            if doc is None:
+                doc = self._load(doc_num)[0]
+            results.append({"document": doc, "score": score})
 
         # Use sorted() (Timsort) O(n log n)
         return sorted(results, key=lambda x: x["score"], reverse=True)
 
-    def search_phrase(self, phrase):
-        # Efficient Phrase Search using Index Intersection + str.find
+    def _search_top_k(self, stemmed_query, k):
+        # Exact top-k over doc-ordered postings (block-max MaxScore).
+        # Bounds use the same arithmetic and query-term order as search(), and
+        # float rounding is monotone, so a bound is never below a real score.
+        # Ties break like search() (first query term containing the doc, then
+        # doc order), so the result equals search(query)[:k].
+        if k <= 0:
+            return []
+
+        slot_of = {}
+        first_idx = []  # per slot
+        query = []  # (slot, idf) in query order, repeats kept
+        for qi, term in enumerate(stemmed_query):
+            if term not in self.index:
+                continue
+            if term not in slot_of:
+                slot_of[term] = len(first_idx)
+                first_idx.append(qi)
+            query.append((slot_of[term], self.idf_cache.get(term, 0.0) + self._idf_offset))
+        if not query:
+            return []
+
+        postings = [self._postings(term) for term in slot_of]
+        cursors = [p.cursor() for p in postings]
+        max_w = [p.max_weight for p in postings]
+        min_first = first_idx[0]
+        doc_lens = self._doc_lens
+        deleted = self._deleted
+        heap = []  # (score, -first_term_idx, -doc_num); heap[0] is the k-th best
+
+        def bound(weights):
+            total = 0.0
+            for slot, idf in query:
+                w = weights[slot]
+                if w and idf > 0:
+                    total += (w * idf * 100)
+            return total
+
+        def prunable(upper):
+            # Docs arrive in increasing order, so an equal score only wins the
+            # tie if it can come from an earlier query term than the k-th best
+            if len(heap) < k:
+                return False
+            worst = heap[0]
+            return upper < worst[0] or (upper == worst[0] and -worst[1] <= min_first)
+
+        # Slots sorted by their standalone upper bound; a prefix that cannot
+        # reach the top-k on its own is "non-essential" and never drives
+        # iteration, it is only probed for docs found via essential terms.
+        def standalone(slot):
+            weights = [0.0] * len(postings)
+            weights[slot] = max_w[slot]
+            return bound(weights)
+
+        order = sorted(range(len(postings)), key=standalone)
+        pivot = 0
+        ne_weights = [0.0] * len(postings)  # non-essential slots at their max
+        essential = order
+        checked_until = -1  # last block range whose bound failed to prune
+        checked_worst = None
+
+        while True:
+            if len(heap) == k:
+                while pivot < len(order):
+                    trial = list(ne_weights)
+                    trial[order[pivot]] = max_w[order[pivot]]
+                    if not prunable(bound(trial)):
+                        break
+                    ne_weights = trial
+                    pivot += 1
+                    essential = order[pivot:]
+                if pivot == len(order):
+                    break
+
+            doc = min(cursors[slot].doc for slot in essential)
+            if doc == _END:
+                break
+
+            # Block-max skip: nothing up to the nearest block end can qualify.
+            # A failed check stays failed until the range ends or heap[0] moves.
+            if len(heap) == k and (doc > checked_until or heap[0] is not checked_worst):
+                weights = list(ne_weights)
+                block_end = _END
+                for slot in essential:
+                    c = cursors[slot]
+                    if c.doc != _END:
+                        weights[slot] = c.block_max
+                        if c.block_last < block_end:
+                            block_end = c.block_last
+                if prunable(bound(weights)):
+                    for slot in essential:
+                        cursors[slot].seek(block_end + 1)
+                    continue
+                checked_until = block_end
+                checked_worst = heap[0]
+
+            doc_len = doc_lens[doc]
+            weights = list(ne_weights)
+            for slot in essential:
+                c = cursors[slot]
+                if c.doc == doc:
+                    weights[slot] = c.tf / doc_len
+                    c.next()
+
+            if deleted[doc >> 3] >> (doc & 7) & 1:
+                continue
+
+            if pivot and not prunable(bound(weights)):
+                # Probe the non-essential lists for the exact score
+                for slot in order[:pivot]:
+                    c = cursors[slot]
+                    c.seek(doc)
+                    weights[slot] = c.tf / doc_len if c.doc == doc else 0.0
+            elif pivot:
+                continue
+
+            score = 0.0
+            first = None
+            for slot, idf in query:
+                tf = weights[slot]
+                if tf:
+                    score += (tf * idf * 100)
+                    if first is None or first_idx[slot] < first:
+                        first = first_idx[slot]
+            entry = (score, -first, -doc)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        return [{"document": self._document(-neg_doc), "score": score}
+                for score, _, neg_doc in sorted(heap, reverse=True)]
+
+    def search_phrase(self, phrase, slop=0):
+        # Positional phrase search: intersect the postings, then merge the
+        # stored position lists. Documents are never re-read. A quoted query
+        # may carry its own slop: '"machine learning"~2'. Slop is a budget
+        # for the whole phrase: the terms must appear in order with at most
+        # `slop` extra tokens in total between the first and the last.
         self.search_history.append(f"PHRASE: {phrase}")
 
+        quoted = self.PHRASE_PATTERN.match(phrase)
+        if quoted:
+            phrase = quoted.group(1)
+            if quoted.group(2) is not None:
+                slop = int(quoted.group(2))
+
         phrase_tokens = self._tokenize(phrase)
         if not phrase_tokens:
             return []
 
+        # Positions are counted after stopword removal, so stopwords inside
+        # the phrase are skipped the same way they were at indexing time
         filtered_tokens = [t for t in phrase_tokens if t not in self.STOPWORDS]
         stemmed_tokens = [self._stem_word(t) for t in filtered_tokens]
 
         if not stemmed_tokens:
             return []
 
-        # 1. Intersection: Find docs containing ALL terms (Fast filtering)
-        candidate_ids = None
+        # 1. Intersection: leapfrog the cursors, rarest list leading
+        postings = {}
         for term in stemmed_tokens:
             if term not in self.index:
                 return []
-            term_docs = {p['doc_id'] for p in self.index[term]}
-            if candidate_ids is None:
-                candidate_ids = term_docs
-            else:
-                candidate_ids &= term_docs
-            if not candidate_ids:
-                return []
+            if term not in postings:
+                postings[term] = self._postings(term)
+        cursors = {term: p.cursor() for term, p in postings.items()}
+        order = sorted(cursors, key=lambda term: len(postings[term]))
+        lead, others = cursors[order[0]], [cursors[term] for term in order[1:]]
 
-        # 2. Validation: Use str.find / str.count on candidates
+        # 2. Validation: merge position lists of each candidate
         results = []
-        phrase_lower = phrase.lower()
-
-        for doc_id in candidate_ids:
-            doc = self.documents[doc_id]
-
-            # Use Python's built-in string methods (C-optimized)
-            content_count = doc.content.lower().count(phrase_lower)
-            title_count = doc.title.lower().count(phrase_lower)
+        title_ends = self._title_ends
+        content_ends = self._content_ends
+        deleted = self._deleted
+        doc = lead.doc
+        while doc != _END:
+            for c in others:
+                c.seek(doc)
+                if c.doc != doc:
+                    break
+            else:
+                if deleted[doc >> 3] >> (doc & 7) & 1:
+                    lead.next()
+                    doc = lead.doc
+                    continue
+                positions = {term: c.positions for term, c in cursors.items()}
+                title_end = title_ends[doc]
+                content_end = content_ends[doc]
+                title_count = content_count = 0
+                for start, end in _phrase_spans([positions[t] for t in stemmed_tokens], slop):
+                    # Matches must stay inside one field; tags are not scored
+                    if end < title_end:
+                        title_count += 1
+                    elif start >= title_end and end < content_end:
+                        content_count += 1
+
+                total_matches = content_count + title_count
+                if total_matches > 0:
+                    # Weighted score based on matches
+                    score = content_count + (title_count * 3)
+                    results.append({
+                        "document": self._document(doc),
+                        "score": score,
+                        "matches": total_matches
+                    })
+                lead.next()
+                doc = lead.doc
+                continue
 
-            total_matches = content_count + title_count
-            if total_matches > 0:
-                # Weighted score based on matches
-                score = content_count + (title_count * 3)
-                results.append({
-                    "document": doc,
-                    "score": score,
-                    "matches": total_matches
-                })
+            # Some list has nothing at `doc`; jump the leader past the gap
+            lead.seek(max(c.doc for c in others))
+            doc = lead.doc
 
         return sorted(results, key=lambda x: x["score"], reverse=True)
 
@@ -338,52 +1295,83 @@ class OptimizedSearchEngine:
         partial_lower = partial_query.lower()
         suggestions = []
 
-        # Scan inverted index keys
-        for term, postings in self.index.items():
+        # Scan the live term dictionary
+        for term, doc_count in self.doc_freqs.items():
             if term.startswith(partial_lower):
-                suggestions.append({"term": term, "doc_count": len(postings)})
+                suggestions.append({"term": term, "doc_count": doc_count})
 
         # Use heapq.nlargest for O(N log K) top-k selection
         return heapq.nlargest(10, suggestions, key=lambda s: s["doc_count"])
 
-    def find_similar_documents(self, doc_id):
-        # Optimized Similarity using Sparse Vectors
-        if doc_id not in self.documents:
+    def enable_lsh(self, method="minhash", bands=None, num_perm=64, seed=1):
+        # Build an LSH index ("minhash" over term sets, or "simhash" over
+        # term counts) for find_similar_documents(..., approximate=True).
+        # It is kept in memory and updated as documents are added.
+        if method == "minhash":
+            lsh = _MinHashLSH(num_perm, bands or 16, seed)
+        elif method == "simhash":
+            lsh = _SimHashLSH(bands or 4)
+        else:
+            raise ValueError(f"unknown LSH method: {method!r}")
+        for doc_num in self._doc_nums.values():
+            lsh.add(doc_num, self._vector(doc_num))
+        self._lsh = lsh
+        self._lsh_params = (method, bands, num_perm, seed)
+
+    def find_similar_documents(self, doc_id, approximate=False):
+        # Accumulator-based cosine similarity: only the postings of the
+        # target's terms are walked, so the cost follows their lengths rather
+        # than the corpus size. Dot products add up in the target's term
+        # order, exactly as a per-document sparse dot product would.
+        doc_num = self._doc_nums.get(doc_id)
+        if doc_num is None:
             return []
 
-        # O(1) Vector Lookup
-        target_vector = self.doc_vectors.get(doc_id)
-        target_mag = self.doc_magnitudes.get(doc_id)
+        target_vector = self._vector(doc_num)
+        target_mag = self._magnitudes[doc_num]
 
         if not target_vector or target_mag == 0:
             return []
 
-        similarities = []
+        if approximate and self._lsh is not None:
+            # Near-duplicate lookup: score only docs sharing an LSH bucket.
+            # Buckets keep tombstoned doc numbers until the next compaction
+            # rebuilds them, so those are skipped here.
+            dots = {}
+            deleted = self._deleted
+            for other in self._lsh.candidates(target_vector):
+                if deleted[other >> 3] >> (other & 7) & 1:
+                    continue
+                other_vector = self._vector_table[other] or self._vector(other)
+                dot_product = 0.0
+                for term, count in target_vector.items():
+                    if term in other_vector:
+                        dot_product += count * other_vector[term]
+                dots[other] = dot_product
+        else:
+            dots = defaultdict(float)
+            for term, count in target_vector.items():
+                for other, tf in self._postings(term).pairs():
+                    dots[other] += count * tf
 
-        # Iterate over docs (O(N)). Dot product is O(T) where T is terms in target.
-        # Total Complexity: O(N*T), much faster than O(N*Length^2)
-        for other_id, other_vector in self.doc_vectors.items():
-            if other_id == doc_id:
+        similarities = []
+        deleted = self._deleted
+        magnitudes = self._magnitudes
+        for other, dot_product in dots.items():
+            if other == doc_num or deleted[other >> 3] >> (other & 7) & 1:
                 continue
 
-            other_mag = self.doc_magnitudes[other_id]
+            other_mag = magnitudes[other]
             if other_mag == 0:
                 continue
 
-            # Sparse Dot Product
-            dot_product = 0.0
-            for term, count in target_vector.items():
-                if term in other_vector:
-                    dot_product += count * other_vector[term]
-
             if dot_product > 0:
-                similarity = dot_product / (target_mag * other_mag)
-                similarities.append({
-                    "document": self.documents[other_id],
-                    "similarity": similarity
-                })
+                similarities.append((dot_product / (target_mag * other_mag), other))
 
-        return heapq.nlargest(10, similarities, key=lambda s: s["similarity"])
+        # Ties go to the earlier document, as in doc_id insertion order
+        top = heapq.nlargest(10, similarities, key=lambda s: (s[0], -s[1]))
+        return [{"document": self._document(other), "similarity": similarity}
+                for similarity, other in top]
 
     def calculate_tfidf(self, term, doc_id):
         # O(1) lookup using pre-computed values
@@ -430,12 +1418,21 @@ class OptimizedSearchEngine:
 
     def rebuild_index(self):
         # Restore documents
+        self._wait()
         docs_backup = list(self.documents.values())
 
-        self.index.clear()
-        self.documents.clear()
-        self.doc_vectors.clear()
-        self.doc_magnitudes.clear()
+        self._segments = (_MemorySegment(0),)
+        self._doc_table = []
+        self._doc_id_table = []
+        self._doc_lens = array('I')
+        self._title_ends = array('I')
+        self._content_ends = array('I')
+        self._vector_table = []
+        self._magnitudes = array('d')
+        self._deleted = bytearray()
+        self._doc_nums.clear()
+        if self._lsh is not None:
+            self.enable_lsh(*self._lsh_params)
         self.doc_freqs.clear()
         self.idf_cache.clear()
         self._doc_count = 0
@@ -446,9 +1443,13 @@ class OptimizedSearchEngine:
         for doc in docs_backup:
             self.add_document(doc)
 
+        # Rewrite the on-disk copy; committing drops the old segment files
+        if self._directory is not None:
+            self.flush()
+
     def get_index_stats(self):
-        total_terms = len(self.index)
-        total_postings = sum(len(p) for p in self.index.values())
+        total_terms = len(self.doc_freqs)
+        total_postings = sum(self.doc_freqs.values())
         avg_postings = total_postings / total_terms if total_terms > 0 else 0
         return {
             "total_documents": len(self.documents),
@@ -457,6 +1458,351 @@ class OptimizedSearchEngine:
             "avg_postings_per_term": avg_postings
         }
 
+    def get_index_memory(self):
+        # Encoded posting bytes for capacity planning. Stored postings also
+        # count tombstoned docs until their segment is merged or compacted.
+        stored = sum(segment.posting_count() for segment in self._segments)
+        posting_bytes = sum(segment.nbytes() for segment in self._segments)
+        return {
+            "total_postings": sum(self.doc_freqs.values()),
+            "stored_postings": stored,
+            "posting_bytes": posting_bytes,
+            "bytes_per_posting": posting_bytes / stored if stored else 0
+        }
+
     def export_search_history(self):
         # Efficient string join
-        return "\n".join(self.search_history) + "\n"
\ No newline at end of file
+        return "\n".join(self.search_history) + "\n"
+    # --- Segments ---
+
+    def _postings(self, term):
+        # Stored postings of a live term, tombstoned docs included; readers
+        # skip those through the _deleted bitmap
+        if term not in self.doc_freqs:
+            return None
+        parts = []
+        for segment in self._segments:
+            postings = segment.postings(term)
+            if postings is not None:
+                parts.append(postings)
+        return parts[0] if len(parts) == 1 else _ChainedPostings(parts)
+
+    def _maybe_compact(self):
+        # Only the in-memory mode; on-disk segments drop tombstoned docs when merged
+        if self._directory is not None:
+            return
+        tombstones = len(self._doc_id_table) - len(self._doc_nums)
+        if tombstones >= self.COMPACT_MIN_TOMBSTONES and tombstones > len(self._doc_nums):
+            self._compact()
+
+    def _compact(self):
+        # Renumber the live docs densely, keeping their order, and rebuild
+        # the postings without the tombstoned ones. Per-doc tables are
+        # rewritten in place because PostingLists share them.
+        live = sorted(self._doc_nums.values())
+        remap = {old: new for new, old in enumerate(live)}
+
+        self._doc_table[:] = [self._doc_table[d] for d in live]
+        self._doc_id_table[:] = [self._doc_id_table[d] for d in live]
+        self._vector_table[:] = [self._vector_table[d] for d in live]
+        for name in ("_doc_lens", "_title_ends", "_content_ends", "_magnitudes"):
+            table = getattr(self, name)
+            table[:] = array(table.typecode, (table[d] for d in live))
+        self._deleted = bytearray((len(live) + 7) // 8)
+        for doc_id, doc_num in self._doc_nums.items():
+            self._doc_nums[doc_id] = remap[doc_num]
+
+        segment = _MemorySegment(0)
+        for term, old in self._segments[-1].terms.items():
+            postings = PostingList(self._doc_id_table, self._doc_lens)
+            cursor = old.cursor()
+            while cursor.doc != _END:
+                doc_num = remap.get(cursor.doc)
+                if doc_num is not None:
+                    postings.append(doc_num, cursor.tf, cursor.positions)
+                cursor.next()
+            if postings:
+                segment.terms[term] = postings
+        self._segments = (segment,)
+
+        if self._lsh is not None:
+            self.enable_lsh(*self._lsh_params)
+
+    def _segment_for(self, doc_num):
+        segments = self._segments
+        return segments[bisect_right([s.base for s in segments], doc_num) - 1]
+
+    def _load(self, doc_num):
+        # Materialize a stored doc from its segment's doc store and cache it
+        title, content, tags, indexed_at, vector = self._segment_for(doc_num).record(doc_num)
+        doc = Document(self._doc_id_table[doc_num], title, content, tags)
+        doc.word_count = self._doc_lens[doc_num]
+        doc.indexed_at = indexed_at
+        self._doc_table[doc_num] = doc
+        self._vector_table[doc_num] = vector
+        return doc, vector
+
+    def _document(self, doc_num):
+        doc = self._doc_table[doc_num]
+        return doc if doc is not None else self._load(doc_num)[0]
+
+    def _vector(self, doc_num):
+        vector = self._vector_table[doc_num]
+        return vector if vector is not None else self._load(doc_num)[1]
+
+    def _open(self):
+        # Map the committed segments. Only the term dictionaries and the
+        # fixed-width per-doc arrays are read; postings and documents are
+        # read from the mappings on demand, so nothing is re-tokenized.
+        os.makedirs(self._directory, exist_ok=True)
+        try:
+            with open(os.path.join(self._directory, _MANIFEST)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        self._next_segment = manifest["next_segment"]
+
+        segments = [_DiskSegment(self._directory, entry["name"], self._doc_id_table, self._doc_lens)
+                    for entry in manifest["segments"]]
+        tombstones = 0
+        for segment in segments:
+            lens, title_ends, content_ends, magnitudes = segment.doc_arrays()
+            self._doc_lens.frombytes(lens)
+            self._title_ends.frombytes(title_ends)
+            self._content_ends.frombytes(content_ends)
+            self._magnitudes.frombytes(magnitudes)
+            self._doc_id_table.extend(segment.doc_ids())
+            tombstones |= int.from_bytes(segment.tombstones, "little") << segment.base
+        n = len(self._doc_id_table)
+        self._doc_table.extend([None] * n)
+        self._vector_table.extend([None] * n)
+        self._deleted = bytearray(tombstones.to_bytes((n + 7) // 8, "little"))
+        self._segments = tuple(segments) + (_MemorySegment(n),)
+
+        # An older doc number of a doc_id is always tombstoned, so the live
+        # numbers give each doc_id its current one, in insertion order
+        deleted = self._deleted
+        self._doc_nums.update((doc_id, doc_num) for doc_num, doc_id in enumerate(self._doc_id_table)
+                              if not deleted[doc_num >> 3] >> (doc_num & 7) & 1)
+        for segment in segments:
+            for term, df in zip(segment.term_list, segment.dfs):
+                self.doc_freqs[term] += df
+
+        # Docs deleted after their segment was written still have postings
+        # (and a record) there, so take them back out of the doc freqs
+        for doc_num in _set_bits(deleted):
+            record = self._segment_for(doc_num).record(doc_num)
+            if record is not None:
+                for term in record[4]:
+                    self.doc_freqs[term] -= 1
+                    if self.doc_freqs[term] <= 0:
+                        del self.doc_freqs[term]
+
+        self._doc_count = len(self._doc_nums)
+        self._idf_offset = 0.0
+        for term, df in self.doc_freqs.items():
+            self.idf_cache[term] = math.log(self._doc_count / df)
+
+    def _submit(self, fn, *args):
+        # All segment writes, merges and commits run in order on one thread
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kurelb-segments")
+        # Keep failed futures so their error surfaces in the next _wait()
+        self._pending = [f for f in self._pending if not f.done() or f.exception() is not None]
+        self._pending.append(self._writer.submit(fn, *args))
+
+    def _wait(self):
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def _segment_name(self):
+        # Called with _lock held
+        name = f"seg_{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def _seal(self):
+        # Freeze the live in-memory segment and hand it to the writer; new
+        # documents go to a fresh in-memory segment meanwhile
+        live = self._segments[-1]
+        end = len(self._doc_table)
+        if end == live.base:
+            return
+        live.end = end
+        with self._lock:
+            self._segments = self._segments + (_MemorySegment(end),)
+            name = self._segment_name()
+        self._submit(self._flush_segment, live, name)
+
+    def _memory_record(self, doc_num):
+        doc = self._doc_table[doc_num]
+        record = [doc.title, doc.content, doc.tags, doc.indexed_at, self._vector_table[doc_num]]
+        return json.dumps(record).encode("utf-8")
+
+    def _flush_segment(self, segment, name):
+        term_parts = ((term, [postings]) for term, postings in sorted(segment.terms.items()))
+        disk = self._write_segment(name, segment.base, segment.end, term_parts,
+                                   self._memory_record, bytes(self._deleted))
+        with self._lock:
+            self._segments = tuple(disk if s is segment else s for s in self._segments)
+            self._commit()
+        # Stored docs now load from the doc store; drop the in-memory copies
+        for doc_num in range(segment.base, segment.end):
+            self._doc_table[doc_num] = None
+            self._vector_table[doc_num] = None
+        self._maybe_merge()
+
+    def _merge_level(self, segment):
+        # Tier of a segment: 0 for flush-sized, +1 per merge_factor multiple
+        size = (segment.end - segment.base) // max(1, self.flush_docs)
+        level = 0
+        while size >= self.merge_factor:
+            size //= self.merge_factor
+            level += 1
+        return level
+
+    def _maybe_merge(self):
+        # Tiered merging: once merge_factor of the newest on-disk segments
+        # share a tier, rewrite them as one segment of the next tier, dropping
+        # the postings and records of deleted docs. Repeat while tiers fill.
+        while True:
+            disk = [s for s in self._segments if isinstance(s, _DiskSegment)]
+            if not disk:
+                return
+            level = self._merge_level(disk[-1])
+            run = 0
+            while run < len(disk) and self._merge_level(disk[-1 - run]) == level:
+                run += 1
+            if run < self.merge_factor:
+                return
+            victims = disk[-run:][:self.merge_factor]
+            with self._lock:
+                name = self._segment_name()
+
+            terms = sorted(set().union(*(v.terms for v in victims)))
+            term_parts = ((term, [p for p in (v.postings(term) for v in victims) if p is not None])
+                          for term in terms)
+            bases = [v.base for v in victims]
+
+            def record_of(doc_num):
+                return victims[bisect_right(bases, doc_num) - 1].raw_record(doc_num)
+
+            merged = self._write_segment(name, victims[0].base, victims[-1].end, term_parts,
+                                         record_of, bytes(self._deleted))
+            with self._lock:
+                start = self._segments.index(victims[0])
+                self._segments = self._segments[:start] + (merged,) + self._segments[start + len(victims):]
+                self._commit()
+
+    def _write_segment(self, name, base, end, term_parts, record_of, deleted):
+        # Runs on the writer. Docs deleted in the `deleted` snapshot are left
+        # out entirely, so the stored doc freqs count exactly the postings
+        # and records the segment holds.
+        path = os.path.join(self._directory, name)
+
+        def live(doc_num):
+            return not deleted[doc_num >> 3] >> (doc_num & 7) & 1
+
+        terms = []
+        offsets = array('Q')
+        dfs = array('I')
+        written = 0
+        with open(path + ".pst", "wb") as f:
+            for term, parts in term_parts:
+                if len(parts) == 1 and all(live(d) for d in parts[0].doc_nums()):
+                    postings = parts[0]
+                else:
+                    postings = PostingList(self._doc_id_table, self._doc_lens)
+                    for part in parts:
+                        for i, doc_num in enumerate(part.doc_nums()):
+                            if live(doc_num):
+                                postings.append(doc_num, part._tfs[i], part.positions(i))
+                    if not postings:
+                        continue
+                data = postings._pack()
+                terms.append(term)
+                offsets.append(written)
+                dfs.append(len(postings))
+                f.write(data)
+                written += len(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        _write_file(path + ".tdx", b"".join([
+            _TERMS_HEADER.pack(b"KTDX", _SEGMENT_VERSION, len(terms)),
+            offsets.tobytes(), dfs.tobytes(), "\n".join(terms).encode("utf-8"),
+        ]))
+
+        records = bytearray()
+        record_offsets = array('Q', [0])
+        for doc_num in range(base, end):
+            if live(doc_num):
+                records += record_of(doc_num)
+            record_offsets.append(len(records))
+        sections = [
+            self._doc_lens[base:end].tobytes(),
+            self._title_ends[base:end].tobytes(),
+            self._content_ends[base:end].tobytes(),
+            self._magnitudes[base:end].tobytes(),
+            record_offsets.tobytes(),
+            json.dumps(self._doc_id_table[base:end]).encode("utf-8"),
+            bytes(records),
+        ]
+        bounds = []
+        pos = _DOCSTORE_HEADER.size
+        for section in sections:
+            bounds.append(pos)
+            pos += len(section) + (-len(section) % 8)
+        bounds.append(pos)
+        body = bytearray(_DOCSTORE_HEADER.pack(b"KDST", _SEGMENT_VERSION, base, end - base, *bounds))
+        for section in sections:
+            body += section
+            body += bytes(-len(body) % 8)
+        _write_file(path + ".dst", body)
+        _write_file(path + ".del", _range_bits(deleted, base, end - base))
+
+        return _DiskSegment(self._directory, name, self._doc_id_table, self._doc_lens)
+
+    def _commit(self):
+        # Called with _lock held, on the writer. Persists tombstones and the
+        # segment list; the manifest is replaced atomically, so a crash leaves
+        # the old or the new set of segments. Unlisted segment files go.
+        deleted = bytes(self._deleted)
+        disk = [s for s in self._segments if isinstance(s, _DiskSegment)]
+        for segment in disk:
+            bits = _range_bits(deleted, segment.base, segment.end - segment.base)
+            if bits != segment.tombstones:
+                _write_file(os.path.join(self._directory, segment.name + ".del"), bits)
+                segment.tombstones = bits
+        manifest = {
+            "version": _SEGMENT_VERSION,
+            "next_segment": self._next_segment,
+            "segments": [{"name": s.name, "base": s.base, "end": s.end} for s in disk],
+        }
+        _write_file(os.path.join(self._directory, _MANIFEST), json.dumps(manifest).encode("utf-8"))
+
+        names = {s.name for s in disk}
+        for entry in os.listdir(self._directory):
+            stem, ext = os.path.splitext(entry)
+            if ext in _SEGMENT_FILES and stem not in names:
+                os.remove(os.path.join(self._directory, entry))
+
+    def _commit_locked(self):
+        with self._lock:
+            self._commit()
+
+    def flush(self):
+        # Write the in-memory segment and the current tombstones to disk and
+        # wait for background flushes and merges to finish
+        if self._directory is None:
+            return
+        self._seal()
+        self._submit(self._commit_locked)
+        self._wait()
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
@@ -0,0 +1,65 @@
+"""
+Bytes-per-posting benchmark for the inverted index.
+
+Indexes a synthetic Zipf-distributed corpus and compares the compact
+PostingList layout against the legacy one-dict-per-posting layout
+({'doc_id', 'tf', 'pos'}), whose size is measured by materialising each
+term's legacy postings with sys.getsizeof and discarding them again.
+
+Usage:
+    PYTHONPATH=repository_after python tests/benchmark_index_memory.py --docs 1000000
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+
+from main import Document, OptimizedSearchEngine
+
+
+def build_corpus(engine, docs, vocab_size, words_per_doc, seed):
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(vocab_size)]
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(vocab_size)))
+    for doc_id in range(docs):
+        words = rng.choices(vocab, cum_weights=cum_weights, k=words_per_doc)
+        engine.add_document(Document(doc_id, f"title {doc_id}", " ".join(words)))
+
+
+def legacy_posting_bytes(postings):
+    # Deep size of the list-of-dicts layout this index used to keep per term
+    total = sys.getsizeof([None] * len(postings))
+    for posting in postings:
+        total += sys.getsizeof(posting)
+        total += sys.getsizeof(posting['doc_id']) + sys.getsizeof(posting['tf'])
+        pos = posting['pos']
+        total += sys.getsizeof(pos) + sum(sys.getsizeof(p) for p in pos if p > 256)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=1000000)
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--words", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = OptimizedSearchEngine()
+    start = time.perf_counter()
+    build_corpus(engine, args.docs, args.vocab, args.words, args.seed)
+    print(f"indexed {args.docs} docs in {time.perf_counter() - start:.1f}s")
+
+    memory = engine.get_index_memory()
+    legacy = sum(legacy_posting_bytes(p) for p in engine.index.values())
+    postings = memory["total_postings"]
+
+    print(f"postings:                 {postings}")
+    print(f"legacy dict postings:     {legacy / postings:8.1f} bytes/posting")
+    print(f"compact PostingList:      {memory['bytes_per_posting']:8.1f} bytes/posting")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Startup benchmark: reopening a segmented index vs re-indexing.
+
+Indexes a synthetic Zipf corpus into an on-disk segmented engine, closes it,
+then compares reopening the directory (mmap) against rebuild_index(), which
+re-tokenizes every document. Also times the first query after reopening.
+
+Usage:
+    PYTHONPATH=repository_after python tests/benchmark_segment_startup.py --docs 200000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_index_memory import build_corpus  # noqa: E402
+from main import OptimizedSearchEngine  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--words", type=int, default=40)
+    parser.add_argument("--flush-docs", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="kurelb-segments-")
+    try:
+        engine = OptimizedSearchEngine(directory=directory, flush_docs=args.flush_docs)
+        start = time.perf_counter()
+        build_corpus(engine, args.docs, args.vocab, args.words, args.seed)
+        engine.close()
+        print(f"indexed + flushed {args.docs} docs in {time.perf_counter() - start:.1f}s "
+              f"({len(engine._segments) - 1} segments)")
+
+        start = time.perf_counter()
+        reopened = OptimizedSearchEngine(directory=directory)
+        open_s = time.perf_counter() - start
+        start = time.perf_counter()
+        first = reopened.search("term0 term7", k=10)
+        query_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        reopened.rebuild_index()
+        rebuild_s = time.perf_counter() - start
+
+        size = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+        print(f"reopen (mmap):          {open_s * 1000:8.1f} ms")
+        print(f"first top-10 query:     {query_ms:8.1f} ms ({len(first)} results)")
+        print(f"rebuild_index:          {rebuild_s * 1000:8.1f} ms")
+        print(f"on-disk size:           {size / 2**20:8.1f} MiB")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
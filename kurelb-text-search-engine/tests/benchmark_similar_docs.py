@@ -0,0 +1,110 @@
+"""
+Similar-document benchmark: full vector scan vs postings accumulator vs LSH.
+
+Indexes a synthetic Zipf corpus plus lightly edited copies of some of its
+documents, then for each source document compares
+  * the old O(N*T) scan over every doc vector,
+  * find_similar_documents() (postings accumulator, exact),
+  * find_similar_documents(approximate=True) with MinHash and SimHash LSH.
+Recall is the share of exact top-10 neighbours with cosine >= --threshold
+(the near-duplicates) that the approximate lookup also returns.
+
+Usage:
+    PYTHONPATH=repository_after python tests/benchmark_similar_docs.py --docs 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_index_memory import build_corpus  # noqa: E402
+from main import Document, OptimizedSearchEngine  # noqa: E402
+
+
+def full_scan(engine, doc_id):
+    # The pre-accumulator implementation: a sparse dot product per document
+    target = engine.doc_vectors[doc_id]
+    target_mag = engine.doc_magnitudes[doc_id]
+    sims = []
+    for other_id, vector in engine.doc_vectors.items():
+        if other_id == doc_id:
+            continue
+        dot = 0.0
+        for term, count in target.items():
+            if term in vector:
+                dot += count * vector[term]
+        if dot > 0:
+            sims.append((dot / (target_mag * engine.doc_magnitudes[other_id]), other_id))
+    return sorted(sims, key=lambda s: s[0], reverse=True)[:10]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--words", type=int, default=40)
+    parser.add_argument("--probes", type=int, default=50)
+    parser.add_argument("--copies", type=int, default=3, help="edited copies per probe document")
+    parser.add_argument("--edit-rate", type=float, default=0.1)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--minhash-bands", type=int, default=16)
+    parser.add_argument("--simhash-bands", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = OptimizedSearchEngine()
+    build_corpus(engine, args.docs, args.vocab, args.words, args.seed)
+
+    rng = random.Random(args.seed)
+    probes = rng.sample(range(args.docs), args.probes)
+    next_id = args.docs
+    for doc_id in probes:
+        words = engine.documents[doc_id].content.split()
+        for _ in range(args.copies):
+            copy = [f"edit{rng.randrange(args.vocab)}" if rng.random() < args.edit_rate else w for w in words]
+            engine.add_document(Document(next_id, "copy", " ".join(copy)))
+            next_id += 1
+    print(f"indexed {len(engine.documents)} docs ({args.probes} probes x {args.copies} near-duplicates)")
+
+    scan_ms, exact_ms = [], []
+    truth = {}
+    for doc_id in probes:
+        expected, ms = timed(full_scan, engine, doc_id)
+        scan_ms.append(ms)
+        found, ms = timed(engine.find_similar_documents, doc_id)
+        exact_ms.append(ms)
+        assert [r["document"].doc_id for r in found] == [d for _, d in expected]
+        truth[doc_id] = {d for sim, d in expected if sim >= args.threshold}
+    print(f"{'full scan':>18}: p50 {statistics.median(scan_ms):8.2f} ms")
+    print(f"{'accumulator':>18}: p50 {statistics.median(exact_ms):8.2f} ms   (identical results)")
+
+    for method, bands in (("minhash", args.minhash_bands), ("simhash", args.simhash_bands)):
+        _, build_ms = timed(engine.enable_lsh, method, bands=bands)
+        lsh_ms, candidates, hits, total = [], [], 0, 0
+        for doc_id in probes:
+            candidates.append(len(engine._lsh.candidates(engine.doc_vectors[doc_id])))
+            found, ms = timed(engine.find_similar_documents, doc_id, approximate=True)
+            lsh_ms.append(ms)
+            got = {r["document"].doc_id for r in found}
+            hits += len(truth[doc_id] & got)
+            total += len(truth[doc_id])
+        recall = hits / total if total else 1.0
+        print(f"{method + ' LSH':>18}: p50 {statistics.median(lsh_ms):8.2f} ms   "
+              f"recall@cos>={args.threshold}: {recall:.3f}   "
+              f"candidates p50 {statistics.median(candidates):.0f}   "
+              f"({bands} bands, build {build_ms / 1000:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
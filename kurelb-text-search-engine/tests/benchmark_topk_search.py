@@ -0,0 +1,66 @@
+"""
+Top-k vs full-ranking latency benchmark.
+
+Builds the same synthetic Zipf corpus as benchmark_index_memory.py and times
+search(query) against search(query, k=K) on queries made of common terms,
+checking that the top-k answer equals the head of the full ranking.
+
+Usage:
+    PYTHONPATH=repository_after python tests/benchmark_topk_search.py --docs 100000 --k 10
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_index_memory import build_corpus  # noqa: E402
+from main import OptimizedSearchEngine  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--words", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--common", type=int, default=50, help="draw query terms from the N most frequent")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = OptimizedSearchEngine()
+    start = time.perf_counter()
+    build_corpus(engine, args.docs, args.vocab, args.words, args.seed)
+    print(f"indexed {args.docs} docs in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(args.seed)
+    queries = [" ".join(f"term{rng.randrange(args.common)}" for _ in range(rng.randint(1, 3)))
+               for _ in range(args.queries)]
+
+    full_ms, topk_ms = [], []
+    for query in queries:
+        start = time.perf_counter()
+        full = engine.search(query)
+        full_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        top = engine.search(query, k=args.k)
+        topk_ms.append((time.perf_counter() - start) * 1000)
+        assert [(r["document"].doc_id, r["score"]) for r in top] == \
+               [(r["document"].doc_id, r["score"]) for r in full[:args.k]], query
+
+    for label, samples in (("full", full_ms), (f"top-{args.k}", topk_ms)):
+        print(f"{label:>8}: p50 {statistics.median(samples):7.2f} ms   p99 {percentile(samples, 99):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -137,7 +137,8 @@ def test_inverted_index_structure(populated_engine):
     assert "python" in populated_engine.index, "Index should contain the term 'python'"
 
     postings = populated_engine.index["python"]
-    assert isinstance(postings, list), "Index entries must be a list of postings"
+    assert hasattr(postings, "__getitem__") and hasattr(postings, "__len__"), \
+        "Index entries must be an indexable sequence of postings"
     assert len(postings) > 0, "Postings list should not be empty"
 
     first_posting = postings[0]
@@ -314,4 +315,286 @@ def test_remove_document_keeps_index_consistent(engine):
 
     engine.remove_document(1)
     assert len(engine.search("beta")) == 1
-    assert len(engine.search("alpha")) == 0
\ No newline at end of file
+    assert len(engine.search("alpha")) == 0
+
+def test_posting_list_round_trip():
+    """
+    Compact postings decode to the same doc ids, tfs and positions, across skip blocks.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    id_table = [f"doc-{i}" for i in range(0, 100000, 7)]
+    postings = engine_module.PostingList(id_table)
+    expected = []
+    for num in range(0, len(id_table), 3):
+        positions = [num % 5, num % 5 + 200, num % 5 + 70000]
+        postings.append(num, len(positions), positions)
+        expected.append({'doc_id': id_table[num], 'tf': 3, 'pos': positions})
+
+    assert len(postings) == len(expected)
+    assert list(postings) == expected
+    assert postings[0] == expected[0]
+    assert postings[300] == expected[300]
+    assert postings[-1] == expected[-1]
+
+    # Doc number 3 is the second posting
+    assert postings.remove(3)
+    assert not postings.remove(3)
+    assert list(postings) == expected[:1] + expected[2:]
+
+
+def test_compact_index_matches_search_results(engine):
+    """
+    Scores, ordering and index stats are unchanged by the compact posting layout.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    rng = random.Random(7)
+    vocab = ["alpha", "beta", "gamma", "delta", "search", "engine", "python", "index"]
+    for i in range(300):
+        words = [rng.choice(vocab) for _ in range(rng.randint(3, 30))]
+        engine.add_document(Document(i, f"Doc {i}", " ".join(words)))
+    engine.remove_document(5)
+    engine.add_document(Document(7, "Doc 7", "alpha alpha beta"))
+
+    results = engine.search("alpha engine")
+    expected = {}
+    for doc in engine.documents.values():
+        vector = engine.doc_vectors[doc.doc_id]
+        score = 0.0
+        for term in (engine._stem_word("alpha"), engine._stem_word("engine")):
+            if term in vector and doc.word_count:
+                idf = engine.idf_cache[term] + engine._idf_offset
+                score += vector[term] / doc.word_count * idf * 100
+        if score:
+            expected[doc.doc_id] = score
+
+    assert {r["document"].doc_id: r["score"] for r in results} == pytest.approx(expected)
+    scores = [r["score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+    stats = engine.get_index_stats()
+    assert stats["total_documents"] == 299
+    assert stats["total_postings"] == sum(len(v) for v in engine.doc_vectors.values())
+
+    memory = engine.get_index_memory()
+    assert memory["total_postings"] == stats["total_postings"]
+    assert 0 < memory["bytes_per_posting"] < 32
+
+
+def test_top_k_search_matches_full_search(engine):
+    """
+    search(query, k) returns exactly the first k results of the full ranking.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    rng = random.Random(11)
+    vocab = [f"w{i}" for i in range(30)]
+    for i in range(1500):
+        words = [rng.choice(vocab[:rng.randint(1, 30)]) for _ in range(rng.randint(1, 25))]
+        engine.add_document(Document(i, f"Doc {i}", " ".join(words)))
+    for i in range(0, 1500, 41):
+        engine.remove_document(i)
+
+    for _ in range(40):
+        query = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 4)))
+        for k in (1, 10, 50):
+            full = [(r["document"].doc_id, r["score"]) for r in engine.search(query)[:k]]
+            top = [(r["document"].doc_id, r["score"]) for r in engine.search(query, k=k)]
+            assert top == full
+    assert engine.search("w1", k=0) == []
+
+
+def test_phrase_and_proximity_from_positions(engine):
+    """
+    Phrase and "a b"~N proximity queries are answered from stored positions.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    engine.add_document(Document(1, "Machine learning", "Deep machine learning models."))
+    engine.add_document(Document(2, "Notes", "Learning about the machine."))
+    engine.add_document(Document(3, "Notes", "machine vision and statistical learning"))
+    engine.add_document(Document(4, "Notes", "machine of learning", tags=["machine learning"]))
+
+    # Documents are never re-read: a phrase query must not touch the text
+    for doc in engine.documents.values():
+        doc.content = doc.title = None
+
+    results = engine.search_phrase("machine learning")
+    assert [(r["document"].doc_id, r["score"], r["matches"]) for r in results] == [(1, 4, 2), (4, 1, 1)]
+
+    # Word order matters, stopwords are skipped like at index time
+    assert [r["document"].doc_id for r in engine.search_phrase("learning machine")] == []
+    assert [r["document"].doc_id for r in engine.search_phrase("learning about machine")] == [2]
+
+    # Proximity: up to N extra tokens in total across the phrase
+    assert {r["document"].doc_id for r in engine.search_phrase('"machine learning"~1')} == {1, 4}
+    assert {r["document"].doc_id for r in engine.search_phrase('"machine learning"~2')} == {1, 3, 4}
+    assert {r["document"].doc_id for r in engine.search_phrase("machine learning", slop=2)} == {1, 3, 4}
+
+    # Slop is not per gap: each gap here is 1 token, but the span has 2 extra
+    engine.add_document(Document(5, "Colors", "red cat green dog blue"))
+    assert [r["document"].doc_id for r in engine.search_phrase('"red green blue"~1')] == []
+    assert [r["document"].doc_id for r in engine.search_phrase('"red green blue"~2')] == [5]
+
+
+def test_in_memory_updates_do_not_accumulate_tombstones(engine):
+    """
+    Repeatedly updating documents in memory keeps postings, per-doc tables
+    and posting memory bounded, and index views only show live documents.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    engine.add_document(Document("other", "Other", "alpha omega"))
+    for i in range(20000):
+        engine.add_document(Document("hot", "Hot", f"alpha beta v{i % 7}"))
+
+    assert len(engine.index["alpha"]) == 2
+    assert sorted(p["doc_id"] for p in engine.index["alpha"]) == ["hot", "other"]
+    assert len(engine._doc_id_table) <= 2 * engine.COMPACT_MIN_TOMBSTONES
+    memory = engine.get_index_memory()
+    assert memory["stored_postings"] <= 4 * len(engine._doc_id_table)  # 4 terms per doc
+    assert memory["posting_bytes"] < 100_000
+
+    # Results are unchanged by compaction
+    assert {r["document"].doc_id for r in engine.search("alpha")} == {"hot", "other"}
+    assert [r["document"].doc_id for r in engine.search("beta", k=5)] == ["hot"]
+    assert [r["document"].doc_id for r in engine.search_phrase("alpha beta")] == ["hot"]
+    assert [r["document"].doc_id for r in engine.find_similar_documents("other")] == ["hot"]
+
+    engine.remove_document("hot")
+    assert [p["doc_id"] for p in engine.index["alpha"]] == ["other"]
+    assert "beta" not in engine.index
+
+
+def test_segmented_index_persists_and_reopens(tmp_path):
+    """
+    On-disk segments (flushed and merged in the background, deletes as
+    tombstones) answer like the in-memory index, before and after reopening.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    rng = random.Random(3)
+    vocab = ["alpha", "beta", "gamma", "delta", "search", "engine", "python", "index", "store"]
+
+    def make_doc(doc_id):
+        words = [rng.choice(vocab) for _ in range(rng.randint(2, 20))]
+        return Document(doc_id, f"Doc {doc_id}", " ".join(words), [rng.choice(vocab)])
+
+    memory = SearchEngine()
+    disk = SearchEngine(directory=str(tmp_path), flush_docs=40, merge_factor=3)
+    for i in range(400):
+        doc = make_doc(i % 330)
+        memory.add_document(doc)
+        disk.add_document(doc)
+        if i % 23 == 0:
+            memory.remove_document(i // 2)
+            disk.remove_document(i // 2)
+
+    def snapshot(eng):
+        return (
+            [(r["document"].doc_id, r["score"]) for r in eng.search("alpha python store")],
+            [(r["document"].doc_id, r["score"]) for r in eng.search("beta engine", k=7)],
+            [(r["document"].doc_id, r["matches"]) for r in eng.search_phrase('"search engine"~1')],
+            sorted(eng.documents),
+            eng.get_index_stats(),
+        )
+
+    def assert_same(a, b):
+        for left, right in zip(a[:3], b[:3]):
+            assert [d for d, _ in left] == [d for d, _ in right]
+            assert [v for _, v in left] == pytest.approx([v for _, v in right])
+        assert a[3:] == b[3:]
+
+    expected = snapshot(memory)
+    assert_same(snapshot(disk), expected)
+    disk.close()
+    assert len(list(tmp_path.glob("*.pst"))) < 400 // 40
+
+    reopened = SearchEngine(directory=str(tmp_path))
+    assert_same(snapshot(reopened), expected)
+    assert reopened.get_document_stats(5)["total_words"] == memory.get_document_stats(5)["total_words"]
+
+    # Updates and deletes of stored docs go through tombstones
+    for eng in (memory, reopened):
+        eng.add_document(Document(7, "Doc 7", "python store python"))
+        eng.remove_document(11)
+    assert_same(snapshot(reopened), snapshot(memory))
+    reopened.close()
+    assert_same(snapshot(SearchEngine(directory=str(tmp_path))), snapshot(memory))
+
+
+def test_similar_documents_from_postings_and_lsh(engine):
+    """
+    Accumulator cosine similarity matches a full sparse scan; LSH lookups
+    find near-duplicates.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    rng = random.Random(5)
+    vocab = [f"w{i}" for i in range(200)]
+    for i in range(400):
+        words = [rng.choice(vocab[:rng.randint(5, 200)]) for _ in range(rng.randint(5, 40))]
+        engine.add_document(Document(i, f"Doc {i}", " ".join(words)))
+    for i in range(0, 400, 17):
+        engine.remove_document(i)
+
+    def brute_force(doc_id):
+        target = engine.doc_vectors[doc_id]
+        sims = []
+        for other_id, vector in engine.doc_vectors.items():
+            if other_id == doc_id:
+                continue
+            dot = sum(count * vector[t] for t, count in target.items() if t in vector)
+            if dot > 0:
+                sims.append((other_id, dot / (engine.doc_magnitudes[doc_id] * engine.doc_magnitudes[other_id])))
+        return sorted(sims, key=lambda s: s[1], reverse=True)[:10]
+
+    for doc_id in (1, 2, 50, 399):
+        found = [(r["document"].doc_id, r["similarity"]) for r in engine.find_similar_documents(doc_id)]
+        assert found == pytest.approx(brute_force(doc_id))
+
+    # A lightly edited copy lands in the same LSH buckets as its source
+    source = engine.documents[50].content.split()
+    copy = source[:]
+    copy[len(copy) // 2] = "edited"
+    engine.add_document(Document(1000, "Copy", " ".join(copy)))
+    for method in ("minhash", "simhash"):
+        engine.enable_lsh(method)
+        results = engine.find_similar_documents(1000, approximate=True)
+        assert results and results[0]["document"].doc_id == 50
+    with pytest.raises(ValueError):
+        engine.enable_lsh("bogus")
+
+
+def test_lsh_lookup_skips_deleted_and_updated_docs(engine):
+    """
+    Approximate lookups ignore doc numbers left in LSH buckets by deletes
+    and updates.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    for method in ("minhash", "simhash"):
+        eng = SearchEngine()
+        eng.enable_lsh(method)
+        eng.add_document(Document("a", "Same", "python search engine index"))
+        eng.add_document(Document("b", "Same", "python search engine index"))
+        eng.add_document(Document("c", "Same", "python search engine index"))
+
+        # Update: the old doc number of "b" stays in its buckets
+        eng.add_document(Document("b", "Same", "python search engine index"))
+        found = [r["document"].doc_id for r in eng.find_similar_documents("a", approximate=True)]
+        assert sorted(found) == ["b", "c"]
+
+        # Delete
+        eng.remove_document("c")
+        found = [r["document"].doc_id for r in eng.find_similar_documents("a", approximate=True)]
+        assert found == ["b"]
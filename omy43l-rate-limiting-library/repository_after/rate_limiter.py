@@ -7,7 +7,7 @@ import asyncio
 import functools
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional, Callable, Deque, Union
+from typing import Dict, Any, List, Optional, Callable, Deque
 from collections import deque
 
 @dataclass
@@ -25,6 +25,69 @@ class RateLimitExceeded(Exception):
         self.limiter_name = limiter_name
         super().__init__(f"Rate limit exceeded for client {client_id} on {limiter_name}. Retry after {limit_result.retry_after}s")
 
+class _TimingWheel:
+    """
+    Hierarchical timing wheel of keys due at integer ticks.
+
+    Level k has `slots` buckets each spanning slots**k ticks, so scheduling and
+    firing are O(1) per key. Only keys are stored: a coarse bucket is returned
+    whole when the wheel reaches its first tick, i.e. up to one bucket span
+    early, and keys due beyond the wheel's range are parked in its furthest
+    bucket. Callers re-check fired keys and reschedule the ones not yet due,
+    which moves them to a finer level.
+    """
+    def __init__(self, current_tick: int, slots: int = 64, levels: int = 4):
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels: List[Dict[int, List[str]]] = [{} for _ in range(levels)]
+        self._current = current_tick
+
+    def schedule(self, key: str, tick: int):
+        top = len(self._levels) - 1
+        delta = min(max(tick - self._current, 1), (1 << (self._bits * (top + 1))) - 1)
+        level = 0
+        while level < top and delta >> (self._bits * (level + 1)):
+            level += 1
+        slot = ((self._current + delta) >> (self._bits * level)) & self._mask
+        self._levels[level].setdefault(slot, []).append(key)
+
+    def advance(self, tick: int) -> List[str]:
+        """Move the wheel up to `tick` and return the keys that fell due."""
+        due: List[str] = []
+        while self._current < tick:
+            self._current += 1
+            for level in range(1, len(self._levels)):
+                if self._current & ((1 << (self._bits * level)) - 1):
+                    break
+                slot = (self._current >> (self._bits * level)) & self._mask
+                due.extend(self._levels[level].pop(slot, ()))
+            due.extend(self._levels[0].pop(self._current & self._mask, ()))
+        return due
+
+
+class _Shard:
+    """
+    A lock plus the client states it guards.
+
+    Each state is a list whose first element is the client's last access time
+    (time.monotonic); the rest is algorithm specific. Every tracked client sits
+    in the shard's timing wheel exactly once.
+    """
+    __slots__ = ("lock", "clients", "wheel")
+
+    def __init__(self, current_tick: int):
+        self.lock = threading.Lock()
+        self.clients: Dict[str, list] = {}
+        self.wheel = _TimingWheel(current_tick)
+
+    def __enter__(self):
+        self.lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.lock.release()
+
+
 class RateLimiter(ABC):
     """
     Base class for all rate limiting algorithms.
@@ -40,43 +103,66 @@ class RateLimiter(ABC):
     In a typical high-throughput system, this allows hundreds of concurrent threads to operate 
     with minimal collision probability (assuming a uniform distribution of client IDs), 
     while keeping the memory overhead of the locks manageable (around 64KB on most systems).
+
+    Expiry:
+    Client state lives in its shard together with its last access time. Each shard keeps a
+    coarse timing wheel keyed by expiry tick, so the janitor only visits clients whose TTL may
+    have run out. A client accessed since it was scheduled is simply rescheduled when its tick
+    fires, which keeps try_acquire free of any expiry bookkeeping. Every limiter accepts a `ttl`
+    (seconds of inactivity before a client's state is dropped, default one hour); the wheel
+    resolution is derived from it.
     """
     def __init__(self, shard_count: int = 1024, ttl: float = 3600.0):
         # Implementation of Lock Sharding to prevent master lock bottleneck
         self._shard_count = shard_count
-        self._shards = [threading.Lock() for _ in range(shard_count)]
-        self._last_access: Dict[str, float] = {}
         self._ttl = ttl
+        self._resolution = min(1.0, ttl / 2)
+        self._origin = time.monotonic()
+        self._shards = [_Shard(0) for _ in range(shard_count)]
         
         # Background Janitor to prevent O(n) memory exhaustion
         self._stop_janitor = threading.Event()
         self._janitor = threading.Thread(target=self._run_janitor, daemon=True)
         self._janitor.start()
 
-    def _get_shard(self, client_id: str) -> threading.Lock:
+    def _get_shard(self, client_id: str) -> _Shard:
         return self._shards[abs(hash(client_id)) % self._shard_count]
 
-    def _run_janitor(self):
-        """Thread-safe background pruning of stale client states."""
-        while not self._stop_janitor.is_set():
-            # Check every second or half the TTL, whichever is smaller
-            time.sleep(min(1.0, self._ttl / 2))
-            now = time.time()
-            
-            # Snapshot keys to avoid 'dict changed size during iteration'
-            for cid in list(self._last_access.keys()):
-                if now - self._last_access.get(cid, 0) > self._ttl:
-                    shard = self._get_shard(cid)
-                    with shard:
-                        # Double-check inside lock
-                        if now - self._last_access.get(cid, 0) > self._ttl:
-                            self._cleanup_client(cid)
-                            self._last_access.pop(cid, None)
+    def _get_state(self, shard: _Shard, client_id: str, now: float, default: Callable[[], list]) -> list:
+        """Return client_id's state, stamped with access time `now`. Caller holds the shard lock."""
+        state = shard.clients.get(client_id)
+        if state is None:
+            state = shard.clients[client_id] = default()
+            shard.wheel.schedule(client_id, self._expiry_tick(now + self._ttl))
+        state[0] = now
+        return state
 
-    @abstractmethod
-    def _cleanup_client(self, client_id: str):
-        """Algorithm-specific state removal."""
-        pass
+    def _expiry_tick(self, deadline: float) -> int:
+        return math.ceil((deadline - self._origin) / self._resolution)
+
+    @property
+    def active_clients(self) -> int:
+        """Number of clients currently holding state."""
+        return sum(len(shard.clients) for shard in self._shards)
+
+    def _run_janitor(self):
+        """Background expiry of stale client states, driven by the shard timing wheels."""
+        # Check every second or half the TTL, whichever is smaller
+        while not self._stop_janitor.wait(self._resolution):
+            now = time.monotonic()
+            tick = int((now - self._origin) / self._resolution)
+            for shard in self._shards:
+                with shard:
+                    for cid in shard.wheel.advance(tick):
+                        state = shard.clients.get(cid)
+                        if state is None:
+                            continue
+                        deadline = state[0] + self._ttl
+                        if deadline <= now:
+                            del shard.clients[cid]
+                        else:
+                            # Accessed since it was scheduled
+                            shard.wheel.schedule(cid, self._expiry_tick(deadline))
 
     @abstractmethod
     def is_allowed(self, client_id: str) -> bool:
@@ -108,14 +194,10 @@ class TokenBucketLimiter(RateLimiter):
     
     Inherits lock sharding from RateLimiter for thread-safe access to client buckets.
     """
-    def __init__(self, capacity: int, refill_rate: float):
-        super().__init__()
+    def __init__(self, capacity: int, refill_rate: float, ttl: float = 3600.0):
+        super().__init__(ttl=ttl)
         self._capacity = capacity
         self._refill_rate = refill_rate
-        self._client_states: Dict[str, List[float]] = {}
-
-    def _cleanup_client(self, client_id: str):
-        self._client_states.pop(client_id, None)
 
     def is_allowed(self, client_id: str) -> bool:
         return self.try_acquire(client_id).allowed
@@ -125,10 +207,9 @@ class TokenBucketLimiter(RateLimiter):
         with shard:
             now = time.monotonic()
             unix_now = time.time()
-            self._last_access[client_id] = unix_now
-            
-            state = self._client_states.get(client_id, [float(self._capacity), now])
-            tokens, last_update = state
+            # State: [last_access, tokens, last_update]
+            state = self._get_state(shard, client_id, now, lambda: [now, float(self._capacity), now])
+            _, tokens, last_update = state
             
             elapsed = now - last_update
             tokens = min(float(self._capacity), tokens + (elapsed * self._refill_rate))
@@ -137,7 +218,7 @@ class TokenBucketLimiter(RateLimiter):
             if allowed:
                 tokens -= 1.0
             
-            self._client_states[client_id] = [tokens, now]
+            state[1], state[2] = tokens, now
             remaining = int(math.floor(tokens))
             retry_after = (1.0 - tokens) / self._refill_rate if not allowed else 0.0
             reset_at = unix_now + retry_after if not allowed else unix_now
@@ -159,14 +240,10 @@ class SlidingWindowLogLimiter(RateLimiter):
     
     Inherits lock sharding from RateLimiter for thread-safe log manipulation.
     """
-    def __init__(self, limit: int, window_size: float):
-        super().__init__()
+    def __init__(self, limit: int, window_size: float, ttl: float = 3600.0):
+        super().__init__(ttl=ttl)
         self._limit = limit
         self._window_size = window_size
-        self._client_logs: Dict[str, Deque[float]] = {}
-
-    def _cleanup_client(self, client_id: str):
-        self._client_logs.pop(client_id, None)
 
     def is_allowed(self, client_id: str) -> bool:
         return self.try_acquire(client_id).allowed
@@ -176,9 +253,8 @@ class SlidingWindowLogLimiter(RateLimiter):
         with shard:
             now = time.monotonic()
             unix_now = time.time()
-            self._last_access[client_id] = unix_now
-            
-            log = self._client_logs.setdefault(client_id, deque())
+            # State: [last_access, log of request times]
+            log: Deque[float] = self._get_state(shard, client_id, now, lambda: [now, deque()])[1]
             while log and log[0] <= now - self._window_size:
                 log.popleft()
             
@@ -208,15 +284,11 @@ class FixedWindowLimiter(RateLimiter):
     
     Inherits lock sharding from RateLimiter for thread-safe counter updates.
     """
-    def __init__(self, limit: int, window_size: float, use_sliding_approximation: bool = False):
-        super().__init__()
+    def __init__(self, limit: int, window_size: float, use_sliding_approximation: bool = False, ttl: float = 3600.0):
+        super().__init__(ttl=ttl)
         self._limit = limit
         self._window_size = window_size
         self._use_sliding_approximation = use_sliding_approximation
-        self._client_states: Dict[str, List[Union[float, int]]] = {}
-
-    def _cleanup_client(self, client_id: str):
-        self._client_states.pop(client_id, None)
 
     def is_allowed(self, client_id: str) -> bool:
         return self.try_acquire(client_id).allowed
@@ -225,11 +297,11 @@ class FixedWindowLimiter(RateLimiter):
         shard = self._get_shard(client_id)
         with shard:
             now = time.time()
-            self._last_access[client_id] = now
             window_start = math.floor(now / self._window_size) * self._window_size
             
-            state = self._client_states.get(client_id, [window_start, 0, 0])
-            w_start, count, prev_count = state
+            # State: [last_access, window_start, count, prev_count]
+            state = self._get_state(shard, client_id, time.monotonic(), lambda: [0.0, window_start, 0, 0])
+            _, w_start, count, prev_count = state
             
             if w_start != window_start:
                 prev_count = count if w_start == window_start - self._window_size else 0
@@ -246,7 +318,7 @@ class FixedWindowLimiter(RateLimiter):
                 count += 1
                 effective_count += 1
             
-            self._client_states[client_id] = [w_start, count, prev_count]
+            state[1:] = w_start, count, prev_count
             remaining = int(max(0, self._limit - math.floor(effective_count)))
             reset_at = window_start + self._window_size
             retry_after = max(0.0, reset_at - now) if not allowed else 0.0
@@ -260,6 +332,130 @@ class FixedWindowLimiter(RateLimiter):
     def current_config(self) -> Dict[str, Any]:
         return {"algorithm": "fixed_window", "limit": self._limit, "window_size": self._window_size, "sliding_approximation": self._use_sliding_approximation}
 
+class GCRALimiter(RateLimiter):
+    """
+    Generic Cell Rate Algorithm.
+    Requests are spaced by an emission interval of window_size / limit, with a burst
+    tolerance that admits up to `limit` back-to-back requests. The only per-client state
+    is the theoretical arrival time (TAT) of the next request, so memory is O(1) per client
+    and the admitted traffic matches a token bucket of capacity `limit` refilled at
+    limit / window_size.
+    
+    Inherits lock sharding from RateLimiter for thread-safe TAT updates.
+    """
+    def __init__(self, limit: int, window_size: float, ttl: float = 3600.0):
+        super().__init__(ttl=ttl)
+        self._limit = limit
+        self._window_size = window_size
+        self._interval = window_size / limit
+
+    def is_allowed(self, client_id: str) -> bool:
+        return self.try_acquire(client_id).allowed
+
+    def try_acquire(self, client_id: str) -> RateLimitResult:
+        shard = self._get_shard(client_id)
+        with shard:
+            now = time.monotonic()
+            unix_now = time.time()
+            # State: [last_access, tat]
+            state = self._get_state(shard, client_id, now, lambda: [now, now])
+            tat = max(state[1], now)
+            
+            new_tat = tat + self._interval
+            # Small slack so float error never rejects the last request of a burst
+            allowed = new_tat - now <= self._window_size + 1e-9
+            if allowed:
+                tat = new_tat
+                state[1] = tat
+            
+            remaining = int(max(0.0, self._window_size - (tat - now)) / self._interval + 1e-9)
+            retry_after = max(0.0, new_tat - self._window_size - now) if not allowed else 0.0
+            reset_at = unix_now + (tat - now)
+            
+            return RateLimitResult(allowed, remaining, self._limit, reset_at, retry_after)
+
+    @property
+    def algorithm_name(self) -> str: return "gcra"
+
+    @property
+    def current_config(self) -> Dict[str, Any]:
+        return {"algorithm": "gcra", "limit": self._limit, "window_size": self._window_size}
+
+class SlidingWindowCounterLimiter(RateLimiter):
+    """
+    Sliding Window Counter algorithm.
+    Splits window_size into `buckets` sub-windows and keeps one counter per sub-window. A
+    request is admitted while the sum over every sub-window the sliding window touches (the
+    current one plus the previous `buckets`) is under `limit`. That sum never undercounts the
+    requests in the last window_size seconds, so no interval of window_size ever admits more
+    than `limit`, with memory of buckets + 1 counters per client instead of a timestamp per
+    request. The price is rejecting early: requests stay counted for up to one sub-window
+    (window_size / buckets) longer than the exact log would keep them.
+
+    Unlike FixedWindowLimiter's sliding approximation, which estimates the previous window's
+    share and can admit up to about 2 * limit across a window boundary, the bound is strict.
+    
+    Inherits lock sharding from RateLimiter for thread-safe counter updates.
+    """
+    def __init__(self, limit: int, window_size: float, buckets: int = 10, ttl: float = 3600.0):
+        super().__init__(ttl=ttl)
+        self._limit = limit
+        self._window_size = window_size
+        self._buckets = buckets
+        self._bucket_size = window_size / buckets
+
+    def is_allowed(self, client_id: str) -> bool:
+        return self.try_acquire(client_id).allowed
+
+    def try_acquire(self, client_id: str) -> RateLimitResult:
+        shard = self._get_shard(client_id)
+        with shard:
+            now = time.monotonic()
+            unix_now = time.time()
+            bucket = int(now / self._bucket_size)
+            slots = self._buckets + 1
+            
+            # State: [last_access, newest bucket, ring of bucket counts, total]
+            state = self._get_state(shard, client_id, now, lambda: [now, bucket, [0] * slots, 0])
+            _, head, counts, total = state
+            
+            # Zero the ring slots of buckets that slid out of the window
+            if bucket - head >= slots:
+                counts[:] = [0] * slots
+                total = 0
+            else:
+                for b in range(head + 1, bucket + 1):
+                    total -= counts[b % slots]
+                    counts[b % slots] = 0
+            
+            allowed = total < self._limit
+            if allowed:
+                counts[bucket % slots] += 1
+                total += 1
+            
+            state[1], state[3] = bucket, total
+            remaining = max(0, self._limit - total)
+            
+            retry_after = 0.0
+            if not allowed:
+                # Bucket b stops counting once b + 1 is the oldest bucket of the window
+                freed = 0
+                for b in range(bucket - self._buckets, bucket + 1):
+                    freed += counts[b % slots]
+                    if total - freed < self._limit:
+                        retry_after = max(0.0, (b + slots) * self._bucket_size - now)
+                        break
+            reset_at = unix_now + ((bucket + slots) * self._bucket_size - now)
+            
+            return RateLimitResult(allowed, remaining, self._limit, reset_at, retry_after)
+
+    @property
+    def algorithm_name(self) -> str: return "sliding_window_counter"
+
+    @property
+    def current_config(self) -> Dict[str, Any]:
+        return {"algorithm": "sliding_window_counter", "limit": self._limit, "window_size": self._window_size, "buckets": self._buckets}
+
 class RateLimiterFactory:
     @classmethod
     def create(cls, config: Dict[str, Any]) -> RateLimiter:
@@ -300,6 +496,20 @@ class RateLimiterFactory:
                  
             return FixedWindowLimiter(int(config["limit"]), float(config["window_size"]), sliding_approx)
             
+        if algo in ("gcra", "sliding_window_counter"):
+            for key in ["limit", "window_size"]:
+                if key not in config:
+                    raise ValueError(f"Missing required key '{key}' for {algo} algorithm")
+                if not isinstance(config[key], (int, float)):
+                    raise ValueError(f"Invalid type for '{key}': expected int or float, got {type(config[key]).__name__}")
+            if algo == "gcra":
+                return GCRALimiter(int(config["limit"]), float(config["window_size"]))
+            
+            buckets = config.get("buckets", 10)
+            if not isinstance(buckets, int) or isinstance(buckets, bool) or buckets < 1:
+                raise ValueError(f"Invalid value for 'buckets': expected a positive int, got {buckets!r}")
+            return SlidingWindowCounterLimiter(int(config["limit"]), float(config["window_size"]), buckets)
+            
         raise ValueError(f"Unknown algorithm: {algo}")
 
     @classmethod
@@ -1,4 +1,5 @@
 import time
+import math
 import threading
 import pytest
 import uuid
@@ -9,10 +10,13 @@ from repository_after.rate_limiter import (
     TokenBucketLimiter,
     SlidingWindowLogLimiter,
     FixedWindowLimiter,
+    GCRALimiter,
+    SlidingWindowCounterLimiter,
     RateLimiterFactory,
     RateLimitExceeded,
     rate_limit,
-    RateLimitContext
+    RateLimitContext,
+    _TimingWheel
 )
 
 def test_token_bucket_burst():
@@ -342,7 +346,7 @@ def test_memory_plateau():
     time.sleep(1.0) # Wait for janitor
     
     # Registry should be pruned
-    active_clients = len(limiter._last_access)
+    active_clients = limiter.active_clients
     assert active_clients < 1000
 
 def test_lock_throughput():
@@ -400,8 +404,138 @@ def test_memory_10k_clients():
     assert limiter.is_allowed(clients[-1]) is True
     
     # Check state size (implementation detail check)
-    # Note: _client_states might be cleaned up if we wait, but here we just want to ensure it doesn't crash
-    assert len(limiter._client_states) >= 10000
+    # Note: client states might be cleaned up if we wait, but here we just want to ensure it doesn't crash
+    assert limiter.active_clients >= 10000
+
+def test_timing_wheel_fires_keys_at_their_tick():
+    """Keys fire no later than their tick, and exactly on it once rescheduled."""
+    import random
+    rng = random.Random(7)
+    wheel = _TimingWheel(0, slots=8, levels=3)
+    due_at = {f"k{i}": rng.randint(1, 2000) for i in range(500)}
+    for key, tick in due_at.items():
+        wheel.schedule(key, tick)
+
+    fired = {}
+    for tick in range(1, 2001):
+        for key in wheel.advance(tick):
+            assert tick <= due_at[key]
+            if tick < due_at[key]:
+                wheel.schedule(key, due_at[key])
+            else:
+                fired[key] = tick
+    assert fired == due_at
+
+def test_timing_wheel_skips_far_keys():
+    """Advancing a little does not touch keys that are due much later."""
+    wheel = _TimingWheel(0)
+    for i in range(1000):
+        wheel.schedule(f"k{i}", 3600 + i)
+    assert wheel.advance(60) == []
+
+def test_janitor_keeps_active_clients():
+    """Idle clients expire while clients in use keep their state."""
+    limiter = TokenBucketLimiter(capacity=20, refill_rate=0.001, ttl=0.3)
+    for i in range(100):
+        limiter.is_allowed(f"idle_{i}")
+
+    for _ in range(12):
+        limiter.is_allowed("busy")
+        time.sleep(0.1)
+
+    assert limiter.active_clients == 1
+    # "busy" was never evicted, so its bucket kept draining instead of resetting
+    assert limiter.try_acquire("busy").remaining == 20 - 13
+
+def test_gcra_burst_then_spacing():
+    """GCRA admits a burst of `limit`, then one request per emission interval."""
+    limiter = GCRALimiter(limit=5, window_size=0.5)
+    client_id = "gcra_user"
+
+    results = [limiter.try_acquire(client_id) for _ in range(5)]
+    assert all(r.allowed for r in results)
+    assert [r.remaining for r in results] == [4, 3, 2, 1, 0]
+
+    result = limiter.try_acquire(client_id)
+    assert result.allowed is False
+    # Next slot opens one emission interval (0.1s) later
+    assert 0.05 <= result.retry_after <= 0.1
+
+    time.sleep(result.retry_after + 0.01)
+    assert limiter.is_allowed(client_id) is True
+    assert limiter.is_allowed(client_id) is False
+
+def _fake_clock(monkeypatch, start):
+    clock = [start]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    return clock
+
+def _max_admitted_in_window(admitted, window_size):
+    return max(sum(1 for u in admitted if t - window_size < u <= t) for t in admitted)
+
+def test_sliding_window_counter_bounds_boundary_burst(monkeypatch):
+    """A burst straddling a window boundary cannot exceed `limit` in any window_size interval."""
+    clock = _fake_clock(monkeypatch, float(math.floor(time.monotonic())) + 10.0)
+    base = clock[0]
+    limiter = SlidingWindowCounterLimiter(limit=10, window_size=1.0)
+
+    clock[0] = base + 0.95
+    assert [limiter.is_allowed("swc") for _ in range(11)] == [True] * 10 + [False]
+
+    # Just past the boundary the earlier burst still counts in full
+    clock[0] = base + 1.05
+    result = limiter.try_acquire("swc")
+    assert result.allowed is False
+    # The exact log frees a slot at 1.95; the 0.1s bucket holding the burst expires at 2.0
+    assert 0.9 <= result.retry_after <= 0.95 + 1e-9
+
+    clock[0] += result.retry_after
+    assert [limiter.is_allowed("swc") for _ in range(11)] == [True] * 10 + [False]
+
+def test_sliding_window_counter_worst_case_is_bounded(monkeypatch):
+    """Boundary bursts: the counter holds the limit, the fixed window approximation admits 1.5x."""
+    clock = _fake_clock(monkeypatch, float(math.floor(time.monotonic())) + 10.0)
+    base = clock[0]
+    counter = SlidingWindowCounterLimiter(limit=10, window_size=1.0)
+    approx = FixedWindowLimiter(limit=10, window_size=1.0, use_sliding_approximation=True)
+
+    admitted = {counter: [], approx: []}
+    # Late in one window, then mid-way through the next, where the weighted estimate has decayed
+    for offset in (0.99, 1.5, 1.99, 2.5, 3.2, 3.99, 4.5):
+        clock[0] = base + offset
+        for limiter, times in admitted.items():
+            for _ in range(20):
+                if limiter.is_allowed("burst"):
+                    times.append(clock[0])
+
+    assert _max_admitted_in_window(admitted[counter], 1.0) == 10
+    assert _max_admitted_in_window(admitted[approx], 1.0) == 15
+
+def test_constant_size_client_state():
+    """GCRA and sliding counter state does not grow with the limit."""
+    for limiter in (GCRALimiter(10000, 60.0), SlidingWindowCounterLimiter(10000, 60.0)):
+        for _ in range(5000):
+            limiter.is_allowed("heavy")
+        state = limiter._get_shard("heavy").clients["heavy"]
+        assert len(state) <= 4
+
+def test_factory_new_algorithms():
+    """The factory builds GCRA and sliding window counter limiters."""
+    gcra = RateLimiterFactory.create({"algorithm": "gcra", "limit": 10, "window_size": 1})
+    assert isinstance(gcra, GCRALimiter)
+    assert gcra.current_config == {"algorithm": "gcra", "limit": 10, "window_size": 1.0}
+
+    swc = RateLimiterFactory.create({"algorithm": "sliding_window_counter", "limit": 10, "window_size": 1.0})
+    assert isinstance(swc, SlidingWindowCounterLimiter)
+    assert swc.current_config == {"algorithm": "sliding_window_counter", "limit": 10, "window_size": 1.0, "buckets": 10}
+
+    with pytest.raises(ValueError, match="Missing required key 'window_size' for gcra"):
+        RateLimiterFactory.create({"algorithm": "gcra", "limit": 10})
+    with pytest.raises(ValueError, match="Invalid type for 'limit'"):
+        RateLimiterFactory.create({"algorithm": "sliding_window_counter", "limit": "10", "window_size": 1.0})
+    with pytest.raises(ValueError, match="Invalid value for 'buckets'"):
+        RateLimiterFactory.create({"algorithm": "sliding_window_counter", "limit": 10, "window_size": 1.0, "buckets": 0})
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -3,14 +3,20 @@ Production-grade Python in-memory job queue system with heap-based priority sche
 """
 
 import heapq
+import itertools
+import json
+import os
 import threading
 import time
 import uuid
 import random
 import logging
+import multiprocessing
+import pickle
+import queue as queue_module
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple, Iterable
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 
 logging.basicConfig(level=logging.INFO)
@@ -27,6 +33,9 @@ class JobStatus(Enum):
     DEAD = "dead"
 
 
+_STATUS_BY_VALUE = {status.value: status for status in JobStatus}
+
+
 @dataclass
 class Job:
     """
@@ -121,7 +130,7 @@ class Job:
             max_retries=data.get("max_retries", 3),
             retry_count=data.get("retry_count", 0),
             timeout_seconds=data.get("timeout_seconds"),
-            status=JobStatus(data.get("status", "pending")),
+            status=_STATUS_BY_VALUE[data.get("status", "pending")],
             result=data.get("result"),
             error=data.get("error"),
             depends_on=data.get("depends_on", []),
@@ -130,18 +139,248 @@ class Job:
         return job
 
 
+class JobJournal:
+    """
+    Append-only write-ahead log of job submissions and state transitions.
+
+    Records are buffered in memory and written + fsynced in groups by a
+    background flusher (or on every append with sync_every_write=True).
+    checkpoint() rotates to a new log segment, writes a compacted snapshot
+    of all queues and deletes the segments it covers. Every record carries
+    absolute values, so replaying the newest segments over the snapshot is
+    idempotent even if the snapshot already includes some of their effects.
+
+    Record formats (one JSON array per line):
+        ["S", queue, job_dict]                                   submit
+        ["T", queue, job_id, status, retry_count, scheduled_at, error, result]
+        ["R", queue, job_id]                                     remove
+    """
+
+    SNAPSHOT_FILE = "snapshot.json"
+
+    def __init__(self, directory: str, fsync_interval: float = 0.05,
+                 snapshot_every: int = 100000, sync_every_write: bool = False):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.sync_every_write = sync_every_write
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        self._pending = threading.Condition(self._lock)
+        self._buffer: List[str] = []
+        self._records_since_snapshot = 0
+        self._snapshot_source: Optional[Callable[[], Dict[str, List[Dict[str, Any]]]]] = None
+
+        segments = self._segments()
+        self._segment = segments[-1] if segments else 1
+        self._truncate_torn_tail(self._segment_path(self._segment))
+        self._file = open(self._segment_path(self._segment), "a", encoding="utf-8")
+
+        self._closed = False
+        self._flusher = threading.Thread(target=self._run_flusher, daemon=True)
+        self._flusher.start()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"journal-{segment:06d}.log")
+
+    @staticmethod
+    def _truncate_torn_tail(path: str) -> None:
+        """Cut a crashed write back to the last complete record before appending to it."""
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith("journal-") and name.endswith(".log"):
+                segments.append(int(name[len("journal-"):-len(".log")]))
+        return sorted(segments)
+
+    def set_snapshot_source(self, source: Callable[[], Dict[str, List[Dict[str, Any]]]]) -> None:
+        """Register the callable that returns {queue_name: [job_dict, ...]} for checkpoints."""
+        self._snapshot_source = source
+
+    def _append(self, record: list) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._closed:
+                return
+            self._buffer.append(line)
+            self._records_since_snapshot += 1
+            self._pending.notify()
+        if self.sync_every_write:
+            self.flush()
+
+    def record_submit(self, queue: str, job: Job) -> None:
+        self._append(["S", queue, job.to_dict()])
+
+    def record_status(self, queue: str, job: Job) -> None:
+        self._append(["T", queue, job.job_id, job.status.value, job.retry_count,
+                      job.scheduled_at, job.error, job.result])
+
+    def record_remove(self, queue: str, job_id: str) -> None:
+        self._append(["R", queue, job_id])
+
+    def flush(self) -> None:
+        """Write and fsync every buffered record."""
+        with self._flush_lock:
+            with self._lock:
+                lines, self._buffer = self._buffer, []
+            if lines:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def _run_flusher(self) -> None:
+        while True:
+            with self._lock:
+                while not self._buffer and not self._closed:
+                    self._pending.wait()
+                closed = self._closed
+                due_checkpoint = (self._snapshot_source is not None
+                                  and self._records_since_snapshot >= self.snapshot_every)
+            if closed:
+                return
+            # Let the group fill up before paying for the fsync
+            time.sleep(self.fsync_interval)
+            self.flush()
+            if due_checkpoint:
+                self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Write a compacted snapshot and drop the log segments it covers."""
+        if self._snapshot_source is None:
+            raise RuntimeError("No snapshot source registered")
+
+        with self._checkpoint_lock:
+            # Rotate first: every record from here on lands in the new segment
+            with self._flush_lock:
+                with self._lock:
+                    lines, self._buffer = self._buffer, []
+                    self._records_since_snapshot = 0
+                    old_file = self._file
+                    self._segment += 1
+                    self._file = open(self._segment_path(self._segment), "a", encoding="utf-8")
+                if lines:
+                    old_file.write("\n".join(lines) + "\n")
+                old_file.flush()
+                os.fsync(old_file.fileno())
+                old_file.close()
+
+            snapshot = {"segment": self._segment, "queues": self._snapshot_source()}
+            path = os.path.join(self.directory, self.SNAPSHOT_FILE)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"), default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+            for segment in self._segments():
+                if segment < snapshot["segment"]:
+                    os.remove(self._segment_path(segment))
+
+    def load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Rebuild {queue_name: {job_id: job_dict}} from the snapshot and log.
+
+        A torn final line from a crash mid-write is ignored.
+        """
+        queues: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        first_segment = 0
+
+        path = os.path.join(self.directory, self.SNAPSHOT_FILE)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            first_segment = snapshot["segment"]
+            for name, jobs in snapshot["queues"].items():
+                queues[name] = {data["job_id"]: data for data in jobs}
+
+        self.flush()
+        for segment in self._segments():
+            if segment < first_segment:
+                continue
+            for record in self._read_segment(segment):
+                kind, name = record[0], record[1]
+                jobs = queues.setdefault(name, {})
+                if kind == "S":
+                    jobs[record[2]["job_id"]] = record[2]
+                elif kind == "T":
+                    data = jobs.get(record[2])
+                    if data is not None:
+                        (data["status"], data["retry_count"], data["scheduled_at"],
+                         data["error"], data["result"]) = record[3:8]
+                elif kind == "R":
+                    jobs.pop(record[2], None)
+
+        return queues
+
+    def _read_segment(self, segment: int) -> List[list]:
+        """Parse a log segment, stopping at a torn final record."""
+        with open(self._segment_path(segment), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+        # Fast path: decode the whole segment in a single C-level call
+        try:
+            return json.loads("[" + ",".join(lines) + "]")
+        except ValueError:
+            pass
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+        return records
+
+    def close(self) -> None:
+        """Flush outstanding records and stop the background flusher."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.notify_all()
+        self._flusher.join(timeout=5.0)
+        self.flush()
+        self._file.close()
+
+
 class JobQueue:
     """
     Thread-safe priority queue for jobs using heap structure.
 
     Uses a dictionary for O(1) lookup and tombstone pattern for efficient removal.
     Blocked jobs (with unmet dependencies) are held separately to avoid heap thrashing.
+    Delayed jobs live in their own min-heap keyed on scheduled_at and are only
+    promoted into the priority heap once due, so a future job never stalls the head.
+    Consumers can block in dequeue() on a condition variable that is signalled
+    whenever a job may have become ready.
     """
 
-    def __init__(self):
+    def __init__(self, dependency_lookup: Optional[Callable[[str], Optional[Job]]] = None,
+                 journal: Optional[JobJournal] = None, name: str = "default"):
         self._heap: List[Job] = []
         self._jobs: Dict[str, Job] = {}
+        # Resolves dependencies held outside this queue (used by ShardedJobQueue)
+        self._dependency_lookup = dependency_lookup
+        self._journal = journal
+        self.name = name
         self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._delayed: List[Tuple[float, int, Job]] = []  # (scheduled_at, seq, job)
+        self._delayed_seq = 0
         self._dependents: Dict[str, List[str]] = {}  # job_id -> list of dependent job_ids
         self._blocked_jobs: Dict[str, Job] = {}  # Jobs waiting for dependencies
         self._tombstone_count = 0
@@ -152,56 +391,169 @@ class JobQueue:
             if job.job_id in self._jobs:
                 raise ValueError(f"Job {job.job_id} already exists in queue")
 
-            # Register reverse dependencies
-            for dep_id in job.depends_on:
-                if dep_id not in self._dependents:
-                    self._dependents[dep_id] = []
-                self._dependents[dep_id].append(job.job_id)
+            self._add(job, time.time())
+            self._ready.notify()
+            return job.job_id
+
+    def enqueue_many(self, jobs: List[Job]) -> List[str]:
+        """
+        Add a batch of jobs under a single lock acquisition.
+
+        The whole batch is validated before any job is added, so a duplicate
+        job_id leaves the queue unchanged.
+        """
+        with self._lock:
+            seen = set()
+            for job in jobs:
+                if job.job_id in self._jobs or job.job_id in seen:
+                    raise ValueError(f"Job {job.job_id} already exists in queue")
+                seen.add(job.job_id)
+
+            current_time = time.time()
+            for job in jobs:
+                self._add(job, current_time)
+            if jobs:
+                self._ready.notify(len(jobs))
+            return [job.job_id for job in jobs]
+
+    def _add(self, job: Job, current_time: float) -> None:
+        """Register a new job and its reverse dependencies. Must be called with lock held."""
+        for dep_id in job.depends_on:
+            if dep_id not in self._dependents:
+                self._dependents[dep_id] = []
+            self._dependents[dep_id].append(job.job_id)
+
+        self._jobs[job.job_id] = job
+        self._push(job, current_time)
+        if self._journal is not None:
+            self._journal.record_submit(self.name, job)
+
+    def _push(self, job: Job, current_time: float) -> None:
+        """Route a job to the priority heap or the delayed heap. Must be called with lock held."""
+        if job.scheduled_at and job.scheduled_at > current_time:
+            self._delayed_seq += 1
+            heapq.heappush(self._delayed, (job.scheduled_at, self._delayed_seq, job))
+        else:
+            heapq.heappush(self._heap, job)
 
-            self._jobs[job.job_id] = job
+    def _promote_due(self, current_time: float) -> None:
+        """Move delayed jobs whose time has come into the priority heap. Must be called with lock held."""
+        delayed = self._delayed
+        while delayed and delayed[0][0] <= current_time:
+            _, _, job = heapq.heappop(delayed)
+            if job._removed or job.job_id not in self._jobs:
+                self._tombstone_count -= 1 if job._removed else 0
+                continue
             heapq.heappush(self._heap, job)
-            return job.job_id
 
-    def dequeue(self) -> Optional[Job]:
-        """Get the next ready job for execution."""
+    def dequeue(self, timeout: Optional[float] = 0.0) -> Optional[Job]:
+        """
+        Get the next ready job for execution.
+
+        With the default timeout of 0 this returns immediately. A positive
+        timeout waits up to that many seconds for a job to become ready, and
+        None waits indefinitely. Waiters are woken on enqueue, when dependents
+        are released, and when the earliest scheduled job comes due.
+        """
+        with self._lock:
+            deadline = None if timeout is None else time.time() + timeout
+
+            while True:
+                current_time = time.time()
+                job, next_due = self._pop_ready(current_time)
+                if job is not None:
+                    return job
+
+                if deadline is None:
+                    wait = None
+                else:
+                    wait = deadline - current_time
+                    if wait <= 0:
+                        return None
+
+                if next_due is not None:
+                    due_in = max(next_due - current_time, 0.0)
+                    wait = due_in if wait is None else min(wait, due_in)
+
+                self._ready.wait(wait)
+
+    def dequeue_batch(self, n: int, timeout: Optional[float] = 0.0) -> List[Job]:
+        """
+        Get up to n ready jobs under a single lock acquisition.
+
+        Waits like dequeue() for the first job, then takes whatever else is
+        ready without blocking. Returns an empty list on timeout.
+        """
+        if n < 1:
+            raise ValueError("n must be at least 1")
+
+        first = self.dequeue(timeout=timeout)
+        if first is None:
+            return []
+
+        batch = [first]
         with self._lock:
             current_time = time.time()
+            while len(batch) < n:
+                job, _ = self._pop_ready(current_time)
+                if job is None:
+                    break
+                batch.append(job)
+        return batch
+
+    def _dequeue_nowait(self) -> Tuple[Optional[Job], Optional[float]]:
+        """Non-blocking pop that also reports the next delayed deadline."""
+        with self._lock:
+            return self._pop_ready(time.time())
 
-            while self._heap:
-                job = self._heap[0]
+    def _pop_ready(self, current_time: float) -> Tuple[Optional[Job], Optional[float]]:
+        """
+        Pop the next ready job. Must be called with lock held.
 
-                # Skip tombstones
-                if job._removed or job.job_id not in self._jobs:
-                    heapq.heappop(self._heap)
-                    self._tombstone_count -= 1 if job._removed else 0
-                    continue
+        Returns the job (or None) and, when nothing is ready, the time at
+        which the earliest delayed job becomes due.
+        """
+        self._promote_due(current_time)
 
-                # Skip non-pending jobs
-                if job.status not in (JobStatus.PENDING, JobStatus.SCHEDULED):
-                    heapq.heappop(self._heap)
-                    continue
+        while self._heap:
+            job = self._heap[0]
 
-                # Check if scheduled for later
-                if job.scheduled_at and job.scheduled_at > current_time:
-                    return None
+            # Skip tombstones
+            if job._removed or job.job_id not in self._jobs:
+                heapq.heappop(self._heap)
+                self._tombstone_count -= 1 if job._removed else 0
+                continue
 
-                # Check dependencies
-                if not self._check_dependencies(job):
-                    # Dependencies not met - move to blocked set instead of re-pushing to heap
-                    # This avoids O(n) heap thrashing with many blocked jobs
-                    heapq.heappop(self._heap)
-                    self._blocked_jobs[job.job_id] = job
-                    return None
+            # Skip non-pending jobs
+            if job.status not in (JobStatus.PENDING, JobStatus.SCHEDULED):
+                heapq.heappop(self._heap)
+                continue
 
+            # Not due yet - park it with the delayed jobs rather than stalling the heap
+            if job.scheduled_at and job.scheduled_at > current_time:
                 heapq.heappop(self._heap)
-                return job
+                self._push(job, current_time)
+                continue
 
-            return None
+            # Check dependencies
+            if not self._check_dependencies(job):
+                # Dependencies not met - move to blocked set instead of re-pushing to heap
+                # This avoids O(n) heap thrashing with many blocked jobs
+                heapq.heappop(self._heap)
+                self._blocked_jobs[job.job_id] = job
+                continue
+
+            heapq.heappop(self._heap)
+            return job, None
+
+        return None, (self._delayed[0][0] if self._delayed else None)
 
     def _check_dependencies(self, job: Job) -> bool:
         """Check if all dependencies are satisfied. Must be called with lock held."""
         for dep_id in job.depends_on:
             dep_job = self._jobs.get(dep_id)
+            if dep_job is None and self._dependency_lookup is not None:
+                dep_job = self._dependency_lookup(dep_id)
             if dep_job is None:
                 # Dependency not found, assume completed externally
                 continue
@@ -222,16 +574,36 @@ class JobQueue:
     def _wake_dependents(self, job_id: str) -> None:
         """Wake jobs blocked on the given job. Must be called with lock held."""
         dependent_ids = self._dependents.get(job_id, [])
+        woken = 0
         for dep_id in dependent_ids:
             if dep_id in self._blocked_jobs:
                 blocked_job = self._blocked_jobs.pop(dep_id)
                 # Re-add to heap so it can be scheduled
-                heapq.heappush(self._heap, blocked_job)
+                self._push(blocked_job, time.time())
+                woken += 1
+        if woken:
+            self._ready.notify(woken)
+
+    def wake_dependents(self, job_id: str) -> None:
+        """Release jobs blocked on a job that finished outside this queue."""
+        with self._lock:
+            self._wake_dependents(job_id)
+
+    def find_dependency_cycle(self, job_ids: Iterable[str]) -> Optional[str]:
+        """
+        Return a job_id on a dependency cycle reachable from job_ids, or None.
+
+        Runs one iterative DFS over the whole batch of roots so shared
+        dependencies are only visited once.
+        """
+        with self._lock:
+            return _find_cycle(job_ids, self._jobs.get)
 
     def peek(self) -> Optional[Job]:
         """Return the next ready job without removing it."""
         with self._lock:
             current_time = time.time()
+            self._promote_due(current_time)
 
             for job in self._heap:
                 if job._removed or job.job_id not in self._jobs:
@@ -257,6 +629,8 @@ class JobQueue:
             if job_id not in self._jobs:
                 raise KeyError(f"Job {job_id} not found")
             self._jobs[job_id].status = status
+            if self._journal is not None:
+                self._journal.record_status(self.name, self._jobs[job_id])
 
             # Wake blocked dependents when a job completes or fails
             if status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.DEAD):
@@ -286,11 +660,13 @@ class JobQueue:
     def cleanup(self) -> None:
         """Compact the heap by removing tombstones and cleaning up blocked jobs."""
         with self._lock:
-            if self._tombstone_count < len(self._heap) * 0.25:
+            if self._tombstone_count < (len(self._heap) + len(self._delayed)) * 0.25:
                 return
 
             self._heap = [j for j in self._heap if not j._removed and j.job_id in self._jobs]
             heapq.heapify(self._heap)
+            self._delayed = [e for e in self._delayed if not e[2]._removed and e[2].job_id in self._jobs]
+            heapq.heapify(self._delayed)
             self._tombstone_count = 0
 
             # Clean up blocked jobs that are no longer valid
@@ -306,6 +682,8 @@ class JobQueue:
                 self._jobs[job_id]._removed = True
                 del self._jobs[job_id]
                 self._tombstone_count += 1
+                if self._journal is not None:
+                    self._journal.record_remove(self.name, job_id)
 
     def export_jobs(self) -> List[Dict[str, Any]]:
         """Export all jobs as dictionaries."""
@@ -314,17 +692,40 @@ class JobQueue:
 
     def import_jobs(self, jobs_data: List[Dict[str, Any]]) -> None:
         """Import jobs from dictionaries."""
+        jobs = [Job.from_dict(data) for data in jobs_data]
+        self._restore(jobs)
+        if self._journal is not None:
+            for job in jobs:
+                self._journal.record_submit(self.name, job)
+
+    def _restore(self, jobs: List[Job]) -> None:
+        """
+        Bulk-load jobs without journaling them.
+
+        Runnable jobs are appended and the heaps rebuilt with one heapify
+        instead of a heappush per job, which keeps large recoveries linear.
+        """
         with self._lock:
-            for data in jobs_data:
-                job = Job.from_dict(data)
+            current_time = time.time()
+            for job in jobs:
                 self._jobs[job.job_id] = job
-                heapq.heappush(self._heap, job)
-
                 for dep_id in job.depends_on:
                     if dep_id not in self._dependents:
                         self._dependents[dep_id] = []
                     self._dependents[dep_id].append(job.job_id)
 
+                if job.status not in (JobStatus.PENDING, JobStatus.SCHEDULED):
+                    continue
+                if job.scheduled_at and job.scheduled_at > current_time:
+                    self._delayed_seq += 1
+                    self._delayed.append((job.scheduled_at, self._delayed_seq, job))
+                else:
+                    self._heap.append(job)
+
+            heapq.heapify(self._heap)
+            heapq.heapify(self._delayed)
+            self._ready.notify_all()
+
     def get_dependents(self, job_id: str) -> List[str]:
         """Get job IDs that depend on the given job."""
         with self._lock:
@@ -336,8 +737,298 @@ class JobQueue:
             if job_id not in self._jobs:
                 raise KeyError(f"Job {job_id} not found")
             job = self._jobs[job_id]
-            # Push back to heap for scheduling
-            heapq.heappush(self._heap, job)
+            # Push back for scheduling; backoff retries go to the delayed heap
+            self._push(job, time.time())
+            if self._journal is not None:
+                self._journal.record_status(self.name, job)
+            self._ready.notify()
+
+    def notify_waiters(self) -> None:
+        """Wake every consumer blocked in dequeue() so it can re-check its state."""
+        with self._lock:
+            self._ready.notify_all()
+
+
+def _find_cycle(roots: Iterable[str],
+                lookup: Callable[[str], Optional[Job]]) -> Optional[str]:
+    """Three-colour iterative DFS over depends_on edges starting from roots."""
+    in_progress, done = set(), set()
+
+    for root in roots:
+        if root in done:
+            continue
+        stack = [(root, None)]
+        while stack:
+            job_id, deps = stack[-1]
+            if deps is None:
+                if job_id in in_progress:
+                    return job_id
+                if job_id in done:
+                    stack.pop()
+                    continue
+                job = lookup(job_id)
+                deps = iter(job.depends_on if job is not None else ())
+                in_progress.add(job_id)
+                stack[-1] = (job_id, deps)
+
+            dep_id = next(deps, None)
+            if dep_id is None:
+                in_progress.discard(job_id)
+                done.add(job_id)
+                stack.pop()
+            elif dep_id in in_progress:
+                return dep_id
+            elif dep_id not in done:
+                stack.append((dep_id, None))
+
+    return None
+
+
+class ShardedJobQueue:
+    """
+    JobQueue split into N independently locked shards with work stealing.
+
+    Jobs are spread round-robin across shards, except that a job with
+    dependencies is co-located with its first dependency when possible.
+    Each consumer thread has a home shard and steals from the others when
+    it runs dry, so many workers do not contend on a single lock. Idle
+    consumers park on a shared condition that producers only touch when
+    someone is actually waiting.
+    """
+
+    def __init__(self, shards: int = 4, journal: Optional[JobJournal] = None,
+                 name: str = "default"):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        self.name = name
+        self._shards = [JobQueue(dependency_lookup=self._lookup, journal=journal, name=name)
+                        for _ in range(shards)]
+        self._job_shard: Dict[str, int] = {}  # job_id -> shard index
+        self._remote_dependents: Dict[str, set] = {}  # job_id -> shards with dependents
+        self._route_lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._home = threading.local()
+        self._idle = threading.Condition(threading.Lock())
+        self._idle_waiters = 0
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    def _lookup(self, job_id: str) -> Optional[Job]:
+        """Lock-free cross-shard job lookup used for dependency checks."""
+        index = self._job_shard.get(job_id)
+        if index is None:
+            return None
+        return self._shards[index]._jobs.get(job_id)
+
+    def _route(self, job: Job) -> int:
+        """Pick a shard for a new job. Must be called with _route_lock held."""
+        index = None
+        for dep_id in job.depends_on:
+            index = self._job_shard.get(dep_id)
+            if index is not None:
+                break
+        if index is None:
+            index = next(self._round_robin) % len(self._shards)
+
+        for dep_id in job.depends_on:
+            dep_index = self._job_shard.get(dep_id)
+            if dep_index is not None and dep_index != index:
+                self._remote_dependents.setdefault(dep_id, set()).add(index)
+
+        self._job_shard[job.job_id] = index
+        return index
+
+    def _shard_for(self, job_id: str) -> JobQueue:
+        index = self._job_shard.get(job_id)
+        if index is None:
+            raise KeyError(f"Job {job_id} not found")
+        return self._shards[index]
+
+    def _home_index(self) -> int:
+        index = getattr(self._home, "index", None)
+        if index is None:
+            index = next(self._round_robin) % len(self._shards)
+            self._home.index = index
+        return index
+
+    def _signal_idle(self, count: int = 1) -> None:
+        if self._idle_waiters:
+            with self._idle:
+                self._idle.notify(count)
+
+    def enqueue(self, job: Job) -> str:
+        """Add a job to its shard."""
+        with self._route_lock:
+            if job.job_id in self._job_shard:
+                raise ValueError(f"Job {job.job_id} already exists in queue")
+            index = self._route(job)
+        self._shards[index].enqueue(job)
+        self._signal_idle()
+        return job.job_id
+
+    def enqueue_many(self, jobs: List[Job]) -> List[str]:
+        """Add a batch of jobs, taking each shard lock once."""
+        by_shard: Dict[int, List[Job]] = {}
+        with self._route_lock:
+            seen = set()
+            for job in jobs:
+                if job.job_id in self._job_shard or job.job_id in seen:
+                    raise ValueError(f"Job {job.job_id} already exists in queue")
+                seen.add(job.job_id)
+            for job in jobs:
+                by_shard.setdefault(self._route(job), []).append(job)
+
+        for index, shard_jobs in by_shard.items():
+            self._shards[index].enqueue_many(shard_jobs)
+        self._signal_idle(len(jobs))
+        return [job.job_id for job in jobs]
+
+    def _steal(self) -> Tuple[Optional[Job], Optional[float]]:
+        """Try the home shard, then every other shard, without blocking."""
+        home = self._home_index()
+        count = len(self._shards)
+        next_due = None
+        for offset in range(count):
+            job, due = self._shards[(home + offset) % count]._dequeue_nowait()
+            if job is not None:
+                return job, None
+            if due is not None and (next_due is None or due < next_due):
+                next_due = due
+        return None, next_due
+
+    def dequeue(self, timeout: Optional[float] = 0.0) -> Optional[Job]:
+        """Get the next ready job, stealing from other shards if the home shard is empty."""
+        job, next_due = self._steal()
+        if job is not None or timeout == 0:
+            return job
+
+        deadline = None if timeout is None else time.time() + timeout
+        with self._idle:
+            self._idle_waiters += 1
+            try:
+                while True:
+                    job, next_due = self._steal()
+                    if job is not None:
+                        return job
+
+                    current_time = time.time()
+                    if deadline is None:
+                        wait = None
+                    else:
+                        wait = deadline - current_time
+                        if wait <= 0:
+                            return None
+                    if next_due is not None:
+                        due_in = max(next_due - current_time, 0.0)
+                        wait = due_in if wait is None else min(wait, due_in)
+
+                    self._idle.wait(wait)
+            finally:
+                self._idle_waiters -= 1
+
+    def dequeue_batch(self, n: int, timeout: Optional[float] = 0.0) -> List[Job]:
+        """Get up to n ready jobs, filling from the home shard first."""
+        if n < 1:
+            raise ValueError("n must be at least 1")
+
+        first = self.dequeue(timeout=timeout)
+        if first is None:
+            return []
+
+        batch = [first]
+        home = self._home_index()
+        count = len(self._shards)
+        for offset in range(count):
+            if len(batch) >= n:
+                break
+            batch.extend(self._shards[(home + offset) % count].dequeue_batch(n - len(batch)))
+        return batch
+
+    def peek(self) -> Optional[Job]:
+        """Return the best ready job across shards without removing it."""
+        candidates = [j for j in (shard.peek() for shard in self._shards) if j is not None]
+        return min(candidates) if candidates else None
+
+    def get_job(self, job_id: str) -> Job:
+        """Get a job by ID."""
+        return self._shard_for(job_id).get_job(job_id)
+
+    def update_status(self, job_id: str, status: JobStatus) -> None:
+        """Update a job's status and wake dependents on any shard."""
+        self._shard_for(job_id).update_status(job_id, status)
+
+        if status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.DEAD):
+            for index in self._remote_dependents.get(job_id, ()):
+                self._shards[index].wake_dependents(job_id)
+            self._signal_idle(len(self._shards))
+
+    @property
+    def size(self) -> int:
+        """Total job count."""
+        return sum(shard.size for shard in self._shards)
+
+    def ready_count(self) -> int:
+        """Count of jobs ready for immediate execution."""
+        return sum(shard.ready_count() for shard in self._shards)
+
+    def cleanup(self) -> None:
+        """Compact every shard."""
+        for shard in self._shards:
+            shard.cleanup()
+
+    def remove(self, job_id: str) -> None:
+        """Mark a job as removed (tombstone)."""
+        with self._route_lock:
+            index = self._job_shard.pop(job_id, None)
+            self._remote_dependents.pop(job_id, None)
+        if index is not None:
+            self._shards[index].remove(job_id)
+
+    def export_jobs(self) -> List[Dict[str, Any]]:
+        """Export all jobs as dictionaries."""
+        exported = []
+        for shard in self._shards:
+            exported.extend(shard.export_jobs())
+        return exported
+
+    def import_jobs(self, jobs_data: List[Dict[str, Any]]) -> None:
+        """Import jobs from dictionaries."""
+        self.enqueue_many([Job.from_dict(data) for data in jobs_data])
+
+    def _restore(self, jobs: List[Job]) -> None:
+        """Bulk-load jobs into their shards without journaling them."""
+        by_shard: Dict[int, List[Job]] = {}
+        with self._route_lock:
+            for job in jobs:
+                by_shard.setdefault(self._route(job), []).append(job)
+        for index, shard_jobs in by_shard.items():
+            self._shards[index]._restore(shard_jobs)
+
+    def get_dependents(self, job_id: str) -> List[str]:
+        """Get job IDs that depend on the given job."""
+        dependents = []
+        for shard in self._shards:
+            dependents.extend(shard.get_dependents(job_id))
+        return dependents
+
+    def reschedule(self, job_id: str) -> None:
+        """Re-add an existing job to its shard for retry."""
+        self._shard_for(job_id).reschedule(job_id)
+        self._signal_idle()
+
+    def notify_waiters(self) -> None:
+        """Wake every consumer blocked in dequeue()."""
+        for shard in self._shards:
+            shard.notify_waiters()
+        with self._idle:
+            self._idle.notify_all()
+
+    def find_dependency_cycle(self, job_ids: Iterable[str]) -> Optional[str]:
+        """Return a job_id on a dependency cycle reachable from job_ids, or None."""
+        return _find_cycle(job_ids, self._lookup)
 
 
 class EventHandler:
@@ -362,15 +1053,211 @@ class EventHandler:
         pass
 
 
+class RemoteHandlerError(Exception):
+    """Stands in for a child-process handler exception that cannot be pickled."""
+
+    def __init__(self, type_name: str, message: str):
+        super().__init__(type_name, message)
+        self.type_name = type_name
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _portable_exception(error: Exception) -> Exception:
+    """Return error if it survives a pickle round-trip, else a RemoteHandlerError."""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RemoteHandlerError(type(error).__name__, str(error))
+
+
+def _process_backend_main(conn) -> None:
+    """Child process loop for ProcessBackend: run (handler, payload) batches sent over conn."""
+    while True:
+        try:
+            items = conn.recv()
+        except EOFError:
+            return
+        if items is None:
+            return
+
+        results = []
+        for handler, payload in items:
+            try:
+                results.append((True, handler(payload)))
+            except Exception as e:
+                results.append((False, _portable_exception(e)))
+        conn.send(results)
+
+
+class ExecutionBackend:
+    """
+    Strategy for running job handlers on behalf of a Worker.
+
+    run() returns the handler result, raises FuturesTimeoutError when the
+    timeout expires and re-raises handler exceptions. run_batch() executes
+    several timeout-free jobs and returns one (ok, result_or_error) per item.
+    """
+
+    def run(self, handler: Callable, payload: Dict[str, Any],
+            timeout: Optional[float] = None) -> Any:
+        raise NotImplementedError
+
+    def run_batch(self, items: List[Tuple[Callable, Dict[str, Any]]]) -> List[Tuple[bool, Any]]:
+        results = []
+        for handler, payload in items:
+            try:
+                results.append((True, self.run(handler, payload)))
+            except Exception as e:
+                results.append((False, str(e)))
+        return results
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ThreadBackend(ExecutionBackend):
+    """Run handlers on the worker thread, using a helper thread to enforce timeouts."""
+
+    def run(self, handler: Callable, payload: Dict[str, Any],
+            timeout: Optional[float] = None) -> Any:
+        if not timeout:
+            return handler(payload)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(handler, payload)
+            return future.result(timeout=timeout)
+
+
+class ProcessBackend(ExecutionBackend):
+    """
+    Run handlers in a pool of child processes so CPU-bound jobs bypass the GIL.
+
+    Handlers and payloads must be picklable (module-level functions). Each
+    call checks out an idle child; a child that exceeds its timeout is
+    killed and replaced, so stuck handlers cannot leak. Batches of small
+    jobs are sent to a child in a single IPC round-trip. Handler exceptions
+    are re-raised with their original type, or as RemoteHandlerError when
+    they cannot be pickled.
+    """
+
+    def __init__(self, processes: Optional[int] = None, start_method: str = "spawn"):
+        self.processes = processes or os.cpu_count() or 1
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: "queue_module.Queue" = queue_module.Queue()
+        self._lock = threading.Lock()
+        self._children: List[Tuple[Any, Any]] = []
+        self._started = 0
+
+    def _spawn(self) -> Tuple[Any, Any]:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_process_backend_main,
+                                        args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def _checkout(self) -> Tuple[Any, Any]:
+        with self._lock:
+            grow = self._idle.empty() and self._started < self.processes
+            if grow:
+                self._started += 1
+        if not grow:
+            return self._idle.get()
+
+        # Spawn outside the lock so other checkouts are not serialized behind it
+        try:
+            child = self._spawn()
+        except BaseException:
+            with self._lock:
+                self._started -= 1
+            raise
+        with self._lock:
+            self._children.append(child)
+        return child
+
+    def _release(self, child: Tuple[Any, Any]) -> None:
+        self._idle.put(child)
+
+    def _replace(self, child: Tuple[Any, Any]) -> None:
+        """Kill a stuck or broken child and put a fresh one in the pool."""
+        process, conn = child
+        process.kill()
+        process.join(timeout=5.0)
+        conn.close()
+        replacement = self._spawn()
+        with self._lock:
+            self._children.remove(child)
+            self._children.append(replacement)
+        self._idle.put(replacement)
+
+    def _call(self, items: List[Tuple[Callable, Dict[str, Any]]],
+              timeout: Optional[float]) -> List[Tuple[bool, Any]]:
+        child = self._checkout()
+        _, conn = child
+        try:
+            conn.send(items)
+            finished = conn.poll(timeout)
+            results = conn.recv() if finished else None
+        except (EOFError, OSError):
+            self._replace(child)
+            raise RuntimeError("Worker process exited unexpectedly")
+        except BaseException:
+            self._replace(child)
+            raise
+
+        if not finished:
+            self._replace(child)
+            raise FuturesTimeoutError()
+
+        self._release(child)
+        return results
+
+    def run(self, handler: Callable, payload: Dict[str, Any],
+            timeout: Optional[float] = None) -> Any:
+        ok, value = self._call([(handler, payload)], timeout or None)[0]
+        if not ok:
+            raise value
+        return value
+
+    def run_batch(self, items: List[Tuple[Callable, Dict[str, Any]]]) -> List[Tuple[bool, Any]]:
+        return [(ok, value if ok else str(value)) for ok, value in self._call(items, None)]
+
+    def shutdown(self) -> None:
+        """Stop every child process; the pool restarts lazily if used again."""
+        with self._lock:
+            children, self._children = self._children, []
+            self._started = 0
+            self._idle = queue_module.Queue()
+        for process, conn in children:
+            try:
+                conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.kill()
+            conn.close()
+
+
 class Worker(threading.Thread):
     """
-    Worker thread that polls a queue and executes jobs.
+    Worker thread that waits on a queue and executes jobs.
+
+    poll_interval bounds how long a single blocking dequeue() waits before the
+    stop flag is re-checked; new jobs wake the worker immediately. With
+    batch_size > 1 the worker claims several ready jobs per queue round-trip
+    and hands the ones without a timeout to the backend as a single batch.
     """
 
     def __init__(self, queue: JobQueue, handlers: Dict[str, Callable],
                  dead_letter_queue: JobQueue, event_handler: EventHandler = None,
                  poll_interval: float = 0.1, base_delay: float = 1.0,
-                 worker_id: str = None):
+                 worker_id: str = None, batch_size: int = 1,
+                 backend: Optional[ExecutionBackend] = None):
         super().__init__(daemon=True)
         self.queue = queue
         self.handlers = handlers
@@ -379,21 +1266,31 @@ class Worker(threading.Thread):
         self.poll_interval = poll_interval
         self.base_delay = base_delay
         self.worker_id = worker_id or str(uuid.uuid4())[:8]
+        self.batch_size = batch_size
+        self.backend = backend or ThreadBackend()
         self._stop_flag = threading.Event()
         self._current_job: Optional[Job] = None
 
     def run(self) -> None:
         """Main worker loop."""
         while not self._stop_flag.is_set():
-            job = self.queue.dequeue()
+            if self.batch_size > 1:
+                jobs = self.queue.dequeue_batch(self.batch_size, timeout=self.poll_interval)
+            else:
+                job = self.queue.dequeue(timeout=self.poll_interval)
+                jobs = [job] if job is not None else []
 
-            if job is None:
-                time.sleep(self.poll_interval)
-                continue
+            batchable = [j for j in jobs
+                         if not j.timeout_seconds and j.job_type in self.handlers]
+            if len(batchable) > 1:
+                self._execute_batch(batchable)
+                batched_ids = {j.job_id for j in batchable}
+                jobs = [j for j in jobs if j.job_id not in batched_ids]
 
-            self._current_job = job
-            self._execute_job(job)
-            self._current_job = None
+            for job in jobs:
+                self._current_job = job
+                self._execute_job(job)
+                self._current_job = None
 
     def _execute_job(self, job: Job) -> None:
         """Execute a single job with timeout and error handling."""
@@ -405,23 +1302,11 @@ class Worker(threading.Thread):
             self._handle_failure(job)
             return
 
-        job.status = JobStatus.RUNNING
-        self.queue.update_status(job.job_id, JobStatus.RUNNING)
-        self.event_handler.on_job_started(job, self.worker_id)
+        self._mark_started(job)
 
         try:
-            if job.timeout_seconds:
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(handler, job.payload)
-                    result = future.result(timeout=job.timeout_seconds)
-            else:
-                result = handler(job.payload)
-
-            job.result = result
-            job.status = JobStatus.COMPLETED
-            self.queue.update_status(job.job_id, JobStatus.COMPLETED)
-            self.event_handler.on_job_completed(job, result)
-            logger.info(f"Job {job.job_id} completed successfully")
+            result = self.backend.run(handler, job.payload, job.timeout_seconds)
+            self._mark_completed(job, result)
 
         except FuturesTimeoutError:
             job.error = f"Job timed out after {job.timeout_seconds} seconds"
@@ -433,6 +1318,38 @@ class Worker(threading.Thread):
             job.status = JobStatus.FAILED
             self._handle_failure(job)
 
+    def _execute_batch(self, jobs: List[Job]) -> None:
+        """Execute several timeout-free jobs in one backend round-trip."""
+        for job in jobs:
+            self._mark_started(job)
+
+        try:
+            outcomes = self.backend.run_batch(
+                [(self.handlers[job.job_type], job.payload) for job in jobs]
+            )
+        except Exception as e:
+            outcomes = [(False, str(e))] * len(jobs)
+
+        for job, (ok, value) in zip(jobs, outcomes):
+            if ok:
+                self._mark_completed(job, value)
+            else:
+                job.error = value
+                job.status = JobStatus.FAILED
+                self._handle_failure(job)
+
+    def _mark_started(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        self.queue.update_status(job.job_id, JobStatus.RUNNING)
+        self.event_handler.on_job_started(job, self.worker_id)
+
+    def _mark_completed(self, job: Job, result: Any) -> None:
+        job.result = result
+        job.status = JobStatus.COMPLETED
+        self.queue.update_status(job.job_id, JobStatus.COMPLETED)
+        self.event_handler.on_job_completed(job, result)
+        logger.info(f"Job {job.job_id} completed successfully")
+
     def _handle_failure(self, job: Job) -> None:
         """Handle job failure with retry or dead letter."""
         self.event_handler.on_job_failed(job, job.error)
@@ -474,6 +1391,7 @@ class Worker(threading.Thread):
     def stop(self, wait: bool = True) -> None:
         """Signal the worker to stop."""
         self._stop_flag.set()
+        self.queue.notify_waiters()
         if wait and self.is_alive():
             self.join(timeout=5.0)
 
@@ -483,17 +1401,33 @@ class JobQueueManager:
     Primary interface for the job queue system.
 
     Manages multiple named queues, worker pools, and job routing.
+
+    With config["journal_dir"] set, every submission and status transition is
+    written to a JobJournal and the queues are rebuilt from it on __enter__.
     """
 
+    DEAD_LETTER_QUEUE = "__dead_letter__"
+
     def __init__(self, config: Optional[Dict[str, Any]] = None,
                  event_handler: EventHandler = None):
         self.config = config or {}
         self.event_handler = event_handler or EventHandler()
 
+        self._journal: Optional[JobJournal] = None
+        if self.config.get("journal_dir"):
+            self._journal = JobJournal(
+                self.config["journal_dir"],
+                fsync_interval=self.config.get("journal_fsync_interval", 0.05),
+                snapshot_every=self.config.get("journal_snapshot_every", 100000),
+                sync_every_write=self.config.get("journal_sync_every_write", False)
+            )
+            self._journal.set_snapshot_source(self._snapshot_queues)
+
         self._queues: Dict[str, JobQueue] = {}
         self._handlers: Dict[str, tuple] = {}  # job_type -> (handler, queue_name)
         self._workers: Dict[str, List[Worker]] = {}
-        self._dead_letter_queue = JobQueue()
+        self._backends: Dict[str, ExecutionBackend] = {}
+        self._dead_letter_queue = JobQueue(journal=self._journal, name=self.DEAD_LETTER_QUEUE)
 
         self._queue_lock = threading.Lock()
         self._worker_lock = threading.Lock()
@@ -510,22 +1444,96 @@ class JobQueueManager:
         self.create_queue("default")
 
     def __enter__(self) -> "JobQueueManager":
+        if self._journal is not None:
+            self.recover()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.stop_workers(graceful=True)
+        for backend in self._backends.values():
+            backend.shutdown()
+        if self._journal is not None:
+            self._journal.close()
+
+    def recover(self) -> int:
+        """
+        Rebuild queue state from the journal and return the number of jobs restored.
+
+        Jobs that were RUNNING when the process died are reset to PENDING so
+        they run again (at-least-once delivery).
+        """
+        if self._journal is None:
+            raise RuntimeError("Journaling is not enabled (set config['journal_dir'])")
+
+        restored = 0
+        for name, jobs_data in self._journal.load().items():
+            jobs = []
+            for data in jobs_data.values():
+                job = Job.from_dict(data)
+                if job.status == JobStatus.RUNNING:
+                    job.status = JobStatus.PENDING
+                jobs.append(job)
+
+            if name == self.DEAD_LETTER_QUEUE:
+                queue = self._dead_letter_queue
+            else:
+                queue = self.create_queue(name)
+            queue._restore(jobs)
+            restored += len(jobs)
+
+        return restored
+
+    def checkpoint(self) -> None:
+        """Write a compacted journal snapshot now."""
+        if self._journal is None:
+            raise RuntimeError("Journaling is not enabled (set config['journal_dir'])")
+        self._journal.checkpoint()
+
+    def _snapshot_queues(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Export every queue, including the dead letter queue, for a journal snapshot."""
+        with self._queue_lock:
+            queues = dict(self._queues)
+        snapshot = {name: q.export_jobs() for name, q in queues.items()}
+        snapshot[self.DEAD_LETTER_QUEUE] = self._dead_letter_queue.export_jobs()
+        return snapshot
 
     def create_queue(self, name: str, **config) -> JobQueue:
-        """Create and register a new queue."""
+        """
+        Create and register a new queue.
+
+        Pass shards=N (N > 1) to back the queue with a ShardedJobQueue.
+        executor selects how workers run handlers: "thread" (default),
+        "process" (with optional processes=N and start_method), or any
+        ExecutionBackend instance.
+        """
         with self._queue_lock:
             if name in self._queues:
                 return self._queues[name]
 
-            queue = JobQueue()
+            backend = self._create_backend(config)
+            shards = config.get("shards", 1)
+            if shards > 1:
+                queue = ShardedJobQueue(shards, journal=self._journal, name=name)
+            else:
+                queue = JobQueue(journal=self._journal, name=name)
             self._queues[name] = queue
             self._workers[name] = []
+            self._backends[name] = backend
             return queue
 
+    @staticmethod
+    def _create_backend(config: Dict[str, Any]) -> ExecutionBackend:
+        """Build the execution backend requested in create_queue() config."""
+        executor = config.get("executor", "thread")
+        if isinstance(executor, ExecutionBackend):
+            return executor
+        if executor == "thread":
+            return ThreadBackend()
+        if executor == "process":
+            return ProcessBackend(processes=config.get("processes"),
+                                  start_method=config.get("start_method", "spawn"))
+        raise ValueError(f"Unknown executor backend: {executor}")
+
     def get_queue(self, name: str) -> JobQueue:
         """Get a queue by name."""
         with self._queue_lock:
@@ -564,25 +1572,49 @@ class JobQueueManager:
 
         return job.job_id
 
-    def _check_circular_dependencies(self, depends_on: List[str], queue_name: str) -> None:
-        """Check for circular dependencies."""
-        queue = self.get_queue(queue_name)
-        visited = set()
-
-        def dfs(job_id: str) -> None:
-            if job_id in visited:
-                raise ValueError(f"Circular dependency detected involving job {job_id}")
-            visited.add(job_id)
+    def submit_many(self, jobs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create and submit a batch of jobs.
 
-            try:
-                job = queue.get_job(job_id)
-                for dep_id in job.depends_on:
-                    dfs(dep_id)
-            except KeyError:
-                pass  # Job not in this queue
+        Each item is a dict of submit() arguments, e.g.
+        {"job_type": "email", "payload": {...}, "priority": 7}. The whole batch
+        is validated before anything is enqueued, and each target queue is
+        locked once for the batch.
+        """
+        with self._handler_lock:
+            routes = []
+            for spec in jobs:
+                job_type = spec.get("job_type")
+                if job_type not in self._handlers:
+                    raise ValueError(f"No handler registered for job type: {job_type}")
+                routes.append(self._handlers[job_type][1])
+
+        by_queue: Dict[str, List[Job]] = {}
+        created = []
+        for spec, queue_name in zip(jobs, routes):
+            job = Job.create(**spec)
+            by_queue.setdefault(queue_name, []).append(job)
+            created.append(job)
+
+        for queue_name, queue_jobs in by_queue.items():
+            depends_on = [dep_id for job in queue_jobs for dep_id in job.depends_on]
+            if depends_on:
+                self._check_circular_dependencies(depends_on, queue_name)
+
+        for queue_name, queue_jobs in by_queue.items():
+            self.get_queue(queue_name).enqueue_many(queue_jobs)
+
+        self._stats["total_submitted"] += len(created)
+        for job in created:
+            self.event_handler.on_job_submitted(job)
+
+        return [job.job_id for job in created]
 
-        for dep_id in depends_on:
-            dfs(dep_id)
+    def _check_circular_dependencies(self, depends_on: List[str], queue_name: str) -> None:
+        """Check for circular dependencies."""
+        cycle_job = self.get_queue(queue_name).find_dependency_cycle(depends_on)
+        if cycle_job is not None:
+            raise ValueError(f"Circular dependency detected involving job {cycle_job}")
 
     def start_workers(self, queue: str = None, count: int = None) -> None:
         """Start worker threads for specified queue(s)."""
@@ -611,7 +1643,9 @@ class JobQueueManager:
                     handlers=queue_handlers,
                     dead_letter_queue=self._dead_letter_queue,
                     event_handler=self._create_stats_handler(),
-                    worker_id=f"{queue_name}-worker-{i}"
+                    worker_id=f"{queue_name}-worker-{i}",
+                    batch_size=self.config.get("worker_batch_size", 1),
+                    backend=self._backends[queue_name]
                 )
                 worker.start()
                 self._workers[queue_name].append(worker)
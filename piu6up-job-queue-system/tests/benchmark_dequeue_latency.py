@@ -0,0 +1,92 @@
+"""
+Benchmark of enqueue-to-start latency for the Job Queue System.
+
+Measures how long a job waits between JobQueue.enqueue() and the moment a
+Worker starts its handler, for worker pools of 1 to 64 threads.
+
+Usage:
+    PYTHONPATH=repository_after python tests/benchmark_dequeue_latency.py
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'repository_after'))
+
+from job_queue import Job, JobQueue, Worker
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples (nearest-rank)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run(worker_count: int, jobs: int, interval: float) -> dict:
+    """Enqueue jobs at a fixed interval and record enqueue-to-start latency."""
+    queue = JobQueue()
+    dead_letter = JobQueue()
+    latencies = []
+    latencies_lock = threading.Lock()
+    done = threading.Event()
+
+    def handler(payload):
+        started = time.perf_counter()
+        with latencies_lock:
+            latencies.append(started - payload["enqueued_at"])
+            if len(latencies) == jobs:
+                done.set()
+
+    workers = [
+        Worker(queue=queue, handlers={"bench": handler},
+               dead_letter_queue=dead_letter, worker_id=f"bench-{i}")
+        for i in range(worker_count)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Let workers reach their idle wait before measuring
+    time.sleep(0.05)
+
+    for _ in range(jobs):
+        queue.enqueue(Job.create(job_type="bench",
+                                 payload={"enqueued_at": time.perf_counter()}))
+        if interval:
+            time.sleep(interval)
+
+    done.wait(timeout=60)
+    for worker in workers:
+        worker.stop()
+
+    return {
+        "workers": worker_count,
+        "jobs": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=0.002,
+                        help="seconds between enqueues")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[1, 2, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'jobs':>6} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for count in args.workers:
+        r = run(count, args.jobs, args.interval)
+        print(f"{r['workers']:>8} {r['jobs']:>6} {r['p50_ms']:>9.3f} "
+              f"{r['p99_ms']:>9.3f} {r['mean_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
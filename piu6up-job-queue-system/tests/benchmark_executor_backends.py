@@ -0,0 +1,69 @@
+"""
+Throughput benchmark of thread vs process execution backends.
+
+Runs a CPU-bound handler through JobQueueManager queues backed by the thread
+and process executors and reports jobs per second. The process backend is
+also measured with worker batching, which amortises IPC over several jobs.
+
+Usage:
+    PYTHONPATH=repository_after python tests/benchmark_executor_backends.py
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'repository_after'))
+
+from job_queue import JobQueueManager
+
+logging.getLogger("job_queue").setLevel(logging.WARNING)
+
+
+def cpu_handler(payload):
+    """Pure-Python busy loop that holds the GIL."""
+    total = 0
+    for i in range(payload["iterations"]):
+        total += i * i % 7
+    return total
+
+
+def run(executor: str, workers: int, jobs: int, iterations: int, batch_size: int) -> float:
+    """Return jobs/s for one backend configuration."""
+    config = {"worker_batch_size": batch_size}
+    with JobQueueManager(config=config) as manager:
+        manager.create_queue("bench", executor=executor, processes=workers)
+        manager.register_handler("cpu", cpu_handler, queue="bench")
+        manager.start_workers(queue="bench", count=workers)
+
+        # Warm up so process start-up is not counted
+        warmup = manager.submit_many(
+            [{"job_type": "cpu", "payload": {"iterations": 1}} for _ in range(workers * 2)]
+        )
+        manager.wait_for_completion(warmup, timeout=60)
+
+        start = time.perf_counter()
+        job_ids = manager.submit_many(
+            [{"job_type": "cpu", "payload": {"iterations": iterations}} for _ in range(jobs)]
+        )
+        manager.wait_for_completion(job_ids, timeout=600)
+        return jobs / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    print(f"workers={args.workers} jobs={args.jobs} iterations={args.iterations}")
+    for executor, batch_size in (("thread", 1), ("process", 1), ("process", 8)):
+        rate = run(executor, args.workers, args.jobs, args.iterations, batch_size)
+        print(f"{executor:>8} batch={batch_size:<3} {rate:10.1f} jobs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark of journal recovery for the Job Queue System.
+
+Fills a journaling JobQueueManager with queued jobs, then measures how long a
+fresh manager takes to rebuild its queues on __enter__, both from the raw log
+and from a compacted snapshot. The export_jobs/import_jobs JSON round trip is
+timed as the baseline.
+
+Usage:
+    PYTHONPATH=repository_after python tests/benchmark_recovery.py --jobs 5000000
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'repository_after'))
+
+from job_queue import JobQueue, JobQueueManager
+
+logging.getLogger("job_queue").setLevel(logging.WARNING)
+
+
+def fill(journal_dir: str, jobs: int, batch: int) -> float:
+    """Submit jobs in batches and return the elapsed time."""
+    manager = JobQueueManager(config={"journal_dir": journal_dir})
+    manager.register_handler("bench", lambda payload: None)
+    start = time.perf_counter()
+    for offset in range(0, jobs, batch):
+        manager.submit_many([
+            {"job_type": "bench", "payload": {"n": i}, "priority": i % 10 + 1}
+            for i in range(offset, min(offset + batch, jobs))
+        ])
+    manager._journal.close()
+    return time.perf_counter() - start
+
+
+def recover(journal_dir: str, checkpoint: bool) -> float:
+    """Time a manager restart from the journal."""
+    if checkpoint:
+        manager = JobQueueManager(config={"journal_dir": journal_dir})
+        manager.__enter__()
+        manager.checkpoint()
+        manager._journal.close()
+
+    manager = JobQueueManager(config={"journal_dir": journal_dir})
+    start = time.perf_counter()
+    manager.__enter__()
+    elapsed = time.perf_counter() - start
+    manager._journal.close()
+    return elapsed
+
+
+def json_round_trip(journal_dir: str) -> float:
+    """Time the export_jobs -> json -> import_jobs baseline for the same state."""
+    manager = JobQueueManager(config={"journal_dir": journal_dir})
+    manager.__enter__()
+    manager._journal.close()
+    path = os.path.join(journal_dir, "export.json")
+    with open(path, "w") as f:
+        json.dump(manager.get_queue("default").export_jobs(), f)
+
+    start = time.perf_counter()
+    with open(path) as f:
+        data = json.load(f)
+    JobQueue().import_jobs(data)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000)
+    args = parser.parse_args()
+
+    journal_dir = tempfile.mkdtemp(prefix="job-journal-")
+    try:
+        print(f"jobs:                    {args.jobs}")
+        print(f"submit (journaled):      {fill(journal_dir, args.jobs, args.batch):8.2f} s")
+        print(f"recover from log:        {recover(journal_dir, checkpoint=False):8.2f} s")
+        print(f"recover from snapshot:   {recover(journal_dir, checkpoint=True):8.2f} s")
+        print(f"export/import baseline:  {json_round_trip(journal_dir):8.2f} s")
+    finally:
+        shutil.rmtree(journal_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,34 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'repository_after'))
 
 from job_queue import (
-    Job, JobStatus, JobQueue, Worker, EventHandler, JobQueueManager
+    Job, JobStatus, JobQueue, ShardedJobQueue, JobJournal, Worker, EventHandler,
+    JobQueueManager, ProcessBackend, ThreadBackend, RemoteHandlerError
 )
 
 
+def _pid_handler(payload):
+    """Module-level handler so it can be pickled into child processes."""
+    return {"pid": os.getpid(), "value": payload.get("value")}
+
+
+def _sleep_handler(payload):
+    time.sleep(payload.get("seconds", 60))
+    return "woke"
+
+
+def _failing_handler(payload):
+    raise ValueError("handler exploded")
+
+
+class _UnpicklableError(Exception):
+    def __init__(self, code, detail):
+        super().__init__(f"{code}: {detail}")
+
+
+def _unpicklable_failing_handler(payload):
+    raise _UnpicklableError(7, "bad input")
+
+
 class TestJob:
     """Tests for the Job class."""
 
@@ -168,6 +192,51 @@ class TestJobQueue:
         assert dequeued is not None
         assert dequeued.job_id == ready_job.job_id
 
+    def test_delayed_job_does_not_block_ready_jobs(self):
+        """Test that many high-priority delayed jobs never starve ready low-priority ones."""
+        queue = JobQueue()
+
+        for _ in range(10):
+            queue.enqueue(Job.create(
+                job_type="future", priority=10, scheduled_at=time.time() + 3600
+            ))
+        ready = [Job.create(job_type="ready", priority=1) for _ in range(3)]
+        for job in ready:
+            queue.enqueue(job)
+
+        dequeued = [queue.dequeue() for _ in range(3)]
+        assert [j.job_id for j in dequeued] == [j.job_id for j in ready]
+        assert queue.dequeue() is None
+
+    def test_delayed_job_promoted_by_priority_when_due(self):
+        """Test that due delayed jobs are promoted and ordered by priority."""
+        queue = JobQueue()
+
+        low = Job.create(job_type="low", priority=1)
+        high = Job.create(job_type="high", priority=10, scheduled_at=time.time() + 0.05)
+        queue.enqueue(low)
+        queue.enqueue(high)
+
+        time.sleep(0.1)
+        assert queue.dequeue().job_id == high.job_id
+        assert queue.dequeue().job_id == low.job_id
+
+    def test_rescheduled_job_waits_in_delayed_heap(self):
+        """Test that a job rescheduled with backoff does not block other jobs."""
+        queue = JobQueue()
+
+        retried = Job.create(job_type="retry", priority=10)
+        other = Job.create(job_type="other", priority=1)
+        queue.enqueue(retried)
+        queue.enqueue(other)
+
+        assert queue.dequeue().job_id == retried.job_id
+        retried.scheduled_at = time.time() + 3600
+        queue.reschedule(retried.job_id)
+
+        assert queue.dequeue().job_id == other.job_id
+        assert queue.dequeue() is None
+
     def test_dequeue_skips_blocked_jobs(self):
         """Test that dequeue skips dependency-blocked jobs to find ready ones."""
         queue = JobQueue()
@@ -243,6 +312,68 @@ class TestJobQueue:
 
         assert queue2.size == 2
 
+    def test_blocking_dequeue_times_out(self):
+        """Test that a blocking dequeue on an empty queue returns None after the timeout."""
+        queue = JobQueue()
+
+        start = time.time()
+        assert queue.dequeue(timeout=0.1) is None
+        assert time.time() - start >= 0.09
+
+    def test_blocking_dequeue_wakes_on_enqueue(self):
+        """Test that a blocked consumer is woken as soon as a job is enqueued."""
+        queue = JobQueue()
+        job = Job.create(job_type="test")
+        result = {}
+
+        def consume():
+            result["job"] = queue.dequeue(timeout=5.0)
+            result["at"] = time.time()
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        time.sleep(0.05)
+        enqueued_at = time.time()
+        queue.enqueue(job)
+        consumer.join(timeout=5.0)
+
+        assert result["job"].job_id == job.job_id
+        assert result["at"] - enqueued_at < 0.5
+
+    def test_blocking_dequeue_wakes_on_dependency_completion(self):
+        """Test that completing a dependency wakes a consumer waiting on its dependent."""
+        queue = JobQueue()
+        dep_job = Job.create(job_type="dep")
+        main_job = Job.create(job_type="main", depends_on=[dep_job.job_id])
+        queue.enqueue(dep_job)
+        queue.enqueue(main_job)
+
+        assert queue.dequeue().job_id == dep_job.job_id
+        result = {}
+
+        def consume():
+            result["job"] = queue.dequeue(timeout=5.0)
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        time.sleep(0.05)
+        dep_job.status = JobStatus.COMPLETED
+        queue.update_status(dep_job.job_id, JobStatus.COMPLETED)
+        consumer.join(timeout=5.0)
+
+        assert result["job"].job_id == main_job.job_id
+
+    def test_blocking_dequeue_wakes_at_scheduled_time(self):
+        """Test that a blocked consumer wakes when a scheduled job comes due."""
+        queue = JobQueue()
+        job = Job.create(job_type="delayed", scheduled_at=time.time() + 0.1)
+        queue.enqueue(job)
+
+        dequeued = queue.dequeue(timeout=5.0)
+        assert dequeued is not None
+        assert dequeued.job_id == job.job_id
+        assert time.time() >= job.scheduled_at
+
     def test_duplicate_job_raises(self):
         """Test that enqueueing duplicate job raises ValueError."""
         queue = JobQueue()
@@ -614,6 +745,292 @@ class TestJobQueueManager:
         assert manager.get_queue("queue2").size == 1
 
 
+class TestBatchOperations:
+    """Tests for batch submit/dequeue and sharded queues."""
+
+    def test_enqueue_many_dequeue_batch(self):
+        """Test that a batch enqueue can be drained in priority order by dequeue_batch."""
+        queue = JobQueue()
+        jobs = [Job.create(job_type="batch", priority=p) for p in (1, 9, 5, 7)]
+
+        assert queue.enqueue_many(jobs) == [j.job_id for j in jobs]
+        assert queue.size == 4
+
+        batch = queue.dequeue_batch(3)
+        assert [j.priority for j in batch] == [9, 7, 5]
+        assert [j.priority for j in queue.dequeue_batch(3)] == [1]
+        assert queue.dequeue_batch(3) == []
+
+    def test_enqueue_many_rejects_duplicates_atomically(self):
+        """Test that a duplicate in the batch leaves the queue unchanged."""
+        queue = JobQueue()
+        job = Job.create(job_type="dup")
+
+        with pytest.raises(ValueError, match="already exists"):
+            queue.enqueue_many([Job.create(job_type="ok"), job, job])
+        assert queue.size == 0
+
+    def test_submit_many(self):
+        """Test submitting a batch of jobs through the manager."""
+        manager = JobQueueManager()
+        manager.register_handler("a", lambda p: p)
+        manager.register_handler("b", lambda p: p, queue="other")
+
+        job_ids = manager.submit_many([
+            {"job_type": "a", "payload": {"n": 1}},
+            {"job_type": "b", "priority": 9},
+            {"job_type": "a", "payload": {"n": 2}},
+        ])
+
+        assert len(job_ids) == 3
+        assert manager.get_queue("default").size == 2
+        assert manager.get_queue("other").size == 1
+        assert manager.get_stats()["total_submitted"] == 3
+
+    def test_submit_many_validates_whole_batch(self):
+        """Test that one invalid job rejects the batch before anything is enqueued."""
+        manager = JobQueueManager()
+        manager.register_handler("a", lambda p: p)
+
+        with pytest.raises(ValueError, match="No handler registered"):
+            manager.submit_many([{"job_type": "a"}, {"job_type": "missing"}])
+        with pytest.raises(ValueError, match="priority"):
+            manager.submit_many([{"job_type": "a"}, {"job_type": "a", "priority": 99}])
+        assert manager.get_queue("default").size == 0
+
+    def test_shared_dependency_is_not_circular(self):
+        """Test that two dependencies sharing an ancestor are not reported as a cycle."""
+        manager = JobQueueManager()
+        manager.register_handler("a", lambda p: p)
+
+        root = manager.submit("a")
+        left = manager.submit("a", depends_on=[root])
+        right = manager.submit("a", depends_on=[root])
+        manager.submit("a", depends_on=[left, right])
+
+        assert manager.get_queue("default").size == 4
+
+    def test_sharded_queue_steals_work(self):
+        """Test that a consumer drains jobs from every shard."""
+        queue = ShardedJobQueue(shards=4)
+        jobs = [Job.create(job_type="s") for _ in range(20)]
+        queue.enqueue_many(jobs)
+
+        drained = []
+        while True:
+            job = queue.dequeue()
+            if job is None:
+                break
+            drained.append(job.job_id)
+
+        assert sorted(drained) == sorted(j.job_id for j in jobs)
+
+    def test_sharded_queue_cross_shard_dependency(self):
+        """Test that completing a job wakes a dependent held on another shard."""
+        queue = ShardedJobQueue(shards=2)
+        dep_job = Job.create(job_type="dep")
+        other = Job.create(job_type="other")
+        queue.enqueue(dep_job)
+        queue.enqueue(other)
+        main_job = Job.create(job_type="main", depends_on=[dep_job.job_id, other.job_id])
+        queue.enqueue(main_job)
+
+        taken = {queue.dequeue().job_id, queue.dequeue().job_id}
+        assert taken == {dep_job.job_id, other.job_id}
+        assert queue.dequeue() is None
+
+        for job in (dep_job, other):
+            job.status = JobStatus.COMPLETED
+            queue.update_status(job.job_id, JobStatus.COMPLETED)
+
+        assert queue.dequeue(timeout=1.0).job_id == main_job.job_id
+
+    def test_manager_sharded_queue_workers(self):
+        """Test that workers on a sharded queue process every submitted job."""
+        with JobQueueManager(config={"worker_batch_size": 4}) as manager:
+            results = []
+            lock = threading.Lock()
+
+            def handler(payload):
+                with lock:
+                    results.append(payload["i"])
+
+            manager.create_queue("sharded", shards=4)
+            manager.register_handler("work", handler, queue="sharded")
+            manager.start_workers(queue="sharded", count=8)
+
+            job_ids = manager.submit_many(
+                [{"job_type": "work", "payload": {"i": i}} for i in range(200)]
+            )
+            assert manager.wait_for_completion(job_ids, timeout=10)
+
+        assert sorted(results) == list(range(200))
+
+
+class TestJournal:
+    """Tests for write-ahead journaling and crash recovery."""
+
+    def _manager(self, journal_dir):
+        manager = JobQueueManager(config={"journal_dir": str(journal_dir)})
+        manager.register_handler("work", lambda payload: payload.get("n"))
+        return manager
+
+    def test_recover_submitted_jobs(self, tmp_path):
+        """Test that submitted jobs survive a restart."""
+        with self._manager(tmp_path) as manager:
+            job_ids = manager.submit_many(
+                [{"job_type": "work", "payload": {"n": i}, "priority": 3} for i in range(5)]
+            )
+
+        with self._manager(tmp_path) as recovered:
+            queue = recovered.get_queue("default")
+            assert queue.size == 5
+            assert queue.get_job(job_ids[2]).payload == {"n": 2}
+            assert queue.dequeue().priority == 3
+
+    def test_recover_status_transitions(self, tmp_path):
+        """Test that completed jobs and their results are replayed from the log."""
+        with self._manager(tmp_path) as manager:
+            job_id = manager.submit("work", {"n": 7})
+            pending_id = manager.submit("work", {"n": 8}, scheduled_at=time.time() + 3600)
+            manager.start_workers(count=1)
+            assert manager.wait_for_completion([job_id], timeout=5)
+
+        with self._manager(tmp_path) as recovered:
+            job = recovered.get_job(job_id)
+            assert job.status == JobStatus.COMPLETED
+            assert job.result == 7
+            assert recovered.get_job(pending_id).status == JobStatus.PENDING
+
+    def test_running_jobs_reset_to_pending(self, tmp_path):
+        """Test that jobs caught mid-execution by a crash are rerun."""
+        manager = self._manager(tmp_path)
+        job_id = manager.submit("work", {"n": 1})
+        queue = manager.get_queue("default")
+        queue.dequeue()
+        queue.update_status(job_id, JobStatus.RUNNING)
+        manager._journal.flush()
+
+        with self._manager(tmp_path) as recovered:
+            assert recovered.get_job(job_id).status == JobStatus.PENDING
+            assert recovered.get_queue("default").dequeue().job_id == job_id
+
+    def test_checkpoint_compacts_segments(self, tmp_path):
+        """Test that a checkpoint drops covered log segments without losing state."""
+        with self._manager(tmp_path) as manager:
+            first = manager.submit("work", {"n": 1})
+            manager.checkpoint()
+            second = manager.submit("work", {"n": 2})
+            manager.get_queue("default").remove(first)
+
+        logs = [name for name in os.listdir(tmp_path) if name.endswith(".log")]
+        assert len(logs) == 1
+        assert os.path.exists(tmp_path / JobJournal.SNAPSHOT_FILE)
+
+        with self._manager(tmp_path) as recovered:
+            queue = recovered.get_queue("default")
+            assert queue.size == 1
+            assert queue.get_job(second).payload == {"n": 2}
+
+    def test_torn_tail_is_ignored(self, tmp_path):
+        """Test that a partially written final record does not break recovery."""
+        with self._manager(tmp_path) as manager:
+            job_id = manager.submit("work", {"n": 1})
+
+        log = [name for name in os.listdir(tmp_path) if name.endswith(".log")][0]
+        with open(tmp_path / log, "a") as f:
+            f.write('["S","default",{"job_id":')
+
+        with self._manager(tmp_path) as recovered:
+            assert recovered.get_queue("default").size == 1
+            assert recovered.get_job(job_id).payload == {"n": 1}
+            later = [recovered.submit("work", {"n": n}) for n in range(2, 6)]
+
+        # Records appended after recovery must not be hidden behind the torn bytes
+        with self._manager(tmp_path) as restarted:
+            assert restarted.get_queue("default").size == 5
+            for n, later_id in enumerate(later, start=2):
+                assert restarted.get_job(later_id).payload == {"n": n}
+
+
+class TestExecutionBackends:
+    """Tests for pluggable thread and process execution backends."""
+
+    def test_thread_backend_timeout(self):
+        """Test that the thread backend raises on timeout."""
+        from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+        with pytest.raises(FuturesTimeoutError):
+            ThreadBackend().run(_sleep_handler, {"seconds": 1}, timeout=0.05)
+
+    def test_process_backend_runs_in_child(self):
+        """Test that handlers run in a separate process and results come back."""
+        backend = ProcessBackend(processes=1)
+        try:
+            result = backend.run(_pid_handler, {"value": 3})
+            assert result["value"] == 3
+            assert result["pid"] != os.getpid()
+
+            outcomes = backend.run_batch([(_pid_handler, {"value": i}) for i in range(3)])
+            assert [value["value"] for ok, value in outcomes] == [0, 1, 2]
+            assert all(ok for ok, _ in outcomes)
+        finally:
+            backend.shutdown()
+
+    def test_process_backend_kills_stuck_child(self):
+        """Test that a timed-out child is killed and replaced."""
+        from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+        backend = ProcessBackend(processes=1)
+        try:
+            first_pid = backend.run(_pid_handler, {})["pid"]
+            with pytest.raises(FuturesTimeoutError):
+                backend.run(_sleep_handler, {"seconds": 60}, timeout=0.2)
+
+            assert backend.run(_pid_handler, {})["pid"] != first_pid
+        finally:
+            backend.shutdown()
+
+    def test_process_backend_propagates_errors(self):
+        """Test that handler exceptions keep their type across the process boundary."""
+        backend = ProcessBackend(processes=1)
+        try:
+            with pytest.raises(ValueError, match="handler exploded"):
+                backend.run(_failing_handler, {})
+            with pytest.raises(RemoteHandlerError, match="7: bad input") as info:
+                backend.run(_unpicklable_failing_handler, {})
+            assert info.value.type_name == "_UnpicklableError"
+
+            outcomes = backend.run_batch([(_failing_handler, {}), (_pid_handler, {"value": 1})])
+            assert outcomes[0] == (False, "handler exploded")
+            assert outcomes[1][0] is True
+        finally:
+            backend.shutdown()
+
+    def test_manager_process_queue(self):
+        """Test end-to-end execution on a process-backed queue with batching."""
+        with JobQueueManager(config={"worker_batch_size": 4}) as manager:
+            manager.create_queue("cpu", executor="process", processes=2)
+            manager.register_handler("pid", _pid_handler, queue="cpu")
+            manager.start_workers(queue="cpu", count=2)
+
+            job_ids = manager.submit_many(
+                [{"job_type": "pid", "payload": {"value": i}} for i in range(10)]
+            )
+            assert manager.wait_for_completion(job_ids, timeout=30)
+
+            jobs = [manager.get_job(job_id) for job_id in job_ids]
+            assert all(job.status == JobStatus.COMPLETED for job in jobs)
+            assert [job.result["value"] for job in jobs] == list(range(10))
+            assert all(job.result["pid"] != os.getpid() for job in jobs)
+
+    def test_unknown_executor_rejected(self):
+        """Test that an unknown backend name raises ValueError."""
+        manager = JobQueueManager()
+        with pytest.raises(ValueError, match="Unknown executor backend"):
+            manager.create_queue("bad", executor="gpu")
+
+
 class TestThreadSafety:
     """Tests for thread safety."""
 
@@ -36,6 +36,9 @@ class Settings(BaseSettings):
     task_time_limit_seconds: int = Field(default=3700, alias="TASK_TIME_LIMIT_SECONDS")
     worker_shutdown_timeout_seconds: int = Field(default=60, alias="WORKER_SHUTDOWN_TIMEOUT_SECONDS")
 
+    # Parsed batches buffered between the parser thread and the DB loader.
+    ingest_queue_maxsize: int = Field(default=4, alias="INGEST_QUEUE_MAXSIZE")
+
     def resolved_broker_url(self) -> str:
         return self.celery_broker_url or self.redis_url
 
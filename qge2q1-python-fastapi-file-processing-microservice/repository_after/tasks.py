@@ -1,20 +1,25 @@
 from __future__ import annotations
 
 import asyncio
-import csv
+import itertools
+import json
 import math
+import os
 import re
 import time
 import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 from celery.exceptions import SoftTimeLimitExceeded
 from openpyxl import load_workbook
 from redis.asyncio import Redis
-from sqlalchemy import insert, select, update
+from sqlalchemy import JSON, Table, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .celery_app import celery_app
@@ -121,10 +126,170 @@ def _validate_row(row: dict[str, Any]) -> list[tuple[str | None, str, str, str |
     return errors
 
 
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+RowErrors = list[tuple[str | None, str, str, str | None]]
+
+
+def _transform_column(name: str, series: pd.Series) -> tuple[list[Any], list[tuple[int, tuple[str | None, str, str, str | None]]]]:
+    """Column-wise `_transform_value` + `_validate_row` for one column.
+
+    Returns the transformed values and `(position, error)` pairs. Columns of
+    unexpected object types fall back to the per-value functions.
+
+    Values follow the mixed-dtype per-row path whatever the column dtype:
+    int/bool/uint columns give native ints (bools as 0/1). Integers outside
+    int64 are not supported; as in the per-row path, they fail validation
+    with "Integer out of range", including values of a uint64 column.
+    """
+    errors: list[tuple[int, tuple[str | None, str, str, str | None]]] = []
+    kind = series.dtype.kind
+
+    if kind == "b":
+        return series.astype("int64").tolist(), errors
+
+    if kind == "i":
+        return series.tolist(), errors
+
+    if kind == "u":
+        values = series.tolist()
+        for pos in np.flatnonzero(series.to_numpy() > _INT64_MAX):
+            errors.append((int(pos), (name, "CONSTRAINT", "Integer out of range", str(values[pos]))))
+        return values, errors
+
+    if kind == "f":
+        arr = series.to_numpy(dtype=float)
+        finite = np.isfinite(arr)
+        integral = finite & (np.floor(arr) == arr)
+        small = integral & (np.abs(arr) < 2**63)
+        out = arr.astype(object)
+        out[small] = arr[small].astype(np.int64).astype(object)
+        out[~finite] = None
+        for pos in np.flatnonzero(integral & ~small):
+            out[pos] = value = int(arr[pos])
+            if value < _INT64_MIN or value > _INT64_MAX:
+                errors.append((int(pos), (name, "CONSTRAINT", "Integer out of range", str(value))))
+        for pos in np.flatnonzero(~finite):
+            errors.append((int(pos), (name, "NULL", "Value is required", None)))
+        errors.sort(key=lambda e: e[0])
+        return out.tolist(), errors
+
+    if kind == "O" and pd.api.types.infer_dtype(series, skipna=True) in {"string", "empty"}:
+        codes, uniques = pd.factorize(series)
+        if len(uniques) * 2 < len(series):
+            # Repetitive text columns: transform each distinct value once.
+            unique_values, unique_errors = _transform_column(name, pd.Series(uniques, dtype=object))
+            lookup = np.empty(len(unique_values) + 1, dtype=object)
+            lookup[:-1] = unique_values
+            lookup[-1] = None
+            error_by_code = dict(unique_errors)
+            bad = codes == -1
+            if error_by_code:
+                bad |= np.isin(codes, np.fromiter(error_by_code, dtype=codes.dtype))
+            for pos in np.flatnonzero(bad):
+                code = codes[pos]
+                errors.append((int(pos), error_by_code[code] if code >= 0 else (name, "NULL", "Value is required", None)))
+            return lookup[codes].tolist(), errors
+
+        stripped = series.str.strip()
+        present = stripped.notna().to_numpy() & (stripped != "").to_numpy()
+        is_int = present & stripped.str.fullmatch(_INT_RE.pattern, na=False).to_numpy(dtype=bool)
+        is_float = present & ~is_int & stripped.str.fullmatch(_FLOAT_RE.pattern, na=False).to_numpy(dtype=bool)
+        # copy=True: with pandas' string dtype this can otherwise be a view,
+        # and writing parsed numbers into it would corrupt `stripped`.
+        out = stripped.to_numpy(dtype=object, na_value=None, copy=True)
+        out[~present] = None
+
+        for pos in np.flatnonzero(is_int):
+            out[pos] = value = int(out[pos])
+            if value < _INT64_MIN or value > _INT64_MAX:
+                errors.append((int(pos), (name, "CONSTRAINT", "Integer out of range", str(value))))
+        for pos in np.flatnonzero(is_float):
+            value = float(out[pos])
+            if math.isfinite(value):
+                out[pos] = value
+            else:
+                out[pos] = None
+                present[pos] = False
+
+        too_long = present & ~is_int & ~is_float & (stripped.str.len().fillna(0).to_numpy() > 2000)
+        for pos in np.flatnonzero(too_long):
+            errors.append((int(pos), (name, "CONSTRAINT", "Value too long", out[pos][:2000])))
+        for pos in np.flatnonzero(~present):
+            errors.append((int(pos), (name, "NULL", "Value is required", None)))
+        errors.sort(key=lambda e: e[0])
+        return out.tolist(), errors
+
+    # Timestamps from inferred datetime64 columns go back to plain datetimes.
+    values = [
+        _transform_value(v.to_pydatetime() if isinstance(v, pd.Timestamp) else v) for v in series.tolist()
+    ]
+    for pos, value in enumerate(values):
+        for err in _validate_row({name: value}):
+            errors.append((pos, err))
+    return values, errors
+
+
+def _transform_frame(frame: pd.DataFrame) -> tuple[list[str], list[list[Any]], dict[int, RowErrors]]:
+    """Transform + validate a chunk column by column.
+
+    Returns column names, per-column value lists and, for failing rows only,
+    their errors in column order keyed by position within the chunk.
+    """
+    columns = [str(c) for c in frame.columns]
+    values: list[list[Any]] = []
+    row_errors: dict[int, RowErrors] = {}
+    for i, name in enumerate(columns):
+        col_values, col_errors = _transform_column(name, frame.iloc[:, i])
+        values.append(col_values)
+        for pos, err in col_errors:
+            row_errors.setdefault(pos, []).append(err)
+    return columns, values, row_errors
+
+
+def _transform_records(
+    header: list[str],
+    records: list[tuple[Any, ...]],
+    row_numbers: list[int],
+) -> list[tuple[int, dict[str, Any], RowErrors]]:
+    """Transform + validate spreadsheet rows as one frame where possible.
+
+    Ragged rows or duplicate headers keep the per-row path, since they map
+    to dicts with differing keys.
+
+    The frame is built with dtype=object: letting pandas infer would upcast
+    an int column holding a blank or a float to float64 and round integers
+    above 2**53. Numeric object columns take the exact per-value fallback
+    of `_transform_column`; text columns stay vectorized.
+    """
+    width = len(header)
+    if width and len(set(header)) == width and all(len(r) == width for r in records):
+        frame = pd.DataFrame(records, columns=header, dtype=object)
+        columns, values, row_errors = _transform_frame(frame)
+        return [
+            (rn, dict(zip(columns, row_values)), row_errors.get(i, []))
+            for i, (rn, row_values) in enumerate(zip(row_numbers, zip(*values)))
+        ]
+
+    out = []
+    for rn, row_vals in zip(row_numbers, records):
+        row_dict = {header[i] if i < len(header) else f"col_{i}": row_vals[i] for i in range(len(row_vals))}
+        item = _transform_row(row_dict)
+        out.append((rn, item, _validate_row(item)))
+    return out
+
+
 def _should_persist(last_persist: float, now: float, interval: float) -> bool:
     return (now - last_persist) >= interval
 
 
+def _byte_progress(consumed: float, total: int) -> int:
+    if total <= 0:
+        return 100
+    return int(min(consumed, total) / total * 100)
+
+
 async def _get_job(session: AsyncSession, job_id: uuid.UUID) -> Job | None:
     res = await session.execute(select(Job).where(Job.id == job_id))
     return res.scalar_one_or_none()
@@ -165,27 +330,54 @@ async def _update_job_progress(
     await session.commit()
 
 
+def _new_ids(n: int) -> list[uuid.UUID]:
+    # One urandom call per batch instead of one per uuid4().
+    raw = os.urandom(16 * n)
+    return [uuid.UUID(bytes=raw[i : i + 16], version=4) for i in range(0, 16 * n, 16)]
+
+
+async def _bulk_load(session: AsyncSession, table: Table, columns: list[str], records: list[tuple[Any, ...]]) -> None:
+    """Append `records` to `table` inside the session's transaction.
+
+    PostgreSQL (asyncpg) gets a binary COPY on the session's connection;
+    other backends (SQLite in tests) get one executemany INSERT.
+    """
+    if not records:
+        return
+
+    bind = getattr(session, "bind", None)
+    dialect = getattr(bind, "dialect", None)
+    if dialect is not None and dialect.name == "postgresql" and dialect.driver == "asyncpg":
+        json_cols = [i for i, c in enumerate(columns) if isinstance(table.c[c].type, JSON)]
+        if json_cols:
+            records = [
+                tuple(json.dumps(v) if i in json_cols else v for i, v in enumerate(rec)) for rec in records
+            ]
+        conn = await session.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns, schema_name=table.schema
+        )
+        return
+
+    await session.execute(insert(table), [dict(zip(columns, rec)) for rec in records])
+
+
+_ERROR_COLUMNS = ["id", "job_id", "row_number", "column_name", "error_type", "error_message", "raw_value"]
+_LOADED_COLUMNS = ["id", "job_id", "row_number", "data"]
+
+
 async def _log_errors(
     session: AsyncSession,
     job_id: uuid.UUID,
-    row_number: int,
-    errors: list[tuple[str | None, str, str, str | None]],
+    failed_rows: list[tuple[int, RowErrors]],
 ) -> None:
-    payload = []
-    for (column_name, error_type, error_message, raw_value) in errors:
-        payload.append(
-            {
-                "id": uuid.uuid4(),
-                "job_id": job_id,
-                "row_number": int(row_number),
-                "column_name": column_name,
-                "error_type": error_type,
-                "error_message": error_message,
-                "raw_value": raw_value,
-            }
-        )
-    if payload:
-        await session.execute(insert(ProcessingError), payload)
+    flat = [(row_number, err) for (row_number, errors) in failed_rows for err in errors]
+    records = [
+        (rid, job_id, int(row_number), column_name, error_type, error_message, raw_value)
+        for rid, (row_number, (column_name, error_type, error_message, raw_value)) in zip(_new_ids(len(flat)), flat)
+    ]
+    await _bulk_load(session, ProcessingError.__table__, _ERROR_COLUMNS, records)
 
 
 async def _insert_loaded_rows(
@@ -196,66 +388,132 @@ async def _insert_loaded_rows(
 ) -> None:
     if not rows:
         return
-    payload = []
-    for (row_number, data) in rows:
-        payload.append(
-            {
-                "id": uuid.uuid4(),
-                "job_id": job_id,
-                "row_number": int(row_number),
-                "data": data,
-            }
-        )
-    await session.execute(insert(LoadedRow), payload)
+    records = [
+        (rid, job_id, int(row_number), data) for rid, (row_number, data) in zip(_new_ids(len(rows)), rows)
+    ]
+    await _bulk_load(session, LoadedRow.__table__, _LOADED_COLUMNS, records)
 
 
-async def _process_csv(path: Path, job_id: uuid.UUID, session: AsyncSession) -> tuple[int, int]:
-    # Determine total rows (excluding header) for progress.
-    total_rows = 0
-    with path.open("r", newline="", encoding="utf-8", errors="ignore") as f:
-        reader = csv.reader(f)
-        try:
-            next(reader)
-        except StopIteration:
-            total_rows = 0
-        else:
-            total_rows = sum(1 for _ in reader)
+@dataclass
+class _Batch:
+    """One parsed + validated slice of the input, ready to load."""
+
+    loaded: list[tuple[int, dict[str, Any]]]
+    failed: list[tuple[int, RowErrors]]
+    rows_seen: int
+    rows_failed: int
+    progress: int
+
 
+_END = object()
+
+
+def _csv_batches(path: Path) -> Iterator[_Batch]:
+    # Progress comes from how far the parser has read into the file, so no
+    # separate row-counting pass is needed.
+    total_bytes = path.stat().st_size
     rows_seen = 0
     rows_failed = 0
+    with path.open("rb") as f:
+        for chunk in pd.read_csv(f, chunksize=10_000):
+            columns, values, row_errors = _transform_frame(chunk)
+            loaded: list[tuple[int, dict[str, Any]]] = []
+            failed: list[tuple[int, RowErrors]] = []
+            for i, row_values in enumerate(zip(*values)):
+                rows_seen += 1
+                errs = row_errors.get(i)
+                if errs:
+                    failed.append((rows_seen, errs))
+                else:
+                    loaded.append((rows_seen, dict(zip(columns, row_values))))
+            rows_failed += len(failed)
+            yield _Batch(loaded, failed, rows_seen, rows_failed, _byte_progress(f.tell(), total_bytes))
 
-    last_persist = time.monotonic()
 
-    pending_loaded: list[tuple[int, dict[str, Any]]] = []
-    pending_error_inserts = 0
+def _excel_batches(ws: Any) -> Iterator[_Batch]:
+    total_rows = max(0, (ws.max_row or 0) - 1)
+    rows_iter = ws.iter_rows(values_only=True)
+    try:
+        header_vals = next(rows_iter)
+        header = [str(c) if c is not None else "" for c in header_vals]
+    except StopIteration:
+        header = []
 
-    for chunk in pd.read_csv(path, chunksize=10_000):
-        # cancellation check before chunk
-        job = await _get_job(session, job_id)
-        if not job or job.status == JobStatus.CANCELLED:
-            break
-
-        for _, row in chunk.iterrows():
-            rows_seen += 1
-            raw = {str(k): row[k] for k in row.index}
-            transformed = _transform_row(raw)
-            errs = _validate_row(transformed)
+    rows_seen = 0
+    rows_failed = 0
+    while True:
+        batch = list(itertools.islice(rows_iter, 10_000))
+        if not batch:
+            return
+        row_numbers = list(range(rows_seen + 1, rows_seen + len(batch) + 1))
+        rows_seen += len(batch)
+        loaded: list[tuple[int, dict[str, Any]]] = []
+        failed: list[tuple[int, RowErrors]] = []
+        for rn, item, errs in _transform_records(header, batch, row_numbers):
             if errs:
-                rows_failed += 1
-                await _log_errors(session, job_id, rows_seen, errs)
-                pending_error_inserts += len(errs)
+                failed.append((rn, errs))
             else:
-                pending_loaded.append((rows_seen, transformed))
+                loaded.append((rn, item))
+        rows_failed += len(failed)
+        progress = 100 if total_rows == 0 else int((rows_seen / max(total_rows, 1)) * 100)
+        yield _Batch(loaded, failed, rows_seen, rows_failed, progress)
+
+
+async def _produce(batches: Iterator[_Batch], queue: asyncio.Queue, stop: asyncio.Event) -> None:
+    # Parsing/validation is CPU work; run it off the event loop so it overlaps
+    # with the loader's database round trips.
+    try:
+        while not stop.is_set():
+            batch = await asyncio.to_thread(next, batches, _END)
+            if batch is _END:
+                break
+            await queue.put(batch)
+    except Exception as exc:  # noqa: BLE001
+        await queue.put(exc)
+    finally:
+        await queue.put(_END)
+
+
+async def _run_pipeline(batches: Iterator[_Batch], job_id: uuid.UUID, session: AsyncSession) -> tuple[int, int]:
+    """Load batches from a bounded queue filled by a parser running in a thread.
+
+    Job progress is persisted, and cancellation checked, on the first batch
+    and then at most every `progress_update_interval_seconds`.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ingest_queue_maxsize)
+    stop = asyncio.Event()
+    producer = asyncio.create_task(_produce(batches, queue, stop))
+
+    rows_seen = 0
+    rows_failed = 0
+    progress = 0
+    completed = False
+    last_persist: float | None = None
+
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is _END:
+                completed = True
+                break
+            if isinstance(batch, Exception):
+                raise batch
 
             now = time.monotonic()
-            if _should_persist(last_persist, now, settings.progress_update_interval_seconds):
+            persist = last_persist is None or _should_persist(last_persist, now, settings.progress_update_interval_seconds)
+            if persist:
+                # cancellation check before loading the batch
+                job = await _get_job(session, job_id)
+                if not job or job.status == JobStatus.CANCELLED:
+                    break
+
+            await _insert_loaded_rows(session, job_id=job_id, rows=batch.loaded)
+            await _log_errors(session, job_id, batch.failed)
+            rows_seen, rows_failed, progress = batch.rows_seen, batch.rows_failed, batch.progress
+
+            if persist:
                 last_persist = now
-
                 # Persist loaded rows + errors and job progress at least every 5 seconds.
-                await _insert_loaded_rows(session, job_id=job_id, rows=pending_loaded)
-                pending_loaded.clear()
-
-                progress = 100 if total_rows == 0 else int((rows_seen / max(total_rows, 1)) * 100)
                 await _update_job_progress(
                     session,
                     job_id,
@@ -263,106 +521,35 @@ async def _process_csv(path: Path, job_id: uuid.UUID, session: AsyncSession) ->
                     rows_processed=rows_seen,
                     rows_failed=rows_failed,
                 )
-
-        # End of chunk: persist any pending loaded rows so we don't build up memory.
-        if pending_loaded:
-            await _insert_loaded_rows(session, job_id=job_id, rows=pending_loaded)
-            pending_loaded.clear()
-
-        # Ensure progress isn't stale for long-running chunks.
-        now = time.monotonic()
-        if _should_persist(last_persist, now, settings.progress_update_interval_seconds):
-            last_persist = now
-            progress = 100 if total_rows == 0 else int((rows_seen / max(total_rows, 1)) * 100)
-            await _update_job_progress(
-                session,
-                job_id,
-                progress=progress,
-                rows_processed=rows_seen,
-                rows_failed=rows_failed,
-            )
+    finally:
+        # Unblock and wind down the producer whichever way we leave.
+        stop.set()
+        if not completed:
+            while await queue.get() is not _END:
+                pass
+        await producer
 
     # final persist
-    if pending_loaded:
-        await _insert_loaded_rows(session, job_id=job_id, rows=pending_loaded)
-        pending_loaded.clear()
-    progress = 100 if total_rows == 0 else int((rows_seen / max(total_rows, 1)) * 100)
-    await _update_job_progress(session, job_id, progress=progress, rows_processed=rows_seen, rows_failed=rows_failed)
+    await _update_job_progress(
+        session,
+        job_id,
+        progress=100 if completed else progress,
+        rows_processed=rows_seen,
+        rows_failed=rows_failed,
+    )
     return rows_seen, rows_failed
 
 
-async def _process_excel(path: Path, job_id: uuid.UUID, session: AsyncSession) -> tuple[int, int]:
-    wb = load_workbook(filename=str(path), read_only=True, data_only=True)
-    ws = wb.active
-
-    total_rows = max(0, (ws.max_row or 0) - 1)
-
-    rows_seen = 0
-    rows_failed = 0
+async def _process_csv(path: Path, job_id: uuid.UUID, session: AsyncSession) -> tuple[int, int]:
+    return await _run_pipeline(_csv_batches(path), job_id, session)
 
-    header: list[str] = []
-    last_persist = time.monotonic()
 
-    rows_iter = ws.iter_rows(values_only=True)
+async def _process_excel(path: Path, job_id: uuid.UUID, session: AsyncSession) -> tuple[int, int]:
+    wb = load_workbook(filename=str(path), read_only=True, data_only=True)
     try:
-        header_vals = next(rows_iter)
-        header = [str(c) if c is not None else "" for c in header_vals]
-    except StopIteration:
-        header = []
-
-    batch: list[dict[str, Any]] = []
-    batch_row_numbers: list[int] = []
-
-    for row_vals in rows_iter:
-        rows_seen += 1
-
-        # Check cancellation before building the next chunk.
-        job = await _get_job(session, job_id)
-        if not job or job.status == JobStatus.CANCELLED:
-            break
-
-        row_dict = {header[i] if i < len(header) else f"col_{i}": row_vals[i] for i in range(len(row_vals))}
-        batch.append(_transform_row(row_dict))
-        batch_row_numbers.append(rows_seen)
-
-        if len(batch) >= 10_000:
-            pending_loaded: list[tuple[int, dict[str, Any]]] = []
-            for i, item in enumerate(batch):
-                rn = batch_row_numbers[i]
-                errs = _validate_row(item)
-                if errs:
-                    rows_failed += 1
-                    await _log_errors(session, job_id, rn, errs)
-                else:
-                    pending_loaded.append((rn, item))
-
-            await _insert_loaded_rows(session, job_id=job_id, rows=pending_loaded)
-            batch.clear()
-            batch_row_numbers.clear()
-
-        now = time.monotonic()
-        if _should_persist(last_persist, now, settings.progress_update_interval_seconds):
-            last_persist = now
-            progress = 100 if total_rows == 0 else int((rows_seen / max(total_rows, 1)) * 100)
-            await _update_job_progress(session, job_id, progress=progress, rows_processed=rows_seen, rows_failed=rows_failed)
-
-    if batch:
-        pending_loaded: list[tuple[int, dict[str, Any]]] = []
-        for i, item in enumerate(batch):
-            rn = batch_row_numbers[i]
-            errs = _validate_row(item)
-            if errs:
-                rows_failed += 1
-                await _log_errors(session, job_id, rn, errs)
-            else:
-                pending_loaded.append((rn, item))
-        await _insert_loaded_rows(session, job_id=job_id, rows=pending_loaded)
-
-    progress = 100 if total_rows == 0 else int((rows_seen / max(total_rows, 1)) * 100)
-    await _update_job_progress(session, job_id, progress=progress, rows_processed=rows_seen, rows_failed=rows_failed)
-
-    wb.close()
-    return rows_seen, rows_failed
+        return await _run_pipeline(_excel_batches(wb.active), job_id, session)
+    finally:
+        wb.close()
 
 
 async def _process_job_async(job_id_str: str) -> None:
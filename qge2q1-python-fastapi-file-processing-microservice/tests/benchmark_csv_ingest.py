@@ -0,0 +1,104 @@
+"""Rows/s of CSV parse + transform + validate, before and after vectorizing.
+
+Usage:
+    python tests/benchmark_csv_ingest.py --rows 5000000
+    python tests/benchmark_csv_ingest.py --rows 5000000 --before-rows 500000
+
+"before" replays the previous path: a csv.reader pass to count rows, then
+`chunk.iterrows()` with `_transform_row` / `_validate_row` per row. "after"
+runs `_transform_frame` per chunk and builds the row dicts that get loaded.
+`--before-rows` limits the slow path to a prefix of the file; rows/s is
+reported either way. Database writes are excluded from both.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from repository_after.tasks import _transform_frame, _transform_row, _validate_row  # noqa: E402
+
+
+def write_csv(path: Path, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    labels = ["alpha", "beta", "gamma", " delta ", ""]
+    with path.open("w", encoding="utf-8", newline="") as f:
+        f.write("id,amount,ratio,label,code,active\n")
+        block = []
+        for i in range(rows):
+            amount = "" if rng.random() < 0.01 else f"{rng.random() * 1000:.2f}"
+            code = rng.choice(["A1", "17", "3.5", "B2", ""])
+            block.append(f"{i},{amount},{rng.randint(0, 10) / 4},{rng.choice(labels)},{code},{rng.random() < 0.5}\n")
+            if len(block) == 100_000:
+                f.writelines(block)
+                block.clear()
+        f.writelines(block)
+
+
+def run_before(path: Path, limit: int) -> tuple[int, int, float]:
+    t0 = time.perf_counter()
+    with path.open("r", newline="", encoding="utf-8", errors="ignore") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        sum(1 for _ in itertools.islice(reader, limit))
+
+    seen = failed = 0
+    for chunk in pd.read_csv(path, chunksize=10_000, nrows=limit):
+        for _, row in chunk.iterrows():
+            seen += 1
+            transformed = _transform_row({str(k): row[k] for k in row.index})
+            if _validate_row(transformed):
+                failed += 1
+    return seen, failed, time.perf_counter() - t0
+
+
+def run_after(path: Path) -> tuple[int, int, float]:
+    t0 = time.perf_counter()
+    seen = failed = 0
+    with path.open("rb") as f:
+        for chunk in pd.read_csv(f, chunksize=10_000):
+            columns, values, row_errors = _transform_frame(chunk)
+            for i, row_values in enumerate(zip(*values)):
+                seen += 1
+                if i in row_errors:
+                    failed += 1
+                else:
+                    dict(zip(columns, row_values))
+    return seen, failed, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--before-rows", type=int, default=None, help="rows for the per-row path (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-before", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.csv"
+        write_csv(path, args.rows, args.seed)
+        print(f"rows={args.rows} file={os.path.getsize(path) / 1e6:.1f}MB")
+
+        seen, failed, elapsed = run_after(path)
+        print(f"after  (vectorized): {seen:>9} rows {failed:>7} failed {elapsed:8.2f}s {seen / elapsed:>12,.0f} rows/s")
+
+        if not args.skip_before:
+            limit = args.before_rows or args.rows
+            seen_b, failed_b, elapsed_b = run_before(path, limit)
+            print(f"before (iterrows):   {seen_b:>9} rows {failed_b:>7} failed {elapsed_b:8.2f}s {seen_b / elapsed_b:>12,.0f} rows/s")
+            print(f"speedup: {(seen / elapsed) / (seen_b / elapsed_b):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
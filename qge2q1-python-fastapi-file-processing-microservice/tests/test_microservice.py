@@ -721,3 +721,304 @@ def test_processing_loads_valid_rows_into_db(client, app):
 
     loaded = anyio.run(_count_loaded)
     assert loaded == (job_json["rows_processed"] - job_json["rows_failed"])
+
+
+def test_vectorized_csv_transform_matches_per_row_path(tmp_path):
+    import pandas as pd
+
+    from repository_after import tasks
+
+    long_text = "x" * 2100
+    p = tmp_path / "mixed.csv"
+    p.write_text(
+        "id,score,label,mixed,flag\n"
+        "1,1.0,  alpha  ,7,True\n"
+        "2,2.5,,8.5,False\n"
+        "3,,beta,gamma,True\n"
+        f"4,1e20,{long_text},99999999999999999999,False\n"
+        "5,inf,NA,1e999,True\n",
+        encoding="utf-8",
+    )
+
+    chunk = next(iter(pd.read_csv(p, chunksize=10_000)))
+    columns, values, row_errors = tasks._transform_frame(chunk)
+
+    for i, (_, row) in enumerate(chunk.iterrows()):
+        expected = tasks._transform_row({str(k): row[k] for k in row.index})
+        actual = dict(zip(columns, (col[i] for col in values)))
+        assert actual == expected
+        assert [type(v) for v in actual.values()] == [type(v) for v in expected.values()]
+        assert row_errors.get(i, []) == tasks._validate_row(expected)
+
+    assert values[0] == [1, 2, 3, 4, 5]
+    assert set(row_errors) == {1, 2, 3, 4}
+
+
+def test_vectorized_transform_keeps_native_types_for_homogeneous_chunks(tmp_path):
+    import pandas as pd
+
+    from repository_after import tasks
+
+    # With a single int or bool dtype, iterrows yielded numpy scalars and the
+    # per-row path stringified them ('1', 'True'). Columns now map to native
+    # values the way mixed-dtype chunks always did: ints stay int, bools become 0/1.
+    ints = tmp_path / "ints.csv"
+    ints.write_text("id,qty\n1,10\n2,20\n", encoding="utf-8")
+    flags = tmp_path / "flags.csv"
+    flags.write_text("flag\nTrue\nFalse\n", encoding="utf-8")
+
+    columns, values, row_errors = tasks._transform_frame(next(iter(pd.read_csv(ints, chunksize=10_000))))
+    assert columns == ["id", "qty"]
+    assert values == [[1, 2], [10, 20]]
+    assert {type(v) for col in values for v in col} == {int}
+    assert row_errors == {}
+
+    columns, values, row_errors = tasks._transform_frame(next(iter(pd.read_csv(flags, chunksize=10_000))))
+    assert values == [[1, 0]]
+    assert {type(v) for v in values[0]} == {int}
+    assert row_errors == {}
+
+    # uint64 columns (a value above int64) map the same way; integers beyond
+    # int64 are not supported and fail validation as in the per-row path.
+    big = tmp_path / "big.csv"
+    big.write_text("id\n1\n18446744073709551615\n", encoding="utf-8")
+    chunk = next(iter(pd.read_csv(big, chunksize=10_000)))
+    assert chunk["id"].dtype == "uint64"
+    columns, values, row_errors = tasks._transform_frame(chunk)
+    assert values == [[1, 18446744073709551615]]
+    assert {type(v) for v in values[0]} == {int}
+    assert row_errors == {1: [("id", "CONSTRAINT", "Integer out of range", "18446744073709551615")]}
+    assert tasks._validate_row({"id": values[0][1]}) == row_errors[1]
+
+
+@pytest.mark.asyncio
+async def test_csv_progress_comes_from_bytes_read(monkeypatch, tmp_path):
+    from repository_after import tasks
+
+    monkeypatch.setattr(tasks.settings, "progress_update_interval_seconds", 0.0)
+
+    p = tmp_path / "data.csv"
+    # Large enough that the parser's buffered reads advance between chunks.
+    p.write_text("a,b\n" + "".join(f"{i},{i * 2:040d}\n" for i in range(35_000)), encoding="utf-8")
+
+    reads = []
+    real_read_csv = tasks.pd.read_csv
+
+    def counting_read_csv(source, chunksize):
+        reads.append(source)
+        return real_read_csv(source, chunksize=chunksize)
+
+    class FakeJob:
+        status = tasks.JobStatus.PROCESSING
+
+    async def fake_get_job(session, job_id):
+        return FakeJob()
+
+    progress_updates: list[tuple[int, int]] = []
+
+    async def fake_update_job_progress(session, job_id, **kwargs):
+        progress_updates.append((kwargs["progress"], kwargs["rows_processed"]))
+
+    async def noop(*_a, **_k):
+        return None
+
+    monkeypatch.setattr(tasks.pd, "read_csv", counting_read_csv)
+    monkeypatch.setattr(tasks, "_get_job", fake_get_job)
+    monkeypatch.setattr(tasks, "_update_job_progress", fake_update_job_progress)
+    monkeypatch.setattr(tasks, "_insert_loaded_rows", noop)
+    monkeypatch.setattr(tasks, "_log_errors", noop)
+
+    rows, failed = await tasks._process_csv(p, uuid.uuid4(), object())
+
+    assert (rows, failed) == (35_000, 0)
+    # Single pass over the file: no separate row-counting read.
+    assert len(reads) == 1
+    progress = [pct for pct, _ in progress_updates]
+    assert progress == sorted(progress)
+    assert 0 < progress[len(progress) // 2] < 100
+    assert progress_updates[-1] == (100, 35_000)
+
+
+async def _sqlite_job(tmp_path):
+    from repository_after.db import create_engine, create_sessionmaker
+    from repository_after.models import Base, Job, JobStatus
+
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'pipeline.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessionmaker = create_sessionmaker(engine)
+    job_id = uuid.uuid4()
+    async with sessionmaker() as session:
+        session.add(Job(id=job_id, filename="f.csv", file_size=0, file_type="csv", status=JobStatus.PROCESSING))
+        await session.commit()
+    return engine, sessionmaker, job_id
+
+
+@pytest.mark.asyncio
+async def test_pipeline_bulk_loads_rows_and_errors(monkeypatch, tmp_path):
+    from sqlalchemy import event, func, select
+
+    from repository_after import tasks
+    from repository_after.models import LoadedRow, ProcessingError
+
+    monkeypatch.setattr(tasks.settings, "progress_update_interval_seconds", 3600.0)
+    engine, sessionmaker, job_id = await _sqlite_job(tmp_path)
+
+    # Every 7th row has a missing value.
+    p = tmp_path / "data.csv"
+    p.write_text(
+        "a,b\n" + "".join(f"{i},\n" if i % 7 == 0 else f"{i},x{i}\n" for i in range(1, 25_001)),
+        encoding="utf-8",
+    )
+
+    statements: list[tuple[str, bool]] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, stmt, params, ctx, executemany: statements.append((stmt, executemany)),
+    )
+    job_lookups = []
+    real_get_job = tasks._get_job
+
+    async def counting_get_job(session, jid):
+        job_lookups.append(jid)
+        return await real_get_job(session, jid)
+
+    monkeypatch.setattr(tasks, "_get_job", counting_get_job)
+
+    async with sessionmaker() as session:
+        rows, failed = await tasks._process_csv(p, job_id, session)
+
+    assert (rows, failed) == (25_000, 25_000 // 7)
+    # Three chunks: one bulk statement per table per chunk, and the job is
+    # only re-read on the progress cadence rather than per chunk.
+    error_inserts = [s for s, many in statements if s.startswith("INSERT INTO processing_errors")]
+    loaded_inserts = [s for s, many in statements if s.startswith("INSERT INTO loaded_rows")]
+    assert len(error_inserts) == 3
+    assert len(loaded_inserts) == 3
+    assert len(job_lookups) == 1
+
+    async with sessionmaker() as session:
+        loaded = (await session.execute(select(func.count()).select_from(LoadedRow))).scalar_one()
+        errors = (
+            await session.execute(select(ProcessingError.row_number, ProcessingError.column_name).order_by(ProcessingError.row_number))
+        ).all()
+        sample = (await session.execute(select(LoadedRow.data).where(LoadedRow.row_number == 2))).scalar_one()
+
+    assert loaded == 25_000 - 25_000 // 7
+    assert errors[:2] == [(7, "b"), (14, "b")]
+    assert sample == {"a": 2, "b": "x2"}
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_excel_ingest_keeps_large_ints_exact(monkeypatch, tmp_path):
+    import zipfile
+
+    from openpyxl import Workbook
+    from sqlalchemy import select
+
+    from repository_after import tasks
+    from repository_after.models import LoadedRow, ProcessingError
+
+    monkeypatch.setattr(tasks.settings, "progress_update_interval_seconds", 3600.0)
+    engine, sessionmaker, job_id = await _sqlite_job(tmp_path)
+
+    # A blank and a float in the column must not upcast the ids to float64,
+    # which would round everything above 2**53.
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["id", "name"])
+    for row in [(111, "a"), (None, "b"), (222, "c"), (1.5, "d")]:
+        ws.append(row)
+    src = tmp_path / "src.xlsx"
+    wb.save(src)
+    # openpyxl writes ints through float repr; put the exact digits in the
+    # sheet XML, which the reader returns as Python ints.
+    p = tmp_path / "data.xlsx"
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(p, "w") as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = data.replace(b"<v>111</v>", b"<v>1152921504606846977</v>")
+                data = data.replace(b"<v>222</v>", b"<v>9007199254740993</v>")
+            zout.writestr(item, data)
+
+    async with sessionmaker() as session:
+        rows, failed = await tasks._process_excel(p, job_id, session)
+
+    async with sessionmaker() as session:
+        loaded = (await session.execute(select(LoadedRow.row_number, LoadedRow.data).order_by(LoadedRow.row_number))).all()
+        errors = (await session.execute(select(ProcessingError.row_number, ProcessingError.column_name))).all()
+
+    assert (rows, failed) == (4, 1)
+    assert loaded == [
+        (1, {"id": 1152921504606846977, "name": "a"}),
+        (3, {"id": 9007199254740993, "name": "c"}),
+        (4, {"id": 1.5, "name": "d"}),
+    ]
+    assert errors == [(2, "id")]
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stops_loading_when_cancelled(monkeypatch, tmp_path):
+    from sqlalchemy import func, select, update
+
+    from repository_after import tasks
+    from repository_after.models import Job, JobStatus, LoadedRow
+
+    monkeypatch.setattr(tasks.settings, "progress_update_interval_seconds", 0.0)
+    monkeypatch.setattr(tasks.settings, "ingest_queue_maxsize", 1)
+    engine, sessionmaker, job_id = await _sqlite_job(tmp_path)
+
+    p = tmp_path / "data.csv"
+    p.write_text("a\n" + "".join(f"{i}\n" for i in range(50_000)), encoding="utf-8")
+
+    real_insert = tasks._insert_loaded_rows
+
+    async def insert_then_cancel(session, *, job_id, rows):
+        await real_insert(session, job_id=job_id, rows=rows)
+        await session.execute(update(Job).where(Job.id == job_id).values(status=JobStatus.CANCELLED))
+
+    monkeypatch.setattr(tasks, "_insert_loaded_rows", insert_then_cancel)
+
+    async with sessionmaker() as session:
+        rows, failed = await tasks._process_csv(p, job_id, session)
+        job = await tasks._get_job(session, job_id)
+        loaded = (await session.execute(select(func.count()).select_from(LoadedRow))).scalar_one()
+
+    assert (rows, failed, loaded) == (10_000, 0, 10_000)
+    assert job.progress < 100
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_surfaces_parser_errors(monkeypatch, tmp_path):
+    import pandas as pd
+
+    from repository_after import tasks
+
+    def broken_read_csv(path, chunksize):
+        yield pd.DataFrame({"a": [1, 2]})
+        raise ValueError("bad chunk")
+
+    async def noop(*_a, **_k):
+        return None
+
+    class FakeJob:
+        status = tasks.JobStatus.PROCESSING
+
+    async def fake_get_job(session, job_id):
+        return FakeJob()
+
+    monkeypatch.setattr(tasks.pd, "read_csv", broken_read_csv)
+    monkeypatch.setattr(tasks, "_get_job", fake_get_job)
+    monkeypatch.setattr(tasks, "_update_job_progress", noop)
+    monkeypatch.setattr(tasks, "_insert_loaded_rows", noop)
+    monkeypatch.setattr(tasks, "_log_errors", noop)
+
+    p = tmp_path / "f.csv"
+    p.write_text("a\n1\n2\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="bad chunk"):
+        await tasks._process_csv(p, uuid.uuid4(), object())
@@ -1,11 +1,16 @@
 import asyncio
 import json
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 from uuid import uuid4
 import asyncpg
 
+logger = logging.getLogger(__name__)
+
+EVENT_COLUMNS = ("event_id", "aggregate_id", "event_type", "data", "timestamp", "version")
+
 @dataclass
 class Event:
     event_id: str
@@ -23,9 +28,115 @@ class Snapshot:
     timestamp: datetime
 
 
+class EventWriter:
+    """Group-commit writer for events.
+
+    Events are queued and written by a single background task, one multi-row
+    INSERT (or COPY, when the connection supports it) per batch. The queue is
+    bounded so producers are slowed down instead of piling up unbounded work.
+
+    Queued events live only in memory until their batch is written: callers
+    must await close() (or flush()) before the event loop shuts down, or
+    pending events are dropped along with the writer task.
+    """
+
+    def __init__(self, db_pool: asyncpg.Pool, flush_interval: float = 0.005,
+                 max_batch_size: int = 500, max_queue_size: int = 10000, use_copy: bool = True):
+        self.db_pool = db_pool
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.use_copy = use_copy
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, event: Event, wait: bool = False):
+        """Queue an event; waits for space when the queue is full.
+
+        With wait=True, returns only once the batch holding the event has been
+        written, and re-raises the write error if it failed.
+        """
+        ack = asyncio.get_running_loop().create_future() if wait else None
+        await self._queue.put((event, ack))
+        self._ensure_running()
+        if ack is not None:
+            await ack
+
+    async def flush(self):
+        """Wait until every event queued so far has been written."""
+        if not self._queue.empty():
+            self._ensure_running()
+        await self._queue.join()
+
+    async def close(self):
+        """Flush pending events and stop the background task."""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        # Exits once the queue is drained; submit() restarts it on demand.
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            if self.flush_interval > 0:
+                # Let concurrent appends join this commit.
+                await asyncio.sleep(self.flush_interval)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            error = None
+            try:
+                await self._write([event for event, _ in batch])
+            except Exception as exc:
+                error = exc
+                logger.exception("Failed to persist %d events", len(batch))
+
+            for _, ack in batch:
+                if ack is not None and not ack.done():
+                    if error is None:
+                        ack.set_result(None)
+                    else:
+                        ack.set_exception(error)
+                self._queue.task_done()
+
+    async def _write(self, events: List[Event]):
+        records = [
+            (e.event_id, e.aggregate_id, e.event_type, json.dumps(e.data), e.timestamp, e.version)
+            for e in events
+        ]
+        async with self.db_pool.acquire() as conn:
+            if self.use_copy and hasattr(conn, "copy_records_to_table"):
+                await conn.copy_records_to_table("events", records=records, columns=EVENT_COLUMNS)
+                return
+            width = len(EVENT_COLUMNS)
+            values = ", ".join(
+                "(" + ", ".join(f"${i * width + j + 1}" for j in range(width)) + ")"
+                for i in range(len(records))
+            )
+            args = [value for record in records for value in record]
+            await conn.execute(
+                f"INSERT INTO events ({', '.join(EVENT_COLUMNS)}) VALUES {values}", *args
+            )
+
+
 class EventStore:
-    def __init__(self, db_pool: asyncpg.Pool):
+    """In-memory event store persisted through a group-commit EventWriter.
+
+    Await close() before shutting down the event loop so that queued events
+    are written; see EventWriter.
+    """
+
+    def __init__(self, db_pool: asyncpg.Pool, writer: Optional[EventWriter] = None):
         self.db_pool = db_pool
+        self.writer = writer or EventWriter(db_pool)
         self.subscribers: Dict[str, List[Callable]] = {}
         self._snapshot_lock = asyncio.Lock()
         self._in_memory_events: Dict[str, List[Event]] = {}
@@ -44,8 +155,13 @@ class EventStore:
                 self._aggregate_locks[aggregate_id] = asyncio.Lock()
             return self._aggregate_locks[aggregate_id]
 
-    async def append_event(self, aggregate_id: str, event_type: str, data: Dict[str, Any]) -> Event:
-        """Append an event atomically with proper version management."""
+    async def append_event(self, aggregate_id: str, event_type: str, data: Dict[str, Any],
+                           wait_durable: bool = False) -> Event:
+        """Append an event atomically with proper version management.
+
+        Persistence is handed to the group-commit writer; pass wait_durable=True
+        to return only after the event has been written to the database.
+        """
         lock = await self._get_aggregate_lock(aggregate_id)
 
         async with lock:
@@ -68,39 +184,44 @@ class EventStore:
             # Append to in-memory store atomically within the lock
             self._in_memory_events[aggregate_id].append(event)
 
-        # Persist event (fire-and-forget but tracked for consistency)
-        asyncio.create_task(self._persist_event(event))
-
         # Notify subscribers without blocking (non-blocking)
         asyncio.create_task(self._notify_subscribers(event))
 
+        # Queue for the batched writer (waits only if the queue is full)
+        await self._persist_event(event, wait_durable)
+
         return event
 
-    async def _persist_event(self, event: Event):
-        """Persist event to database."""
-        async with self.db_pool.acquire() as conn:
-            await conn.execute('''
-                INSERT INTO events (event_id, aggregate_id, event_type, data, timestamp, version)
-                VALUES ($1, $2, $3, $4, $5, $6)
-            ''', event.event_id, event.aggregate_id, event.event_type,
-                json.dumps(event.data), event.timestamp, event.version)
+    async def _persist_event(self, event: Event, wait_durable: bool = False):
+        """Queue event for persistence by the group-commit writer."""
+        await self.writer.submit(event, wait=wait_durable)
+
+    async def flush(self):
+        """Wait until all events appended so far have been persisted."""
+        await self.writer.flush()
+
+    async def close(self):
+        """Persist pending events and stop the background writer."""
+        await self.writer.close()
 
     async def get_events(self, aggregate_id: str, from_version: int = 0) -> List[Event]:
         """Get events for an aggregate from a specific version."""
         lock = await self._get_aggregate_lock(aggregate_id)
         async with lock:
+            # Versions are 1-based list positions, so a slice skips the prefix
             events = self._in_memory_events.get(aggregate_id, [])
-            return [e for e in events if e.version > from_version]
+            return events[max(from_version, 0):]
 
     async def get_events_snapshot_safe(self, aggregate_id: str, from_version: int = 0, to_version: Optional[int] = None) -> List[Event]:
         """Get events within a version range for snapshot-safe reads."""
         lock = await self._get_aggregate_lock(aggregate_id)
         async with lock:
             events = self._in_memory_events.get(aggregate_id, [])
-            filtered = [e for e in events if e.version > from_version]
-            if to_version is not None:
-                filtered = [e for e in filtered if e.version <= to_version]
-            return filtered
+            # Versions are 1..n, so version v sits at index v - 1. Clamp the
+            # bounds so negative ones select nothing instead of counting from the end.
+            start = max(from_version, 0)
+            end = None if to_version is None else max(to_version, start)
+            return events[start:end]
 
     async def get_current_version(self, aggregate_id: str) -> int:
         """Get the current version of an aggregate atomically."""
@@ -259,9 +380,8 @@ class InventoryAggregate:
 
             # Get events directly without lock (we already hold it)
             events = self.event_store._in_memory_events.get(self.aggregate_id, [])
-            for event in events:
-                if event.version > from_version:
-                    self._state = self._apply_event(self._state, event)
+            for event in events[from_version:]:
+                self._state = self._apply_event(self._state, event)
 
             current_stock = self._state.get(item_id, 0)
 
@@ -287,8 +407,8 @@ class InventoryAggregate:
             self.event_store._in_memory_events[self.aggregate_id].append(event)
 
         # Persist and notify outside the lock
-        asyncio.create_task(self.event_store._persist_event(event))
         asyncio.create_task(self.event_store._notify_subscribers(event))
+        await self.event_store._persist_event(event)
 
     async def get_stock(self, item_id: str) -> int:
         """Get current stock for an item."""
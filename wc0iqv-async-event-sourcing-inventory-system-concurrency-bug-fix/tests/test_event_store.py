@@ -16,6 +16,7 @@ from event_store import (
     Event,
     Snapshot,
     EventStore,
+    EventWriter,
     InventoryAggregate,
     SnapshotWorker,
     ReadModelProjection,
@@ -48,6 +49,35 @@ class MockConnection:
         self.pool.executed.append((query, args))
 
 
+class SlowPool(MockPool):
+    """Mock pool whose writes take a while, to exercise batching and backpressure."""
+
+    def __init__(self, delay=0.01, fail=False):
+        super().__init__()
+        self.delay = delay
+        self.fail = fail
+
+    def acquire(self):
+        return SlowConnection(self)
+
+
+class SlowConnection(MockConnection):
+    async def execute(self, query, *args):
+        await asyncio.sleep(self.pool.delay)
+        if self.pool.fail:
+            raise ConnectionError("database unavailable")
+        await super().execute(query, *args)
+
+
+def persisted_versions(pool):
+    """Versions of all events written so far (6 values per inserted row)."""
+    versions = []
+    for query, args in pool.executed:
+        if query.startswith("INSERT INTO events"):
+            versions.extend(args[5::6])
+    return versions
+
+
 @pytest.fixture
 def mock_pool():
     """Create a mock database pool."""
@@ -55,9 +85,11 @@ def mock_pool():
 
 
 @pytest.fixture
-def event_store(mock_pool):
-    """Create an EventStore with mock pool."""
-    return EventStore(mock_pool)
+async def event_store(mock_pool):
+    """Create an EventStore with mock pool; closed so queued events are written."""
+    store = EventStore(mock_pool)
+    yield store
+    await store.close()
 
 
 @pytest.fixture
@@ -738,6 +770,93 @@ class TestBackwardCompatibility:
         assert state.get("item-1") == 50
 
 
+# =============================================================================
+# Group-commit persistence and snapshot-relative reads
+# =============================================================================
+
+class TestGroupCommit:
+    """Events are persisted in batches by a single bounded writer."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_share_inserts(self, mock_pool, event_store):
+        """Concurrent appends are written as a few multi-row INSERTs."""
+        aggregate = InventoryAggregate(event_store, "warehouse-group-commit")
+
+        await asyncio.gather(*[aggregate.add_stock("item-1", 1) for _ in range(200)])
+        await event_store.flush()
+
+        assert sorted(persisted_versions(mock_pool)) == list(range(1, 201))
+        assert len(mock_pool.executed) <= 5, f"{len(mock_pool.executed)} INSERTs for 200 events"
+
+    @pytest.mark.asyncio
+    async def test_wait_durable_returns_after_write(self, mock_pool, event_store):
+        """wait_durable=True returns only once the event is in the database."""
+        event = await event_store.append_event(
+            "warehouse-durable", "StockAdded", {"item_id": "item-1", "quantity": 5},
+            wait_durable=True,
+        )
+        assert event.event_id in [args[0] for _, args in mock_pool.executed]
+
+    @pytest.mark.asyncio
+    async def test_write_failure_reaches_durable_waiter(self):
+        """A failed batch write is raised to callers waiting for durability."""
+        store = EventStore(SlowPool(delay=0, fail=True))
+
+        with pytest.raises(ConnectionError):
+            await store.append_event(
+                "warehouse-failing", "StockAdded", {"item_id": "item-1", "quantity": 1},
+                wait_durable=True,
+            )
+        # The event itself is still recorded in memory.
+        assert await store.get_current_version("warehouse-failing") == 1
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self):
+        """Producers wait for the writer instead of growing the queue."""
+        pool = SlowPool(delay=0.01)
+        writer = EventWriter(pool, max_batch_size=2, max_queue_size=4)
+        store = EventStore(pool, writer=writer)
+        aggregate = InventoryAggregate(store, "warehouse-backpressure")
+
+        max_queued = 0
+
+        async def producer():
+            nonlocal max_queued
+            for _ in range(20):
+                await aggregate.add_stock("item-1", 1)
+                max_queued = max(max_queued, writer._queue.qsize())
+
+        await producer()
+        await store.close()
+
+        assert max_queued <= 4
+        assert sorted(persisted_versions(pool)) == list(range(1, 21))
+        assert all(len(args) <= 12 for _, args in pool.executed)
+
+    @pytest.mark.asyncio
+    async def test_version_ranges_slice_from_snapshot(self, event_store):
+        """Range reads return exactly the events after the given version."""
+        aggregate = InventoryAggregate(event_store, "warehouse-ranges")
+        for qty in range(1, 11):
+            await aggregate.add_stock("item-1", qty)
+
+        tail = await event_store.get_events("warehouse-ranges", 7)
+        assert [e.version for e in tail] == [8, 9, 10]
+        window = await event_store.get_events_snapshot_safe("warehouse-ranges", 3, 6)
+        assert [e.version for e in window] == [4, 5, 6]
+        # Out-of-range bounds select nothing rather than counting from the end
+        assert await event_store.get_events_snapshot_safe("warehouse-ranges", 3, -2) == []
+        assert await event_store.get_events_snapshot_safe("warehouse-ranges", 6, 3) == []
+        full = await event_store.get_events_snapshot_safe("warehouse-ranges", -5, 99)
+        assert [e.version for e in full] == list(range(1, 11))
+
+        await event_store.create_snapshot("warehouse-ranges", {"item-1": 15}, 5)
+        await aggregate.remove_stock("item-1", 55)
+        assert await aggregate.get_stock("item-1") == 0
+        await event_store.flush()
+
+
 # =============================================================================
 # Integration Tests
 # =============================================================================
@@ -1,6 +1,7 @@
 import copy
 import time
 import heapq
+import bisect
 import collections
 from datetime import datetime, timedelta
 import io
@@ -21,10 +22,104 @@ class Task:
     def __repr__(self):
         return f"<Task {self.task_id}: {self.name}>"
 
+class SchedulingPolicy:
+    """Orders ready tasks for `OptimizedScheduler.generate_schedule`.
+
+    `key_function` is called once per run, after the cycle check, and returns
+    a function mapping a task to a sort key; smaller keys start first.
+    Keys must be unique, so end them with the task id.
+    """
+    name = None
+
+    def key_function(self, scheduler):
+        raise NotImplementedError
+
+
+class PriorityPolicy(SchedulingPolicy):
+    """Highest priority first, then earliest deadline (the default)."""
+    name = "priority"
+
+    def key_function(self, scheduler):
+        return lambda task: (-task.priority, task.deadline, task.task_id)
+
+
+class EarliestDeadlinePolicy(SchedulingPolicy):
+    """Earliest deadline first, ties broken by priority."""
+    name = "edf"
+
+    def key_function(self, scheduler):
+        return lambda task: (task.deadline, -task.priority, task.task_id)
+
+
+class CriticalPathPolicy(SchedulingPolicy):
+    """Least slack first, using `calculate_slack`; zero-slack tasks lead."""
+    name = "critical_path"
+
+    def key_function(self, scheduler):
+        slack = scheduler.calculate_slack()
+        return lambda task: (slack[task.task_id], -task.priority, task.deadline, task.task_id)
+
+
+class WeightedShortestJobPolicy(SchedulingPolicy):
+    """WSJF: highest priority per minute of duration first."""
+    name = "wsjf"
+
+    def key_function(self, scheduler):
+        def key(task):
+            score = task.priority / task.duration if task.duration > 0 else float("inf")
+            return (-score, task.deadline, task.task_id)
+        return key
+
+
+class ResourceAwarePolicy(SchedulingPolicy):
+    """List scheduling on resource-weighted bottom levels.
+
+    Each task's length is stretched by its dominant share, the largest
+    fraction of any one resource's capacity it holds, so long chains of
+    heavy tasks are started before light ones that can backfill later.
+    """
+    name = "resource_aware"
+
+    def key_function(self, scheduler):
+        capacity = scheduler.available_resources
+        weights = {}
+        for task in scheduler.tasks:
+            share = 0.0
+            for res, amt in task.resources_needed.items():
+                if capacity.get(res, 0) > 0:
+                    share = max(share, amt / capacity[res])
+            weights[task.task_id] = task.duration * (1 + min(share, 1.0))
+        bottom = scheduler.calculate_bottom_levels(weights)
+        return lambda task: (-bottom[task.task_id], -task.priority, task.task_id)
+
+
+POLICIES = {
+    policy.name: policy
+    for policy in (
+        PriorityPolicy,
+        EarliestDeadlinePolicy,
+        CriticalPathPolicy,
+        WeightedShortestJobPolicy,
+        ResourceAwarePolicy,
+    )
+}
+
+
+def get_policy(policy):
+    """Return a policy instance for a name in `POLICIES`, an instance, or None (priority)."""
+    if policy is None:
+        return PriorityPolicy()
+    if isinstance(policy, str):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy {policy!r}; expected one of {sorted(POLICIES)}")
+        return POLICIES[policy]()
+    return policy
+
 class OptimizedScheduler:
-    def __init__(self, tasks, available_resources):
+    def __init__(self, tasks, available_resources, policy=None):
         self.tasks = tasks
         self.available_resources = available_resources.copy()
+        self.policy = get_policy(policy)
         self.schedule = []
         self.execution_log = []
         
@@ -40,31 +135,13 @@ class OptimizedScheduler:
         return self.task_map.get(task_id)
 
     def check_circular_dependencies(self):
-        in_degree = {t.task_id: 0 for t in self.tasks}
-        for t in self.tasks:
-            for dep_id in t.dependencies:
-                if dep_id in in_degree:
-                    in_degree[t.task_id] += 1
-        
-        queue = collections.deque([tid for tid, deg in in_degree.items() if deg == 0])
-        visited_count = 0
-        
-        while queue:
-            node_id = queue.popleft()
-            visited_count += 1
-            
-            for distinct_dependent in self.dependents[node_id]:
-                in_degree[distinct_dependent] -= 1
-                if in_degree[distinct_dependent] == 0:
-                    queue.append(distinct_dependent)
-                    
-        has_cycle = visited_count != len(self.tasks)
+        has_cycle = self._topological_order() is None
         if has_cycle:
             self.execution_log.append("Cycle detected in dependency graph")
             
         return has_cycle
 
-    def calculate_critical_path(self):
+    def _topological_order(self):
         in_degree = {t.task_id: 0 for t in self.tasks}
         for t in self.tasks:
             for dep_id in t.dependencies:
@@ -82,6 +159,12 @@ class OptimizedScheduler:
                     queue.append(v)
         
         if len(topo_order) != len(self.tasks):
+            return None
+        return topo_order
+
+    def calculate_critical_path(self):
+        topo_order = self._topological_order()
+        if topo_order is None:
             return [], 0
             
         max_dist = {tid: 0 for tid in self.task_map}
@@ -120,6 +203,47 @@ class OptimizedScheduler:
             
         return list(reversed(path)), overall_max_len
 
+    def calculate_bottom_levels(self, weights=None):
+        """Longest path from each task to any sink, including the task itself.
+
+        `weights` maps task_id to the length to use instead of the duration.
+        Returns an empty dict when the graph has a cycle.
+        """
+        topo_order = self._topological_order()
+        if topo_order is None:
+            return {}
+        bottom = {}
+        for tid in reversed(topo_order):
+            own = weights[tid] if weights is not None else self.task_map[tid].duration
+            tail = 0
+            for dep_tid in self.dependents[tid]:
+                if bottom[dep_tid] > tail:
+                    tail = bottom[dep_tid]
+            bottom[tid] = own + tail
+        return bottom
+
+    def calculate_slack(self):
+        """Total float per task: how far it can slip without growing the critical path.
+
+        Tasks on the path returned by `calculate_critical_path` have zero
+        slack. Resources are ignored, as for the critical path itself.
+        """
+        topo_order = self._topological_order()
+        if topo_order is None:
+            return {}
+        earliest_start = {}
+        for tid in topo_order:
+            start = 0
+            for dep_id in self.task_map[tid].dependencies:
+                if dep_id in earliest_start:
+                    finish = earliest_start[dep_id] + self.task_map[dep_id].duration
+                    if finish > start:
+                        start = finish
+            earliest_start[tid] = start
+        bottom = self.calculate_bottom_levels()
+        length = max(bottom.values(), default=0)
+        return {tid: length - earliest_start[tid] - bottom[tid] for tid in topo_order}
+
     def execute_task(self, task, current_time):
         task.start_time = current_time
         task.end_time = current_time + timedelta(minutes=task.duration)
@@ -139,96 +263,130 @@ class OptimizedScheduler:
         return task.end_time
 
     def generate_schedule(self, start_time):
+        """Greedy list scheduling driven by task completion events.
+
+        At each event time every finished task releases its resources, then
+        ready tasks are tried in the order given by `self.policy` and all that
+        fit are started.
+        A task that does not fit is parked on the first resource it is short
+        of, in a queue bucketed by the amount it needs. Releasing a resource
+        only wakes the buckets whose amount now fits, so blocked tasks are not
+        rescanned on every step.
+        """
         current_time = start_time
         
         if self.check_circular_dependencies():
             self.execution_log.append("Cannot schedule due to circular dependencies")
             return None
 
-        pending_dependency_count = {t.task_id: 0 for t in self.tasks}
+        available = self.available_resources
+        task_map = self.task_map
+        # Heaps hold each task's position in policy order rather than its
+        # key tuple, so comparisons are plain int compares.
+        by_rank = sorted(self.tasks, key=self.policy.key_function(self))
+        rank = {t.task_id: i for i, t in enumerate(by_rank)}
+
+        pending_dependency_count = {}
         for t in self.tasks:
             count = 0
             for dep_id in t.dependencies:
-                if dep_id in self.task_map:
+                if dep_id in task_map:
                     count += 1
             pending_dependency_count[t.task_id] = count
             
-        ready_heap = []
-        
-        for t in self.tasks:
-            if pending_dependency_count[t.task_id] == 0:
-                heapq.heappush(ready_heap, (-t.priority, t.deadline, t.task_id))
+        ready_heap = [rank[t.task_id] for t in self.tasks if pending_dependency_count[t.task_id] == 0]
+        heapq.heapify(ready_heap)
+
+        # waiting[res][amount] is a heap of ranks parked on `res`;
+        # waiting_amounts[res] keeps the bucket amounts sorted for range wakes.
+        waiting = collections.defaultdict(dict)
+        waiting_amounts = collections.defaultdict(list)
+        # (head rank, res, amount) for buckets that currently fit; entries whose
+        # rank no longer matches the bucket head are stale and skipped.
+        woken = []
+        parked_count = 0
                 
         running_tasks = []
-        completed_count = 0
-        n_tasks = len(self.tasks)
-         
-        while completed_count < n_tasks:
-            if not ready_heap and running_tasks:
-                 next_end, finished_tid = heapq.heappop(running_tasks)
-                 current_time = max(current_time, next_end)
-                 heapq.heappush(running_tasks, (next_end, finished_tid))
-            
+
+        def release(task):
+            for res, amt in task.resources_needed.items():
+                if res not in available:
+                    continue
+                before = available[res]
+                available[res] = after = before + amt
+                amounts = waiting_amounts.get(res)
+                if not amounts or after <= before:
+                    continue
+                buckets = waiting[res]
+                lo = bisect.bisect_right(amounts, before)
+                hi = bisect.bisect_right(amounts, after)
+                for amount in amounts[lo:hi]:
+                    bucket = buckets[amount]
+                    if bucket:
+                        heapq.heappush(woken, (bucket[0], res, amount))
+
+        def next_candidate():
+            while woken:
+                pos, res, amount = woken[0]
+                bucket = waiting[res][amount]
+                if not bucket or bucket[0] != pos or available[res] < amount:
+                    heapq.heappop(woken)
+                    continue
+                if ready_heap and ready_heap[0] < pos:
+                    break
+                heapq.heappop(woken)
+                heapq.heappop(bucket)
+                if bucket:
+                    heapq.heappush(woken, (bucket[0], res, amount))
+                return pos, True
+            if ready_heap:
+                return heapq.heappop(ready_heap), False
+            return None, False
+
+        while True:
             while running_tasks and running_tasks[0][0] <= current_time:
-                end_t, finished_tid = heapq.heappop(running_tasks)
-                task = self.task_map[finished_tid]
-                
-                for res, amt in task.resources_needed.items():
-                    if res in self.available_resources:
-                        self.available_resources[res] += amt
-                        
-                completed_count += 1
+                _, finished_tid = heapq.heappop(running_tasks)
+                release(task_map[finished_tid])
                 
                 for dep_tid in self.dependents[finished_tid]:
                     pending_dependency_count[dep_tid] -= 1
                     if pending_dependency_count[dep_tid] == 0:
-                        dep_task = self.task_map[dep_tid]
-                        heapq.heappush(ready_heap, (-dep_task.priority, dep_task.deadline, dep_task.task_id))
+                        heapq.heappush(ready_heap, rank[dep_tid])
 
-            non_executable = []
-            matched_task = None
-            
-            while ready_heap:
-                prio, deadline, tid = heapq.heappop(ready_heap)
-                task = self.task_map[tid]
-                
-                can_run = True
+            pos, was_parked = next_candidate()
+            if pos is not None:
+                if was_parked:
+                    parked_count -= 1
+                task = by_rank[pos]
+
+                short_of = None
                 for res, amt in task.resources_needed.items():
-                    if self.available_resources.get(res, 0) < amt:
-                        can_run = False
+                    if available.get(res, 0) < amt:
+                        short_of = res
                         break
-                
-                if can_run:
-                    matched_task = task
-                    break
+
+                if short_of is None:
+                    for res, amt in task.resources_needed.items():
+                        if res in available:
+                            available[res] -= amt
+                    self.execute_task(task, current_time)
+                    heapq.heappush(running_tasks, (task.end_time, task.task_id))
                 else:
-                    non_executable.append((prio, deadline, tid))
-            
-            for item in non_executable:
-                heapq.heappush(ready_heap, item)
-                
-            if matched_task:
-                for res, amt in matched_task.resources_needed.items():
-                    if res in self.available_resources:
-                         self.available_resources[res] -= amt
-                
-                self.execute_task(matched_task, current_time)
-                heapq.heappush(running_tasks, (matched_task.end_time, matched_task.task_id))
-            else:
-                 if running_tasks:
-                     next_time = running_tasks[0][0]
-                     if next_time > current_time:
-                         current_time = next_time
-                     else:
-                         if not running_tasks and ready_heap:
-                             self.execution_log.append("Resource deadlock detected")
-                             break
-                         
-                         current_time = next_time
-                 else:
-                     if completed_count < n_tasks:
-                         pass
-                     break
+                    amount = task.resources_needed[short_of]
+                    buckets = waiting[short_of]
+                    if amount not in buckets:
+                        buckets[amount] = []
+                        bisect.insort(waiting_amounts[short_of], amount)
+                    heapq.heappush(buckets[amount], pos)
+                    parked_count += 1
+                continue
+
+            if not running_tasks:
+                break
+            current_time = max(current_time, running_tasks[0][0])
+
+        if parked_count:
+            self.execution_log.append("Resource deadlock detected")
                      
         return self.schedule
 
@@ -258,12 +416,21 @@ class OptimizedScheduler:
                 if curr_start > prev_end:
                     total_idle_time += 1
                     
+        makespan = 0.0
+        scheduled = [self.task_map[entry["task_id"]] for entry in self.schedule]
+        scheduled = [t for t in scheduled if t.start_time is not None]
+        if scheduled:
+            first_start = min(t.start_time for t in scheduled)
+            last_end = max(t.end_time for t in scheduled)
+            makespan = (last_end - first_start).total_seconds() / 60
+
         metrics = {
             "total_tasks": len(self.tasks),
             "completed_tasks": len(self.schedule),
             "missed_deadlines": missed_deadlines,
             "total_wait_time_minutes": total_wait_time,
-            "estimated_idle_periods": total_idle_time
+            "estimated_idle_periods": total_idle_time,
+            "makespan_minutes": makespan
         }
         return metrics
 
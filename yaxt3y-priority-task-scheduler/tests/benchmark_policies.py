@@ -0,0 +1,84 @@
+"""Compare scheduling policies on large synthetic DAGs.
+
+Usage:
+    PYTHONPATH=repository_after python tests/benchmark_policies.py --tasks 50000
+    PYTHONPATH=repository_after python tests/benchmark_policies.py --tasks 20000 --layers 200 --policies edf wsjf
+
+Each run builds a layered random DAG with contended resources and deadlines
+set from each task's earliest possible finish times a random tightness
+factor, schedules it once per policy, and reports makespan, missed deadlines
+and scheduler CPU time.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from scheduler import POLICIES, OptimizedScheduler, Task
+
+
+def generate_dag(n, layers, max_fan_in, seed):
+    rng = random.Random(seed)
+    base = datetime(2020, 1, 1)
+    layer_of = sorted(rng.randrange(layers) for _ in range(n))
+    by_layer = {}
+    for tid, layer in enumerate(layer_of):
+        by_layer.setdefault(layer, []).append(tid)
+
+    durations = [rng.choice([1, 2, 5, 10, 15, 30, 60, 120]) for _ in range(n)]
+    earliest_finish = [0] * n
+    tasks = []
+    for tid, layer in enumerate(layer_of):
+        deps = []
+        if layer > 0:
+            # Mostly the previous layer, sometimes a long-range edge.
+            for _ in range(rng.randint(0, max_fan_in)):
+                src_layer = layer - 1 if rng.random() < 0.8 else rng.randrange(layer)
+                candidates = by_layer.get(src_layer)
+                if candidates:
+                    deps.append(rng.choice(candidates))
+            deps = sorted(set(deps))
+        earliest_finish[tid] = max((earliest_finish[d] for d in deps), default=0) + durations[tid]
+        needs = {"cpu": rng.choice([1, 1, 2, 4, 8])}
+        if rng.random() < 0.3:
+            needs["memory"] = rng.choice([4, 8, 16, 32])
+        if rng.random() < 0.05:
+            needs["gpu"] = 1
+        deadline = base + timedelta(minutes=earliest_finish[tid] * rng.uniform(1.5, 6.0))
+        tasks.append(Task(tid, f"T{tid}", rng.randint(1, 10), durations[tid], deadline, deps, needs))
+    return tasks
+
+
+def run_policy(name, args, resources):
+    tasks = generate_dag(args.tasks, args.layers, args.fan_in, args.seed)
+    scheduler = OptimizedScheduler(tasks, resources, policy=name)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    scheduler.generate_schedule(datetime(2020, 1, 1))
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    metrics = scheduler.calculate_metrics()
+    return metrics, cpu, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--layers", type=int, default=500)
+    parser.add_argument("--fan-in", type=int, default=3)
+    parser.add_argument("--cpu", type=int, default=64)
+    parser.add_argument("--memory", type=int, default=256)
+    parser.add_argument("--gpu", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policies", nargs="+", default=sorted(POLICIES), choices=sorted(POLICIES))
+    args = parser.parse_args()
+
+    resources = {"cpu": args.cpu, "memory": args.memory, "gpu": args.gpu}
+    print(f"tasks={args.tasks} layers={args.layers} fan_in<={args.fan_in} resources={resources}")
+    print(f"{'policy':<16}{'makespan_min':>14}{'missed':>10}{'cpu_s':>9}{'wall_s':>9}")
+    for name in args.policies:
+        metrics, cpu, wall = run_policy(name, args, resources)
+        print(f"{name:<16}{metrics['makespan_minutes']:>14.0f}{metrics['missed_deadlines']:>10}"
+              f"{cpu:>9.2f}{wall:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from common_test_utils import OptimizedScheduler, TaskAfter, scheduler_after
+
+
+class TestPolicies(unittest.TestCase):
+    def random_tasks(self, n, seed):
+        rng = random.Random(seed)
+        base = datetime(2020, 1, 1)
+        tasks = []
+        for i in range(n):
+            deps = rng.sample(range(i), min(i, rng.randint(0, 2)))
+            needs = {"cpu": rng.choice([1, 2, 4]), "memory": rng.choice([1, 4, 8])}
+            tasks.append(TaskAfter(i, f"T{i}", rng.randint(1, 10), rng.randint(0, 30),
+                                   base + timedelta(minutes=rng.randint(30, 600)), deps, needs))
+        return tasks
+
+    def test_every_policy_produces_a_valid_schedule(self):
+        """All registered policies respect dependencies and capacity"""
+        resources = {"cpu": 8, "memory": 16}
+        base = datetime(2020, 1, 1)
+        for name in scheduler_after.POLICIES:
+            tasks = self.random_tasks(200, 3)
+            scheduler = OptimizedScheduler(tasks, resources, policy=name)
+            schedule = scheduler.generate_schedule(base)
+            self.assertEqual(len(schedule), len(tasks), name)
+            for t in tasks:
+                for dep in t.dependencies:
+                    self.assertGreaterEqual(t.start_time, scheduler.task_map[dep].end_time, name)
+            events = sorted({t.start_time for t in tasks})
+            for moment in events:
+                active = [t for t in tasks if t.start_time <= moment < t.end_time]
+                for res, cap in resources.items():
+                    self.assertLessEqual(sum(t.resources_needed[res] for t in active), cap, name)
+            self.assertGreater(scheduler.calculate_metrics()["makespan_minutes"], 0)
+
+    def test_ready_order_per_policy(self):
+        """With one slot, the first task started reflects each policy's ordering"""
+        base = datetime(2020, 1, 1)
+
+        def first(policy):
+            tasks = [
+                TaskAfter(1, "important", 9, 60, base + timedelta(hours=9), [], {"cpu": 1}),
+                TaskAfter(2, "urgent", 1, 30, base + timedelta(hours=1), [], {"cpu": 1}),
+                TaskAfter(3, "quick win", 5, 5, base + timedelta(hours=5), [], {"cpu": 1}),
+                TaskAfter(4, "chain head", 2, 10, base + timedelta(hours=8), [], {"cpu": 1}),
+                TaskAfter(5, "chain tail", 2, 90, base + timedelta(hours=8), [4], {"cpu": 1}),
+            ]
+            return OptimizedScheduler(tasks, {"cpu": 1}, policy=policy).generate_schedule(base)[0]["task_id"]
+
+        self.assertEqual(first(None), 1)
+        self.assertEqual(first("priority"), 1)
+        self.assertEqual(first("edf"), 2)
+        self.assertEqual(first("wsjf"), 3)
+        self.assertEqual(first("critical_path"), 4)
+        self.assertEqual(first("resource_aware"), 4)
+
+    def test_slack_is_zero_on_critical_path(self):
+        """calculate_slack agrees with calculate_critical_path"""
+        base = datetime(2020, 1, 1)
+        tasks = [
+            TaskAfter(1, "A", 1, 10, base, [], {}),
+            TaskAfter(2, "B", 1, 20, base, [1], {}),
+            TaskAfter(3, "C", 1, 5, base, [1], {}),
+            TaskAfter(4, "D", 1, 10, base, [2, 3], {}),
+            TaskAfter(5, "E", 1, 7, base, [], {}),
+        ]
+        scheduler = OptimizedScheduler(tasks, {})
+        path, length = scheduler.calculate_critical_path()
+        slack = scheduler.calculate_slack()
+        self.assertEqual(slack, {1: 0, 2: 0, 3: 15, 4: 0, 5: 33})
+        self.assertEqual([tid for tid in path if slack[tid] == 0], path)
+        self.assertEqual(scheduler.calculate_bottom_levels()[1], length)
+
+    def test_unknown_policy_name(self):
+        with self.assertRaises(ValueError):
+            OptimizedScheduler([], {}, policy="fifo")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import heapq
+import random
+import unittest
+from datetime import datetime, timedelta
+from common_test_utils import OptimizedScheduler, TaskAfter
+
+
+def scan_schedule(tasks, resources, start):
+    """Reference greedy: rescan every ready task in priority order each step."""
+    task_map = {t.task_id: t for t in tasks}
+    available = dict(resources)
+    pending = {t.task_id: sum(1 for d in t.dependencies if d in task_map) for t in tasks}
+    ready = [t.task_id for t in tasks if pending[t.task_id] == 0]
+    running = []
+    starts = {}
+    now = start
+    while True:
+        while running and running[0][0] <= now:
+            _, tid = heapq.heappop(running)
+            for res, amt in task_map[tid].resources_needed.items():
+                if res in available:
+                    available[res] += amt
+            for t in tasks:
+                if tid in t.dependencies:
+                    pending[t.task_id] -= 1
+                    if pending[t.task_id] == 0:
+                        ready.append(t.task_id)
+        ready.sort(key=lambda tid: (-task_map[tid].priority, task_map[tid].deadline, tid))
+        for tid in ready:
+            need = task_map[tid].resources_needed
+            if all(available.get(r, 0) >= a for r, a in need.items()):
+                for r, a in need.items():
+                    if r in available:
+                        available[r] -= a
+                ready.remove(tid)
+                starts[tid] = now
+                heapq.heappush(running, (now + timedelta(minutes=task_map[tid].duration), tid))
+                break
+        else:
+            if not running:
+                return starts
+            now = max(now, running[0][0])
+
+
+class TestResourceQueues(unittest.TestCase):
+    def make_tasks(self, n, seed):
+        rng = random.Random(seed)
+        base = datetime(2020, 1, 1)
+        tasks = []
+        for i in range(n):
+            deps = [rng.randrange(i)] if i and rng.random() < 0.3 else []
+            needs = {"cpu": rng.choice([1, 2, 4])}
+            if rng.random() < 0.5:
+                needs["gpu"] = rng.choice([1, 2])
+            if rng.random() < 0.3:
+                needs["memory"] = rng.choice([4, 8, 16])
+            tasks.append(TaskAfter(i, f"T{i}", rng.randint(1, 5), rng.choice([0, 5, 10, 30]),
+                                   base + timedelta(minutes=rng.randint(10, 600)), deps, needs))
+        return tasks
+
+    def test_matches_scan_reference_under_contention(self):
+        """Parking blocked tasks yields the same schedule as rescanning them"""
+        resources = {"cpu": 6, "gpu": 2, "memory": 24}
+        base = datetime(2020, 1, 1)
+        for seed in range(5):
+            expected = scan_schedule(self.make_tasks(300, seed), resources, base)
+            scheduler = OptimizedScheduler(self.make_tasks(300, seed), resources)
+            schedule = scheduler.generate_schedule(base)
+            actual = {e["task_id"]: datetime.fromisoformat(e["start_time"]) for e in schedule}
+            self.assertEqual(actual, expected)
+            self.assertEqual(scheduler.available_resources, resources)
+
+    def test_starts_all_fitting_tasks_at_one_event(self):
+        """A completion that frees several slots starts several waiters at once"""
+        base = datetime(2020, 1, 1)
+        tasks = [TaskAfter(0, "big", 10, 10, base, [], {"cpu": 4})]
+        tasks += [TaskAfter(i, f"small{i}", 1, 10, base, [], {"cpu": 1}) for i in range(1, 6)]
+        schedule = OptimizedScheduler(tasks, {"cpu": 4}).generate_schedule(base)
+        starts = [datetime.fromisoformat(e["start_time"]) for e in schedule]
+        self.assertEqual(starts[0], base)
+        self.assertEqual(starts[1:5], [base + timedelta(minutes=10)] * 4)
+        self.assertEqual(starts[5], base + timedelta(minutes=20))
+
+    def test_unsatisfiable_tasks_are_reported(self):
+        """Tasks that can never get their resources end the run with a log entry"""
+        base = datetime(2020, 1, 1)
+        tasks = [
+            TaskAfter(1, "fits", 1, 10, base, [], {"cpu": 1}),
+            TaskAfter(2, "too big", 5, 10, base, [], {"cpu": 8}),
+            TaskAfter(3, "unknown", 5, 10, base, [], {"tpu": 1}),
+        ]
+        scheduler = OptimizedScheduler(tasks, {"cpu": 2})
+        schedule = scheduler.generate_schedule(base)
+        self.assertEqual([e["task_id"] for e in schedule], [1])
+        self.assertIn("Resource deadlock detected", scheduler.execution_log)
+
+
+if __name__ == '__main__':
+    unittest.main()